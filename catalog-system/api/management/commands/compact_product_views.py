@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.utils.analytics_utils import compact_view_buckets
+
+class Command(BaseCommand):
+    help = "Compacts old hourly product view buckets into daily buckets and drops the expired ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hourly-days", type=int, default=8, help="Days of hourly buckets to keep (default 8)")
+        parser.add_argument("--daily-days", type=int, default=90, help="Days of daily buckets to keep (default 90)")
+
+    def handle(self, *args, **options):
+        try:
+            compacted, dropped = compact_view_buckets(options["hourly_days"], options["daily_days"])
+        except ValueError as e:
+            raise CommandError(e)
+        self.stdout.write(self.style.SUCCESS(
+            f"Compacted {compacted} hourly buckets, dropped {dropped} daily buckets"
+        ))
@@ -0,0 +1,37 @@
+import gzip
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError
+from api.models import Product
+from api.utils.export_utils import EXPORT_FORMATS, copy_export
+
+class Command(BaseCommand):
+    help = "Exports every product to a CSV or NDJSON file, gzipped when the path ends with .gz"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to write, - writes to the standard output")
+        parser.add_argument("--format", choices=EXPORT_FORMATS, help="Format of the file (default from its extension, csv for -)")
+        parser.add_argument("--brand", help="Only export the products of this brand")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        name = path[:-3] if path.endswith(".gz") else path
+        export_format = options["format"] or ("ndjson" if name.endswith((".ndjson", ".jsonl")) else "csv")
+        products = Product.objects.all()
+        if options["brand"]:
+            products = products.filter(brand=options["brand"])
+
+        started = time.monotonic()
+        try:
+            if path == "-":
+                exported = copy_export(products, export_format, sys.stdout.buffer)
+            else:
+                # The fastest level keeps compression from bounding the export
+                with (gzip.open(path, "wb", compresslevel=1) if path.endswith(".gz") else open(path, "wb")) as file:
+                    exported = copy_export(products, export_format, file)
+        except OSError as e:
+            raise CommandError(f"Couldn't write {path}: {e}")
+        elapsed = time.monotonic() - started
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported {exported} products in {elapsed:.1f}s ({exported / elapsed if elapsed else 0:.0f} rows/s)"
+        ))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.utils.import_utils import IMPORT_FORMATS, get_import_format, import_products, open_import_file, read_import_rows
+
+class Command(BaseCommand):
+    help = (
+        "Imports products from a CSV or NDJSON file, optionally gzipped, with the columns "
+        "sku (optional), name, price and brand. Existing products are updated by sku. "
+        "The changed products are notified, sent to the webhooks and audited like the API writes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, .gz files are decompressed on the fly")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Format of the file (default from its extension)")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = get_import_format(path, options["format"])
+        try:
+            with open_import_file(path) as file:
+                stats = import_products(read_import_rows(file, file_format), progress=self.report_progress)
+        except OSError as e:
+            raise CommandError(f"Couldn't read {path}: {e}")
+
+        for line, error in stats.errors:
+            self.stderr.write(f"Row {line}: {error}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {stats.read} rows ({stats.rows_per_second:.0f} rows/s): {stats.inserted} inserted, "
+            f"{stats.updated} updated, {stats.unchanged} unchanged, {stats.invalid} invalid"
+        ))
+
+    def report_progress(self, stats):
+        self.stdout.write(f"{stats.read} rows read, {stats.rows_per_second:.0f} rows/s")
@@ -0,0 +1,61 @@
+import logging
+import signal
+import threading
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from api.utils.delivery_utils import email_delivery
+from api.utils.notification_utils import notification_stats, process_notifications
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = (
+        "Sends the product change notifications of the outbox, retrying failed ones with backoff. "
+        "Changes made within the coalescing window are sent in one email. Several workers can run at once"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Notifications sent per email at most (default 1000)")
+        parser.add_argument("--once", action="store_true", help="Send the due notifications and exit")
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        if not options["once"]:
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+            self.stdout.write("Notification worker started")
+
+        while not self.stopping.is_set():
+            close_old_connections()
+            try:
+                sent, failed = process_notifications(options["batch_size"])
+            except Exception:
+                logger.exception("Couldn't process the notification outbox")
+                sent, failed = 0, 0
+            if sent or failed:
+                stats = notification_stats.snapshot()
+                self.stdout.write(
+                    f"{sent} notifications sent, {failed} failed, "
+                    f"{stats['messages_saved']} messages saved so far"
+                )
+            if options["once"] and sent + failed < options["batch_size"]:
+                break
+            if sent + failed < options["batch_size"]:
+                # The outbox is drained, wait for new notifications
+                self.stopping.wait(settings.NOTIFICATION_POLL_INTERVAL)
+
+        close_old_connections()
+        email_delivery.close()
+        stats = notification_stats.snapshot()
+        delivery = email_delivery.stats.snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f"Notification worker stopped: {stats['notifications']} notifications sent in {stats['emails']} emails, "
+            f"{stats['messages_sent']} messages sent, {stats['messages_saved']} messages saved. "
+            f"SMTP: {delivery['messages']} messages over {delivery['connections']} connections "
+            f"({delivery['reconnects']} reconnects), {delivery['messages_per_second']:.1f} messages/s"
+        ))
+
+    def stop(self, signum, frame):
+        # The current batch is finished before the worker exits
+        self.stopping.set()
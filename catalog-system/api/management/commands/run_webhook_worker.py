@@ -0,0 +1,78 @@
+import logging
+import signal
+import threading
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from api.utils.changes_utils import get_changes_horizon
+from api.utils.webhook_utils import WebhookDispatcher, prune_webhook_events
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = (
+        "Delivers the product change events to the webhook subscriptions, several endpoints at once, "
+        "retrying failing endpoints with backoff. Several workers can run at once"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.WEBHOOK_CONCURRENCY,
+            help=f"Endpoints delivered at once (default {settings.WEBHOOK_CONCURRENCY})"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.WEBHOOK_BATCH_SIZE,
+            help=f"Events sent per request at most (default {settings.WEBHOOK_BATCH_SIZE})"
+        )
+        parser.add_argument("--once", action="store_true", help="Deliver the pending events and exit")
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        if not options["once"]:
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+            self.stdout.write("Webhook worker started")
+
+        dispatcher = WebhookDispatcher(options["concurrency"], options["batch_size"])
+        pruned_at = 0.0
+        while not self.stopping.is_set():
+            close_old_connections()
+            try:
+                started = dispatcher.dispatch()
+                # Returns as soon as one delivery finishes, so its thread takes the next subscription
+                finished = dispatcher.collect(settings.WEBHOOK_POLL_INTERVAL)
+                if time.monotonic() - pruned_at >= settings.WEBHOOK_PRUNE_INTERVAL:
+                    prune_webhook_events(get_changes_horizon())
+                    pruned_at = time.monotonic()
+            except Exception:
+                logger.exception("Couldn't deliver the webhook events")
+                started, finished = 0, 0
+            if finished:
+                stats = dispatcher.stats.snapshot()
+                self.stdout.write(
+                    f"{finished} deliveries finished, {stats['events']} events delivered "
+                    f"and {stats['failures']} failed deliveries so far"
+                )
+            if not started and not dispatcher.busy:
+                if options["once"]:
+                    break
+                # Nothing to deliver, wait for new events
+                self.stopping.wait(settings.WEBHOOK_POLL_INTERVAL)
+
+        # The deliveries in flight are finished before the worker exits
+        dispatcher.close()
+        close_old_connections()
+        stats = dispatcher.stats.snapshot()
+        pool = dispatcher.pool.snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f"Webhook worker stopped: {stats['events']} events in {stats['deliveries']} deliveries, "
+            f"{stats['failures']} failed deliveries, {pool['requests']} requests over {pool['connections']} connections"
+        ))
+
+    def stop(self, signum, frame):
+        self.stopping.set()
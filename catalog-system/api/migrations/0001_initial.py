@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:32
+
+import django.core.validators
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('sku', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.01'))])),
+                ('brand', models.CharField(max_length=255)),
+                ('views', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+            ],
+        ),
+    ]
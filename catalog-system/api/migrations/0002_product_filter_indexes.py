@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:32
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built concurrently so the catalog stays writable while they are created
+    atomic = False
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['price', 'sku'], name='product_price_sku_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['name', 'sku'], name='product_name_sku_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['views', 'sku'], name='product_views_sku_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['brand', 'sku'], name='product_brand_sku_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['brand', 'price', 'sku'], name='product_brand_price_sku_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['brand', 'name', 'sku'], name='product_brand_name_sku_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['brand', 'views', 'sku'], name='product_brand_views_sku_idx'),
+        ),
+    ]
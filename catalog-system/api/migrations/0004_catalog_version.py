@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_catalog_version(apps, schema_editor):
+    CatalogVersion = apps.get_model("api", "CatalogVersion")
+    CatalogVersion.objects.get_or_create(id=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_product_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(create_catalog_version, migrations.RunPython.noop),
+    ]
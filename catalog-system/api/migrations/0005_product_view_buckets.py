@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_catalog_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateTimeField()),
+                ('hours', models.PositiveSmallIntegerField(default=1)),
+                ('sku', models.UUIDField()),
+                ('views', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('hours', 'start', 'sku'), name='product_view_bucket_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # The product index is built concurrently so the catalog stays writable while it is created
+    atomic = False
+
+    dependencies = [
+        ('api', '0005_product_view_buckets'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductTombstone',
+            fields=[
+                ('sku', models.UUIDField(primary_key=True, serialize=False)),
+                ('deleted_at', models.DateTimeField()),
+            ],
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['updated_at', 'sku'], name='product_updated_at_sku_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producttombstone',
+            index=models.Index(fields=['deleted_at', 'sku'], name='product_tombstone_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:11
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_product_audit_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxNotification',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('action', models.CharField(max_length=16)),
+                ('products', models.JSONField()),
+                ('owner', models.CharField(blank=True, default='', max_length=254)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('FAILED', 'Failed')], default='PENDING', max_length=7)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('status', 'PENDING')), fields=['available_at'], name='outbox_notification_due_idx')],
+            },
+        ),
+    ]
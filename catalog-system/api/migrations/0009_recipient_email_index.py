@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # The index is built concurrently so users stay writable while it is created
+    atomic = False
+
+    dependencies = [
+        ('api', '0008_notification_outbox'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        # Covers the emails read by the notification recipients query, so it's
+        # served by an index only scan of the users that can be notified
+        migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS "auth_user_recipient_email_idx" '
+                'ON "auth_user" ("email") WHERE "is_active" AND "email" <> \'\'',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "auth_user_recipient_email_idx"',
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:23
+
+from django.db import migrations, models
+
+
+def create_recipients_version(apps, schema_editor):
+    RecipientsVersion = apps.get_model("api", "RecipientsVersion")
+    RecipientsVersion.objects.get_or_create(id=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_webhooks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipientsVersion',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_recipients_version, migrations.RunPython.noop),
+    ]
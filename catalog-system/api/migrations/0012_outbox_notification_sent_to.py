@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_recipients_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxnotification',
+            name='sent_to',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -1 +1,7 @@
-from .product_models import Product
\ No newline at end of file
+from .product_models import Product
+from .catalog_models import CatalogVersion
+from .analytics_models import ProductViewBucket
+from .changes_models import ProductTombstone
+from .audit_models import ProductAuditEntry
+from .notification_models import OutboxNotification, RecipientsVersion
+from .webhook_models import WebhookEvent, WebhookSubscription
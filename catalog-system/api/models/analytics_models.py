@@ -0,0 +1,22 @@
+from django.db import models
+
+HOURLY_BUCKET = 1
+DAILY_BUCKET = 24
+
+class ProductViewBucket(models.Model):
+    """
+    Views of a product during `hours` hours from `start`. Recent views are kept
+    in hourly buckets and older ones are compacted into daily buckets.
+    The sku is not a foreign key so the views of deleted products don't block
+    the delete and can still be compacted.
+    """
+    start = models.DateTimeField()
+    hours = models.PositiveSmallIntegerField(default=HOURLY_BUCKET)
+    sku = models.UUIDField()
+    views = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also serves the range scans of a window of hourly buckets
+            models.UniqueConstraint(fields=["hours", "start", "sku"], name="product_view_bucket_uniq"),
+        ]
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.db import models
+
+class ProductAuditEntry(models.Model):
+    """
+    Append only record of a product create, update or delete with the values
+    of the product before and after it. The sku and the user are not
+    constraints, so the history outlives deleted products and users.
+    """
+    CREATE = "CREATE"
+    UPDATE = "UPDATE"
+    DELETE = "DELETE"
+    ACTIONS = [(CREATE, "Create"), (UPDATE, "Update"), (DELETE, "Delete")]
+
+    id = models.BigAutoField(primary_key=True)
+    sku = models.UUIDField()
+    action = models.CharField(max_length=6, choices=ACTIONS)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+    )
+    user_email = models.EmailField(blank=True, default="")
+    before = models.JSONField(null=True)
+    after = models.JSONField(null=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # The history of a product or of a user is read newest first
+            models.Index(fields=["sku", "-id"], name="product_audit_sku_idx"),
+            models.Index(fields=["user", "-id"], name="product_audit_user_idx"),
+        ]
@@ -0,0 +1,14 @@
+from django.db import models
+from django.utils import timezone
+
+CATALOG_VERSION_ID = 1
+
+class CatalogVersion(models.Model):
+    """
+    Single row with the version stamp of the whole catalog.
+    Every product write bumps it so readers can validate cached copies
+    without touching the product table.
+    """
+    id = models.PositiveSmallIntegerField(primary_key=True, default=CATALOG_VERSION_ID)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
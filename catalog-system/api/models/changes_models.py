@@ -0,0 +1,15 @@
+from django.db import models
+
+class ProductTombstone(models.Model):
+    """
+    Marks a deleted product so the changes feed can report the delete.
+    A product created again with the same sku keeps its tombstone, the feed
+    reports the delete before the newer insert.
+    """
+    sku = models.UUIDField(primary_key=True)
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "sku"], name="product_tombstone_deleted_idx"),
+        ]
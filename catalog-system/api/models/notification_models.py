@@ -0,0 +1,46 @@
+from django.db import models
+from django.utils import timezone
+
+RECIPIENTS_VERSION_ID = 1
+
+class OutboxNotification(models.Model):
+    """
+    Email notification of a product change, written in the transaction of
+    the change and sent later by the notification worker. Sent notifications
+    are deleted, the ones that run out of attempts are kept as FAILED.
+    """
+    PENDING = "PENDING"
+    FAILED = "FAILED"
+    STATUSES = [(PENDING, "Pending"), (FAILED, "Failed")]
+
+    id = models.BigAutoField(primary_key=True)
+    action = models.CharField(max_length=16)
+    # [sku, name] pairs of the changed products
+    products = models.JSONField()
+    owner = models.CharField(max_length=254, blank=True, default="")
+    status = models.CharField(max_length=7, choices=STATUSES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    # Emails that already got this notification in an attempt that failed halfway
+    sent_to = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Only pending notifications are polled, so failed ones don't grow the index
+            models.Index(
+                fields=["available_at"],
+                name="outbox_notification_due_idx",
+                condition=models.Q(status="PENDING"),
+            ),
+        ]
+
+class RecipientsVersion(models.Model):
+    """
+    Single row with the version of the notification recipients. Every user
+    write bumps it, so the processes sending notifications know when to read
+    the recipients again.
+    """
+    id = models.PositiveSmallIntegerField(primary_key=True, default=RECIPIENTS_VERSION_ID)
+    version = models.BigIntegerField(default=0)
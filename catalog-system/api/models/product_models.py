@@ -1,8 +1,20 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 import uuid
 
+SEARCH_CONFIG = "english"
+
+class ProductManager(models.Manager):
+    """
+    Default manager of the Product. The search vector is only read by the
+    search endpoint, so it is deferred everywhere else.
+    """
+    def get_queryset(self):
+        return super().get_queryset().defer("search_vector")
+
 # Create your models here.
 class Product(models.Model):
     """
@@ -34,4 +46,30 @@ class Product(models.Model):
     views = models.IntegerField(
         validators=[MinValueValidator(0)],
         default=0
-    )
\ No newline at end of file
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("name", weight="A", config=SEARCH_CONFIG) +
+            SearchVector("brand", weight="B", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = ProductManager()
+    class Meta:
+        # Every filter and sort supported by the product list resolves to one of
+        # these indexes. The sku suffix keeps keyset pagination on the same index.
+        indexes = [
+            models.Index(fields=["price", "sku"], name="product_price_sku_idx"),
+            models.Index(fields=["name", "sku"], name="product_name_sku_idx"),
+            models.Index(fields=["views", "sku"], name="product_views_sku_idx"),
+            models.Index(fields=["brand", "sku"], name="product_brand_sku_idx"),
+            models.Index(fields=["brand", "price", "sku"], name="product_brand_price_sku_idx"),
+            models.Index(fields=["brand", "name", "sku"], name="product_brand_name_sku_idx"),
+            models.Index(fields=["brand", "views", "sku"], name="product_brand_views_sku_idx"),
+            # Serves the changes feed, which reads products in the order they were written
+            models.Index(fields=["updated_at", "sku"], name="product_updated_at_sku_idx"),
+            GinIndex(fields=["search_vector"], name="product_search_vector_gin"),
+        ]
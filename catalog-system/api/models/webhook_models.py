@@ -0,0 +1,50 @@
+from django.db import models
+from django.utils import timezone
+
+class WebhookSubscription(models.Model):
+    """
+    Endpoint that receives the product change events. Each subscription
+    keeps its own cursor and backoff, so a slow or failing endpoint only
+    delays its own events.
+    """
+    id = models.BigAutoField(primary_key=True)
+    url = models.URLField(max_length=500)
+    # Key of the HMAC signature of every delivery
+    secret = models.CharField(max_length=64)
+    is_active = models.BooleanField(default=True)
+    # Id of the last event delivered to the endpoint
+    cursor = models.BigIntegerField(default=0)
+    # Failed deliveries in a row
+    failures = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    last_delivered_at = models.DateTimeField(null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                name="webhook_subscription_due_idx",
+                condition=models.Q(is_active=True),
+            ),
+        ]
+
+class WebhookEvent(models.Model):
+    """
+    Product create, update or delete with the values of the product, written
+    in the transaction of the change. Events are deleted once every active
+    subscription has received them.
+    """
+    CREATE = "CREATE"
+    UPDATE = "UPDATE"
+    DELETE = "DELETE"
+    ACTIONS = [(CREATE, "Create"), (UPDATE, "Update"), (DELETE, "Delete")]
+
+    id = models.BigAutoField(primary_key=True)
+    action = models.CharField(max_length=6, choices=ACTIONS)
+    sku = models.UUIDField()
+    name = models.CharField(max_length=255)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    brand = models.CharField(max_length=255)
+    created_at = models.DateTimeField(default=timezone.now)
@@ -1,2 +1,11 @@
-from .product_serializers import ProductSerializer
-from .user_serializers import UserInputSerializer, UserSerializer
\ No newline at end of file
+from .product_serializers import (
+    ProductBulkDeleteSerializer,
+    ProductSerializer,
+    ProductUpsertSerializer,
+    PRODUCT_FIELDS,
+    iter_product_representations,
+    product_rows_to_representation,
+)
+from .audit_serializers import ProductAuditEntrySerializer
+from .user_serializers import UserInputSerializer, UserSerializer
+from .webhook_serializers import WebhookSubscriptionCreatedSerializer, WebhookSubscriptionInputSerializer, WebhookSubscriptionSerializer
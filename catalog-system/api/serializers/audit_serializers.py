@@ -0,0 +1,22 @@
+from rest_framework import serializers
+from api.models import ProductAuditEntry
+
+class AuditValuesSerializer(serializers.Serializer):
+    """
+    Audited values of a product, used for the schema of the audit log
+    """
+    name = serializers.CharField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    brand = serializers.CharField()
+
+class ProductAuditEntrySerializer(serializers.ModelSerializer):
+    """
+    Product audit entry serializer used as schema for reading the audit log
+    """
+    user = serializers.IntegerField(source="user_id", allow_null=True)
+    before = AuditValuesSerializer(allow_null=True)
+    after = AuditValuesSerializer(allow_null=True)
+
+    class Meta:
+        model = ProductAuditEntry
+        fields = ["id", "sku", "action", "user", "user_email", "before", "after", "created_at"]
@@ -1,3 +1,4 @@
+from decimal import Context, Decimal, ROUND_HALF_EVEN
 from rest_framework import serializers
 from api.models import Product
 
@@ -7,4 +8,67 @@ class ProductSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = Product
-        fields = "__all__"
\ No newline at end of file
+        exclude = ["search_vector"]
+
+class ProductUpsertSerializer(serializers.ModelSerializer):
+    """
+    Product serializer of the bulk upsert, the sku is given by the client
+    """
+    sku = serializers.UUIDField()
+
+    class Meta:
+        model = Product
+        fields = ["sku", "name", "price", "brand"]
+
+# Same limit of items as the other bulk endpoints
+MAX_BULK_DELETE_SKUS = 10000
+
+class ProductBulkDeleteSerializer(serializers.Serializer):
+    """
+    Input of the bulk delete, either a list of skus or a brand
+    """
+    skus = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=MAX_BULK_DELETE_SKUS, required=False)
+    brand = serializers.CharField(max_length=255, required=False)
+
+    def validate(self, attrs):
+        if ("skus" in attrs) == ("brand" in attrs):
+            raise serializers.ValidationError("Send either skus or brand")
+        return attrs
+
+# Same precision and rounding ProductSerializer applies to price
+PRICE_QUANTUM = Decimal("0.01")
+PRICE_CONTEXT = Context(prec=10, rounding=ROUND_HALF_EVEN)
+
+def price_to_representation(value):
+    return "{:f}".format(value.quantize(PRICE_QUANTUM, context=PRICE_CONTEXT))
+
+# Timestamps go through the same field class ProductSerializer uses
+datetime_to_representation = serializers.DateTimeField().to_representation
+
+# Fields of ProductSerializer in output order, with the conversion applied to
+# the raw database value. None means the value is already JSON ready.
+PRODUCT_FIELD_ENCODERS = {
+    "sku": str,
+    "name": None,
+    "price": price_to_representation,
+    "brand": None,
+    "views": None,
+    "updated_at": datetime_to_representation,
+}
+PRODUCT_FIELDS = list(PRODUCT_FIELD_ENCODERS)
+
+def iter_product_representations(rows, fields=PRODUCT_FIELDS):
+    """
+    Fast read path equivalent to ProductSerializer for rows fetched with
+    `values_list(*fields)`. Extra trailing values in a row, like an
+    annotation used for pagination, are ignored.
+    """
+    columns = [(index, field, PRODUCT_FIELD_ENCODERS[field]) for index, field in enumerate(fields)]
+    for row in rows:
+        yield {field: row[index] if encoder is None else encoder(row[index]) for index, field, encoder in columns}
+
+def product_rows_to_representation(rows, fields=PRODUCT_FIELDS):
+    """
+    Same output as ProductSerializer(many=True).data for `values_list(*fields)` rows
+    """
+    return list(iter_product_representations(rows, fields))
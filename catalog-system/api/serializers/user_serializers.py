@@ -20,6 +20,15 @@ class UserSerializer(serializers.ModelSerializer):
             "last_login"
         ]
         read_only_fields = ["id", "is_superuser", "date_joined", "last_login"]
+
+    def __init__(self, *args, fields=None, **kwargs):
+        """
+        Accepts an optional subset of the fields to output (sparse fieldsets)
+        """
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
         
 class UserInputSerializer(serializers.ModelSerializer):
     """
@@ -0,0 +1,38 @@
+from rest_framework import serializers
+from api.models import WebhookSubscription
+
+class WebhookSubscriptionSerializer(serializers.ModelSerializer):
+    """
+    Webhook subscription serializer used as schema for reading subscriptions
+    """
+    class Meta:
+        model = WebhookSubscription
+        fields = [
+            "id",
+            "url",
+            "is_active",
+            "cursor",
+            "failures",
+            "next_attempt_at",
+            "last_error",
+            "last_delivered_at",
+            "created_at"
+        ]
+
+class WebhookSubscriptionCreatedSerializer(WebhookSubscriptionSerializer):
+    """
+    Webhook subscription with its signing secret, only returned when it's created
+    """
+    class Meta(WebhookSubscriptionSerializer.Meta):
+        fields = WebhookSubscriptionSerializer.Meta.fields + ["secret"]
+
+class WebhookSubscriptionInputSerializer(serializers.Serializer):
+    """
+    Webhook subscription input serializer used as schema for creating subscriptions
+    """
+    url = serializers.URLField(max_length=500)
+
+    def validate_url(self, value):
+        if not value.lower().startswith(("http://", "https://")):
+            raise serializers.ValidationError("Only http and https endpoints are supported")
+        return value
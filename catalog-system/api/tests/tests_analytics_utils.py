@@ -0,0 +1,118 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from django.http import QueryDict
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+from unittest.mock import patch
+
+from api.utils.analytics_utils import (
+    WindowRanking,
+    compact_view_buckets,
+    get_popular_limit,
+    get_popular_products,
+    get_popular_window,
+)
+from api.utils.cache_utils import get_product_cache
+
+NOW = datetime(2025, 9, 9, 10, 30, tzinfo=timezone.utc)
+HOUR = datetime(2025, 9, 9, 10, tzinfo=timezone.utc)
+
+class PopularParamsTests(SimpleTestCase):
+    def test_window_and_limit_defaults_and_validation(self):
+        self.assertEqual(get_popular_window(QueryDict("")), "24h")
+        self.assertEqual(get_popular_limit(QueryDict("")), 20)
+        self.assertEqual(get_popular_window(QueryDict("window=7d")), "7d")
+        for params in ["window=2h", "window=24"]:
+            with self.assertRaises(ValidationError):
+                get_popular_window(QueryDict(params))
+        for params in ["limit=0", "limit=101", "limit=abc"]:
+            with self.assertRaises(ValidationError):
+                get_popular_limit(QueryDict(params))
+
+class WindowRankingTests(SimpleTestCase):
+    def test_first_refresh_reads_the_whole_window(self):
+        ranking = WindowRanking(24)
+        with patch("api.utils.analytics_utils.sum_bucket_views") as sum_mock:
+            sum_mock.side_effect = [Counter({"a": 5, "b": 1}), Counter({"b": 7})]
+
+            top = ranking.refresh(NOW)
+
+        self.assertEqual(
+            [c.args for c in sum_mock.call_args_list],
+            [(HOUR - timedelta(hours=23), HOUR), (HOUR, HOUR + timedelta(hours=1))]
+        )
+        self.assertEqual(top, [("b", 8), ("a", 5)])
+
+    def test_later_refresh_only_reads_hours_entering_and_leaving_the_window(self):
+        ranking = WindowRanking(24)
+        with patch("api.utils.analytics_utils.sum_bucket_views") as sum_mock:
+            sum_mock.side_effect = [
+                Counter({"a": 5, "b": 1}), Counter(),
+                Counter({"c": 3}), Counter({"a": 4}), Counter({"b": 1}),
+            ]
+            ranking.refresh(NOW)
+
+            top = ranking.refresh(NOW + timedelta(hours=1))
+
+        next_hour = HOUR + timedelta(hours=1)
+        self.assertEqual(
+            [c.args for c in sum_mock.call_args_list[2:]],
+            [
+                (HOUR, next_hour),
+                (HOUR - timedelta(hours=23), HOUR - timedelta(hours=22)),
+                (next_hour, next_hour + timedelta(hours=1)),
+            ]
+        )
+        self.assertEqual(top, [("c", 3), ("b", 2), ("a", 1)])
+
+class GetPopularProductsTests(SimpleTestCase):
+    def setUp(self):
+        get_product_cache().clear()
+
+    def test_ranking_is_built_once_per_refresh_interval(self):
+        with patch("api.utils.analytics_utils.build_popular_products") as build_mock, \
+            self.settings(PRODUCT_POPULAR_REFRESH_INTERVAL=60):
+            build_mock.return_value = [{"sku": "a"}, {"sku": "b"}]
+
+            get_popular_products("24h", 20)
+            popular = get_popular_products("24h", 1)
+
+        build_mock.assert_called_once_with("24h")
+        self.assertEqual(popular, [{"sku": "a"}])
+
+    def test_stale_ranking_is_served_while_another_worker_refreshes_it(self):
+        cache = get_product_cache()
+        cache.set("products:popular:24h", (0, [{"sku": "a"}]), None)
+        cache.add("products:popular:24h:refresh", True)
+        with patch("api.utils.analytics_utils.build_popular_products") as build_mock:
+
+            popular = get_popular_products("24h", 20)
+
+        build_mock.assert_not_called()
+        self.assertEqual(popular, [{"sku": "a"}])
+
+class CompactViewBucketsTests(SimpleTestCase):
+    def test_hourly_buckets_must_cover_the_longest_window(self):
+        with self.assertRaises(ValueError):
+            compact_view_buckets(6, 90, NOW)
+
+    def test_old_hourly_buckets_are_merged_into_daily_buckets(self):
+        with patch("api.utils.analytics_utils.transaction"), \
+            patch("api.utils.analytics_utils.connection") as connection_mock, \
+            patch("api.utils.analytics_utils.ProductViewBucket.objects.filter") as filter_mock:
+            filter_mock.return_value.delete.side_effect = [(48, {}), (3, {})]
+
+            result = compact_view_buckets(8, 90, NOW)
+
+        today = datetime(2025, 9, 9, tzinfo=timezone.utc)
+        sql, params = connection_mock.cursor.return_value.__enter__.return_value.execute.call_args.args
+        self.assertIn("date_trunc('day'", sql)
+        self.assertEqual(params, [24, 1, today - timedelta(days=8)])
+        self.assertEqual(
+            [c.kwargs for c in filter_mock.call_args_list],
+            [
+                {"hours": 1, "start__lt": today - timedelta(days=8)},
+                {"hours": 24, "start__lt": today - timedelta(days=90)},
+            ]
+        )
+        self.assertEqual(result, (48, 3))
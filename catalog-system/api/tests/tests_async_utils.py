@@ -0,0 +1,97 @@
+import json
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase
+from rest_framework.decorators import api_view
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.response import Response
+
+from api.utils.async_utils import aiter_sync, async_read_view, is_asgi_request, render_response
+
+@api_view(["GET"])
+def sync_view(request):
+    return Response({ "served_by": "sync" })
+
+@async_read_view(sync_view, fallback=lambda request: "sync" in request.query_params)
+async def async_view(request):
+    """
+    Async view of the tests
+    """
+    return render_response(request, { "served_by": "async", "request": type(request).__name__ })
+
+class AsyncReadViewTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    def test_json_reads_are_served_by_the_async_view_with_the_sync_view_headers(self):
+        response = async_to_sync(async_view)(self.factory.get("/products/"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), { "served_by": "async", "request": "Request" })
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response["Vary"], "Accept")
+        self.assertEqual(set(response["Allow"].split(", ")), {"GET", "OPTIONS"})
+
+    def test_other_formats_methods_and_fallback_requests_are_served_by_the_sync_view(self):
+        requests = [
+            self.factory.get("/products/", headers={"Accept": "text/html"}),
+            self.factory.get("/products/", {"sync": "1"}),
+            self.factory.post("/products/"),
+        ]
+
+        responses = [async_to_sync(async_view)(request) for request in requests]
+
+        self.assertIsInstance(responses[0].accepted_renderer, BrowsableAPIRenderer)
+        self.assertIsInstance(responses[1].accepted_renderer, JSONRenderer)
+        self.assertEqual(responses[1].data, { "served_by": "sync" })
+        self.assertEqual(responses[2].status_code, 405)
+
+    def test_view_keeps_the_schema_of_the_sync_view(self):
+        self.assertIs(async_view.cls, sync_view.cls)
+        self.assertTrue(async_view.csrf_exempt)
+        self.assertEqual(async_view.__name__, "async_view")
+
+    def test_empty_response_has_no_content_type(self):
+        request = self.factory.get("/products/")
+        request.accepted_renderer, request.accepted_media_type = JSONRenderer(), "application/json"
+
+        response = render_response(request, status=404)
+
+        self.assertEqual((response.status_code, response.content), (404, b""))
+        self.assertFalse(response.has_header("Content-Type"))
+
+class AiterSyncTests(SimpleTestCase):
+    def test_yields_every_item_and_closes_the_generator(self):
+        closed = []
+        def rows():
+            try:
+                yield from [b"a", b"b"]
+            finally:
+                closed.append(True)
+
+        async def read():
+            return [item async for item in aiter_sync(rows())]
+
+        self.assertEqual(async_to_sync(read)(), [b"a", b"b"])
+        self.assertEqual(closed, [True])
+
+    def test_closes_the_generator_when_the_client_disconnects(self):
+        closed = []
+        def rows():
+            try:
+                while True:
+                    yield b"row"
+            finally:
+                closed.append(True)
+
+        async def read_first():
+            chunks = aiter_sync(rows())
+            first = await chunks.__anext__()
+            await chunks.aclose()
+            return first
+
+        self.assertEqual(async_to_sync(read_first)(), b"row")
+        self.assertEqual(closed, [True])
+
+    def test_is_asgi_request(self):
+        self.assertTrue(is_asgi_request(AsyncRequestFactory().get("/products/")))
+        self.assertFalse(is_asgi_request(RequestFactory().get("/products/")))
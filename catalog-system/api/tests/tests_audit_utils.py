@@ -0,0 +1,97 @@
+import uuid
+from decimal import Decimal
+from django.http import QueryDict
+from django.test import SimpleTestCase, override_settings
+from rest_framework.exceptions import ValidationError
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+from api.models import ProductAuditEntry
+from api.utils.audit_utils import AuditLogWriter, audit_values, filter_audit_entries, record_product_changes, write_audit_entries, write_product_changes
+
+SKU_1 = uuid.UUID("7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10")
+BEFORE = {"name": "test_product", "price": "10.00", "brand": "zebrands"}
+AFTER = {"name": "test_product", "price": "12.50", "brand": "zebrands"}
+
+class AuditLogWriterTests(SimpleTestCase):
+    def setUp(self):
+        self.writer = AuditLogWriter(background=False)
+        writer_patcher = patch("api.utils.audit_utils.audit_log_writer", self.writer)
+        writer_patcher.start()
+        self.addCleanup(writer_patcher.stop)
+        self.user = SimpleNamespace(pk=1, email="admin@test.com", is_authenticated=True)
+
+    def test_audit_values_of_instances_and_dicts(self):
+        product = SimpleNamespace(name="test_product", price=Decimal("10"), brand="zebrands")
+
+        self.assertEqual(audit_values(product), BEFORE)
+        self.assertEqual(audit_values({"name": "test_product", "price": Decimal("10.0"), "brand": "zebrands"}), BEFORE)
+
+    def test_changes_are_queued_without_database_writes(self):
+        with patch("api.utils.audit_utils.write_audit_entries") as write_mock:
+            record_product_changes(self.user, [(SKU_1, None, AFTER), (SKU_1, BEFORE, AFTER), (SKU_1, AFTER, None)])
+
+        write_mock.assert_not_called()
+        self.assertEqual(
+            [(action, user_id, email) for _, action, _, user_id, email, _, _ in self.writer._pending],
+            [("CREATE", 1, "admin@test.com"), ("UPDATE", 1, "admin@test.com"), ("DELETE", 1, "admin@test.com")]
+        )
+
+    @override_settings(PRODUCT_AUDIT_MAX_BUFFER=2)
+    def test_full_buffer_is_written_right_away(self):
+        with patch("api.utils.audit_utils.write_audit_entries") as write_mock:
+            record_product_changes(self.user, [(SKU_1, None, AFTER)])
+            write_mock.assert_not_called()
+            record_product_changes(self.user, [(SKU_1, BEFORE, AFTER)])
+
+        self.assertEqual(len(write_mock.call_args.args[0]), 2)
+        self.assertEqual(self.writer._pending, [])
+
+    def test_failed_write_keeps_the_entries_in_order(self):
+        with patch("api.utils.audit_utils.write_audit_entries", side_effect=Exception("db down")):
+            record_product_changes(self.user, [(SKU_1, None, AFTER)])
+            with self.assertRaises(Exception):
+                self.writer.flush()
+        record_product_changes(self.user, [(SKU_1, AFTER, None)])
+
+        self.assertEqual([entry[1] for entry in self.writer._pending], ["CREATE", "DELETE"])
+
+    def test_written_changes_skip_the_buffer(self):
+        with patch("api.utils.audit_utils.write_audit_entries") as write_mock:
+            write_product_changes(None, [(SKU_1, None, AFTER), (SKU_1, BEFORE, AFTER)])
+
+        self.assertEqual(
+            [(action, user_id, email) for _, action, _, user_id, email, _, _ in write_mock.call_args.args[0]],
+            [("CREATE", None, ""), ("UPDATE", None, "")]
+        )
+        self.assertEqual(self.writer._pending, [])
+
+    def test_entries_are_inserted_in_batches(self):
+        entries = [(None, "UPDATE", SKU_1, 1, "admin@test.com", BEFORE, AFTER)] * 3
+        with patch("api.utils.audit_utils.ProductAuditEntry.objects.bulk_create") as bulk_create_mock:
+            write_audit_entries(entries)
+
+        created = bulk_create_mock.call_args.args[0]
+        self.assertEqual(len(created), 3)
+        self.assertEqual((created[0].sku, created[0].before, created[0].after), (SKU_1, BEFORE, AFTER))
+        self.assertEqual(bulk_create_mock.call_args.kwargs, {"batch_size": 1000})
+
+class FilterAuditEntriesTests(SimpleTestCase):
+    def test_filters_by_sku_and_user(self):
+        queryset = MagicMock()
+        queryset.filter.return_value = queryset
+
+        filter_audit_entries(queryset, QueryDict(f"sku={SKU_1}&user=3"))
+
+        self.assertEqual([c.kwargs for c in queryset.filter.call_args_list], [{"sku": SKU_1}, {"user_id": 3}])
+
+    def test_invalid_filters_raise_validation_error(self):
+        for params in ["sku=123", "user=abc"]:
+            with self.assertRaises(ValidationError):
+                filter_audit_entries(MagicMock(), QueryDict(params))
+
+    def test_sku_and_user_are_served_by_indexes(self):
+        indexes = [tuple(index.fields) for index in ProductAuditEntry._meta.indexes]
+
+        self.assertIn(("sku", "-id"), indexes)
+        self.assertIn(("user", "-id"), indexes)
@@ -0,0 +1,124 @@
+import uuid
+from decimal import Decimal
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+from unittest.mock import patch
+
+from api.models import Product
+from api.serializers import ProductUpsertSerializer
+from api.utils.bulk_utils import MAX_BULK_ITEMS, create_products, delete_products, get_bulk_items, upsert_products, validate_bulk_products
+
+SKU_1 = uuid.UUID("7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10")
+SKU_2 = uuid.UUID("0b7e3a52-8a5f-4d0e-9a51-2d1f3c4b5a69")
+SKU_3 = uuid.UUID("5c3f1d2e-6b7a-4c8d-9e0f-1a2b3c4d5e6f")
+
+class BulkProductsTests(SimpleTestCase):
+    def test_bulk_items_must_be_a_bounded_non_empty_list(self):
+        for data in [{}, [], "products", [{}] * (MAX_BULK_ITEMS + 1)]:
+            with self.assertRaises(ValidationError):
+                get_bulk_items(data)
+
+    def test_invalid_items_are_reported_by_index(self):
+        items = [
+            {"name": "test_product_1", "price": "10.50", "brand": "zebrands"},
+            {"name": "", "price": "10", "brand": "zebrands"},
+            {"name": "test_product_3", "price": "0", "brand": "zebrands"},
+            {"name": "test_product_4", "price": "4", "brand": "luuna"},
+        ]
+
+        validated, errors = validate_bulk_products(items)
+
+        self.assertEqual([data["name"] for data in validated], ["test_product_1", "test_product_4"])
+        self.assertEqual(validated[0]["price"], Decimal("10.50"))
+        self.assertEqual([error["index"] for error in errors], [1, 2])
+        self.assertIn("name", errors[0]["errors"])
+        self.assertIn("price", errors[1]["errors"])
+
+    def test_products_are_inserted_in_batches_in_one_transaction(self):
+        validated = [{"name": f"test_product_{i}", "price": Decimal("1"), "brand": "zebrands"} for i in range(3)]
+        with patch("api.utils.bulk_utils.transaction") as transaction_mock, \
+            patch("api.utils.bulk_utils.Product.objects.bulk_create") as bulk_create_mock, \
+            patch("api.utils.bulk_utils.BULK_BATCH_SIZE", 2):
+
+            products = create_products(validated)
+
+        transaction_mock.atomic.assert_called_once_with()
+        bulk_create_mock.assert_called_once_with(products, batch_size=2)
+        self.assertTrue(all(isinstance(product, Product) for product in products))
+        self.assertEqual(len({product.sku for product in products}), 3)
+
+    def test_repeated_unique_field_is_reported_by_index(self):
+        items = [
+            {"sku": str(SKU_1), "name": "test_product_1", "price": "1", "brand": "zebrands"},
+            {"sku": str(SKU_2), "name": "test_product_2", "price": "1", "brand": "zebrands"},
+            {"sku": str(SKU_1), "name": "test_product_3", "price": "1", "brand": "zebrands"},
+            {"name": "test_product_4", "price": "1", "brand": "zebrands"},
+        ]
+
+        validated, errors = validate_bulk_products(items, ProductUpsertSerializer, unique_field="sku")
+
+        self.assertEqual([data["sku"] for data in validated], [SKU_1, SKU_2])
+        self.assertEqual([error["index"] for error in errors], [2, 3])
+        self.assertIn("sku", errors[1]["errors"])
+
+    def test_upsert_writes_new_and_changed_products_only(self):
+        validated = [
+            {"sku": SKU_1, "name": "test_product_1", "price": Decimal("10"), "brand": "zebrands"},
+            {"sku": SKU_2, "name": "test_product_2", "price": Decimal("25.5"), "brand": "zebrands"},
+            {"sku": SKU_3, "name": "test_product_3", "price": Decimal("7"), "brand": "luuna"},
+        ]
+        with patch("api.utils.bulk_utils.transaction"), \
+            patch("api.utils.bulk_utils.Product.objects.filter") as filter_mock, \
+            patch("api.utils.bulk_utils.Product.objects.bulk_create") as bulk_create_mock:
+            filter_mock.return_value.values_list.return_value = [
+                (SKU_1, "test_product_1", Decimal("10.00"), "zebrands"),
+                (SKU_2, "test_product_2", Decimal("20.00"), "zebrands"),
+            ]
+
+            counts, products, previous = upsert_products(validated)
+
+        self.assertEqual(counts, {"inserted": 1, "updated": 1, "unchanged": 1})
+        self.assertEqual(previous, {SKU_2: {"name": "test_product_2", "price": Decimal("20.00"), "brand": "zebrands"}})
+        self.assertEqual([product.sku for product in products], [SKU_2, SKU_3])
+        self.assertIsNotNone(products[0].updated_at)
+        bulk_create_mock.assert_called_once_with(
+            products,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["sku"],
+            update_fields=["name", "price", "brand", "updated_at"],
+        )
+
+    def test_delete_by_skus_runs_one_statement_per_batch(self):
+        with patch("api.utils.bulk_utils.transaction"), \
+            patch("api.utils.bulk_utils.connection") as connection_mock, \
+            patch("api.utils.bulk_utils.BULK_BATCH_SIZE", 2):
+            cursor = connection_mock.cursor.return_value.__enter__.return_value
+            cursor.fetchall.side_effect = [
+                [(SKU_1, "test_product_1", Decimal("10"), "zebrands"), (SKU_2, "test_product_2", Decimal("20"), "zebrands")],
+                [(SKU_3, "test_product_3", Decimal("30"), "luuna")],
+            ]
+
+            deleted = delete_products(skus=[SKU_1, SKU_2, SKU_3])
+
+        self.assertEqual(cursor.execute.call_count, 2)
+        sql, params = cursor.execute.call_args_list[0].args
+        self.assertIn('DELETE FROM "api_product" WHERE "sku" = ANY(%s::uuid[]) RETURNING "sku", "name", "price", "brand"', sql)
+        self.assertIn('INSERT INTO "api_producttombstone" ("sku", "deleted_at") SELECT "sku", %s FROM "deleted"', sql)
+        self.assertEqual(params[0], [str(SKU_1), str(SKU_2)])
+        self.assertEqual([sku for sku, *_ in deleted], [SKU_1, SKU_2, SKU_3])
+
+    def test_delete_by_brand_repeats_batches_until_one_is_not_full(self):
+        with patch("api.utils.bulk_utils.transaction"), \
+            patch("api.utils.bulk_utils.connection") as connection_mock, \
+            patch("api.utils.bulk_utils.BULK_BATCH_SIZE", 2):
+            cursor = connection_mock.cursor.return_value.__enter__.return_value
+            cursor.fetchall.side_effect = [[(SKU_1, "a"), (SKU_2, "b")], [(SKU_3, "c")]]
+
+            deleted = delete_products(brand="zebrands")
+
+        self.assertEqual(cursor.execute.call_count, 2)
+        sql, params = cursor.execute.call_args.args
+        self.assertIn('WHERE "brand" = %s LIMIT %s', sql)
+        self.assertEqual(params[:2], ["zebrands", 2])
+        self.assertEqual(len(deleted), 3)
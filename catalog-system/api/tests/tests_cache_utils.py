@@ -0,0 +1,198 @@
+from asgiref.sync import async_to_sync
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from api.models import Product
+from api.utils.catalog_utils import bump_catalog_version
+from api.utils.cache_utils import (
+    CacheStats,
+    acache_product_response,
+    aget_cached_product,
+    cache_product_response,
+    get_cached_product,
+    get_product_cache,
+    invalidate_products,
+    product_cache_stats,
+)
+
+class CacheStatsTests(SimpleTestCase):
+    def test_snapshot_counts_hits_and_misses(self):
+        stats = CacheStats()
+        stats.record(hit=True)
+        stats.record(hit=False)
+        stats.record(hit=False)
+        stats.record(hit=True)
+
+        self.assertEqual(stats.snapshot(), {"hits": 2, "misses": 2, "hit_ratio": 0.5})
+        stats.reset()
+        self.assertEqual(stats.snapshot()["hit_ratio"], 0.0)
+
+class CacheProductResponseTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        version_patcher = patch("api.utils.catalog_utils.get_catalog_version", return_value=SimpleNamespace(version=3))
+        version_patcher.start()
+        self.addCleanup(version_patcher.stop)
+        get_product_cache().clear()
+        product_cache_stats.reset()
+
+    def test_hits_and_misses_are_counted(self):
+        view = cache_product_response(MagicMock(return_value=HttpResponse(b"[]", content_type="application/json")))
+
+        view(self.factory.get("/products/"))
+        view(self.factory.get("/products/"))
+        view(self.factory.get("/products/", {"page_size": 1}))
+
+        self.assertEqual(product_cache_stats.snapshot()["hits"], 1)
+        self.assertEqual(product_cache_stats.snapshot()["misses"], 2)
+
+    @override_settings(ALLOWED_HOSTS=["api.example.com", "zebrands-server"])
+    def test_responses_are_cached_per_host(self):
+        inner = MagicMock(side_effect=lambda request: HttpResponse(request.get_host(), content_type="application/json"))
+        view = cache_product_response(inner)
+
+        view(self.factory.get("/products/", HTTP_HOST="zebrands-server"))
+        response = view(self.factory.get("/products/", HTTP_HOST="api.example.com"))
+
+        self.assertEqual((response["X-Cache"], response.content), ("MISS", b"api.example.com"))
+        self.assertEqual(inner.call_count, 2)
+
+    @override_settings(PRODUCT_CACHE_MAX_RESPONSE_BYTES=4)
+    def test_responses_over_the_size_limit_are_not_stored(self):
+        inner = MagicMock(return_value=HttpResponse(b"[1,2,3]", content_type="application/json"))
+        view = cache_product_response(inner)
+
+        view(self.factory.get("/products/"))
+        view(self.factory.get("/products/"))
+
+        self.assertEqual(inner.call_count, 2)
+
+    def test_cache_errors_fall_back_to_the_view(self):
+        inner = MagicMock(return_value=HttpResponse(b"[]", content_type="application/json"))
+        view = cache_product_response(inner)
+        with patch("api.utils.cache_utils.get_product_cache") as cache_mock:
+            cache_mock.return_value.get.side_effect = Exception("cache down")
+            cache_mock.return_value.set.side_effect = Exception("cache down")
+
+            response = view(self.factory.get("/products/"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    @override_settings(CACHES={
+        "products": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "products-eviction-test",
+            "OPTIONS": {"MAX_ENTRIES": 2, "CULL_FREQUENCY": 2},
+        }
+    })
+    def test_cache_is_bounded_by_max_entries(self):
+        inner = MagicMock(side_effect=lambda request: HttpResponse(b"[]", content_type="application/json"))
+        view = cache_product_response(inner)
+
+        for page_size in range(1, 6):
+            view(self.factory.get("/products/", {"page_size": page_size}))
+
+        self.assertLessEqual(len(get_product_cache()._cache), 2)
+
+    def test_async_views_share_the_responses_of_the_sync_views(self):
+        inner = MagicMock(return_value=HttpResponse(b"[]", content_type="application/json"))
+        async_inner = AsyncMock(return_value=HttpResponse(b"[]", content_type="application/json"))
+
+        cache_product_response(inner)(self.factory.get("/products/"))
+        response = async_to_sync(acache_product_response(async_inner))(self.factory.get("/products/"))
+        async_to_sync(acache_product_response(async_inner))(self.factory.get("/products/", {"page_size": 1}))
+
+        self.assertEqual((response["X-Cache"], response.content), ("HIT", b"[]"))
+        async_inner.assert_awaited_once()
+        self.assertEqual(product_cache_stats.snapshot()["hits"], 1)
+
+class ProductDetailCacheTests(SimpleTestCase):
+    SKU = "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"
+
+    def setUp(self):
+        self.version = SimpleNamespace(version=1)
+        for name, mock_cls in [("get_catalog_version", MagicMock), ("aget_catalog_version", AsyncMock)]:
+            patcher = patch(f"api.utils.cache_utils.{name}", new_callable=mock_cls, return_value=self.version)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.request = APIRequestFactory().get(f"/products/{self.SKU}")
+        get_product_cache().clear()
+
+    def test_product_is_loaded_once_until_invalidated(self):
+        load = MagicMock(return_value={"sku": self.SKU, "views": 1})
+
+        get_cached_product(self.request, self.SKU, load)
+        cached = get_cached_product(self.request, self.SKU, load)
+        invalidate_products([self.SKU])
+        get_cached_product(self.request, self.SKU, load)
+
+        self.assertEqual(load.call_count, 2)
+        self.assertEqual(cached, {"sku": self.SKU, "views": 1})
+
+    def test_a_new_catalog_version_reads_the_product_again(self):
+        load = MagicMock(side_effect=[{"sku": self.SKU, "name": "old"}, {"sku": self.SKU, "name": "new"}])
+
+        get_cached_product(self.request, self.SKU, load)
+        self.version.version = 2
+        product = get_cached_product(self.request, self.SKU, load)
+
+        self.assertEqual(product["name"], "new")
+        self.assertEqual(load.call_count, 2)
+
+    def test_a_write_in_another_process_replaces_the_product_it_cached(self):
+        # The ASGI server reads through a locmem cache of its own, the write is made by the WSGI server
+        asgi_cache = LocMemCache("products-asgi", {})
+        load = AsyncMock(side_effect=[{"sku": self.SKU, "name": "old"}, {"sku": self.SKU, "name": "new"}])
+        with patch("api.utils.cache_utils.get_product_cache", return_value=asgi_cache):
+            async_to_sync(aget_cached_product)(self.request, self.SKU, load)
+            with patch("api.utils.catalog_utils.CatalogVersion") as version_model:
+                # The version row is shared through the database
+                version_model.objects.filter.return_value.update.side_effect = lambda **_: setattr(
+                    self.version, "version", self.version.version + 1
+                ) or 1
+                bump_catalog_version()
+
+            product = async_to_sync(aget_cached_product)(APIRequestFactory().get(f"/products/{self.SKU}"), self.SKU, load)
+
+        self.assertEqual(product["name"], "new")
+        self.assertEqual(load.await_count, 2)
+
+    def test_product_is_read_without_the_cache_when_the_version_fails(self):
+        load = MagicMock(return_value={"sku": self.SKU})
+
+        with patch("api.utils.cache_utils.get_catalog_version", side_effect=Exception("db down")):
+            get_cached_product(self.request, self.SKU, load)
+            get_cached_product(self.request, self.SKU, load)
+
+        self.assertEqual(load.call_count, 2)
+
+    def test_invalid_skus_skip_the_cache(self):
+        load = MagicMock(return_value={"sku": "123"})
+
+        get_cached_product(self.request, "123", load)
+        get_cached_product(self.request, "123", load)
+
+        self.assertEqual(load.call_count, 2)
+
+    def test_missing_products_are_not_cached(self):
+        load = MagicMock(side_effect=Product.DoesNotExist)
+
+        for _ in range(2):
+            with self.assertRaises(Product.DoesNotExist):
+                get_cached_product(self.request, self.SKU, load)
+
+        self.assertEqual(load.call_count, 2)
+
+    def test_async_product_is_loaded_once(self):
+        load = AsyncMock(return_value={"sku": self.SKU, "views": 1})
+
+        async_to_sync(aget_cached_product)(self.request, self.SKU, load)
+        cached = async_to_sync(aget_cached_product)(self.request, self.SKU, load)
+
+        load.assert_awaited_once()
+        self.assertEqual(cached, get_cached_product(self.request, self.SKU, MagicMock()))
@@ -0,0 +1,77 @@
+from asgiref.sync import async_to_sync
+from datetime import datetime, timezone
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+
+from api.utils.catalog_utils import (
+    bump_catalog_version,
+    catalog_etag,
+    catalog_last_modified,
+    get_catalog_version,
+    prefetch_catalog_version,
+)
+
+class CatalogVersionTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.version = SimpleNamespace(version=7, updated_at=datetime(2025, 9, 9, tzinfo=timezone.utc))
+
+    def test_bump_increments_the_version_row(self):
+        with patch("api.utils.catalog_utils.CatalogVersion.objects.filter") as filter_mock:
+            filter_mock.return_value.update.return_value = 1
+
+            bump_catalog_version()
+
+        filter_mock.assert_called_once_with(pk=1)
+        self.assertEqual(str(filter_mock.return_value.update.call_args.kwargs["version"]), 'F(version) + Value(1)')
+
+    def test_bump_creates_the_version_row_when_missing(self):
+        with patch("api.utils.catalog_utils.CatalogVersion.objects.filter") as filter_mock, \
+            patch("api.utils.catalog_utils.CatalogVersion.objects.get_or_create") as create_mock:
+            filter_mock.return_value.update.return_value = 0
+
+            bump_catalog_version()
+
+        create_mock.assert_called_once()
+
+    def test_version_is_read_once_per_request(self):
+        request = self.factory.get("/products/")
+        with patch("api.utils.catalog_utils.CatalogVersion.objects.filter") as filter_mock:
+            filter_mock.return_value.only.return_value.first.return_value = self.version
+
+            get_catalog_version(request)
+            get_catalog_version(request)
+
+        filter_mock.assert_called_once_with(pk=1)
+
+    def test_async_views_read_the_version_before_the_etag(self):
+        request = self.factory.get("/products/")
+        view = AsyncMock(side_effect=lambda request: catalog_etag(request))
+        with patch("api.utils.catalog_utils.CatalogVersion.objects.filter") as filter_mock:
+            filter_mock.return_value.only.return_value.afirst = AsyncMock(return_value=self.version)
+
+            etag = async_to_sync(prefetch_catalog_version(view))(request)
+
+        filter_mock.assert_called_once_with(pk=1)
+        self.assertTrue(etag.startswith('W/"7-'))
+
+    def test_etag_changes_with_version_and_representation(self):
+        with patch("api.utils.catalog_utils.get_catalog_version", return_value=self.version):
+            etag = catalog_etag(self.factory.get("/products/", {"page_size": 10}))
+            same = catalog_etag(self.factory.get("/products/", {"page_size": 10}))
+            other_page = catalog_etag(self.factory.get("/products/", {"page_size": 20}))
+            ndjson = catalog_etag(self.factory.get("/products/", {"page_size": 10}, HTTP_ACCEPT="application/x-ndjson"))
+        with patch("api.utils.catalog_utils.get_catalog_version", return_value=SimpleNamespace(version=8)):
+            bumped = catalog_etag(self.factory.get("/products/", {"page_size": 10}))
+
+        self.assertTrue(etag.startswith('W/"7-'))
+        self.assertEqual(etag, same)
+        self.assertEqual(len({etag, other_page, ndjson, bumped}), 4)
+
+    def test_validators_are_skipped_when_the_version_is_unavailable(self):
+        request = self.factory.get("/products/")
+        with patch("api.utils.catalog_utils.get_catalog_version", side_effect=Exception("db down")):
+            self.assertIsNone(catalog_etag(request))
+            self.assertIsNone(catalog_last_modified(request))
@@ -0,0 +1,86 @@
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from django.http import QueryDict
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+from unittest.mock import patch
+
+from api.serializers import PRODUCT_FIELDS
+from api.utils.changes_utils import MAX_CHANGES_LIMIT, get_changes_limit, get_changes_since, get_product_changes
+from api.utils.pagination_utils import decode_cursor, encode_cursor
+
+SKU_1 = uuid.UUID("7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10")
+SKU_2 = uuid.UUID("0b7e3a52-8a5f-4d0e-9a51-2d1f3c4b5a69")
+SKU_3 = uuid.UUID("5c3f1d2e-6b7a-4c8d-9e0f-1a2b3c4d5e6f")
+
+def at(second):
+    return datetime(2025, 9, 9, 0, 0, second, tzinfo=timezone.utc)
+
+def product(sku, second):
+    values = {"sku": sku, "name": "test_product", "price": Decimal("10.00"), "brand": "zebrands", "views": 1, "updated_at": at(second)}
+    return tuple(values[field] for field in PRODUCT_FIELDS)
+
+class ProductChangesTests(SimpleTestCase):
+    def setUp(self):
+        horizon_patcher = patch("api.utils.changes_utils.get_changes_horizon", return_value=at(59))
+        horizon_patcher.start()
+        self.addCleanup(horizon_patcher.stop)
+        product_patcher = patch("api.utils.changes_utils.Product")
+        self.product_mock = product_patcher.start()
+        self.addCleanup(product_patcher.stop)
+        tombstone_patcher = patch("api.utils.changes_utils.ProductTombstone")
+        self.tombstone_mock = tombstone_patcher.start()
+        self.addCleanup(tombstone_patcher.stop)
+        self.products = self.product_mock.objects.filter.return_value
+        self.tombstones = self.tombstone_mock.objects.filter.return_value
+
+    def set_changes(self, products, tombstones, products_queryset=None, tombstones_queryset=None):
+        (products_queryset or self.products).order_by.return_value.values_list.return_value.__getitem__.return_value = products
+        (tombstones_queryset or self.tombstones).order_by.return_value.values_list.return_value.__getitem__.return_value = tombstones
+
+    def test_limit_and_since_are_validated(self):
+        self.assertEqual(get_changes_limit(QueryDict("")), 100)
+        for limit in ["abc", "0", str(MAX_CHANGES_LIMIT + 1)]:
+            with self.assertRaises(ValidationError):
+                get_changes_limit(QueryDict(f"limit={limit}"))
+        self.assertIsNone(get_changes_since(QueryDict("")))
+        with self.assertRaises(ValidationError):
+            get_changes_since(QueryDict(f"since={encode_cursor(['one'])}"))
+
+    def test_updates_and_deletes_are_merged_in_write_order(self):
+        self.set_changes([product(SKU_1, 1), product(SKU_3, 3)], [(SKU_2, at(2))])
+
+        changes, next_cursor, has_more = get_product_changes(limit=10)
+
+        self.product_mock.objects.filter.assert_called_once_with(updated_at__lt=at(59))
+        self.tombstone_mock.objects.filter.assert_called_once_with(deleted_at__lt=at(59))
+        self.assertEqual([(c["action"], c["sku"]) for c in changes], [("upsert", SKU_1), ("delete", SKU_2), ("upsert", SKU_3)])
+        self.assertEqual(changes[0]["product"]["name"], "test_product")
+        self.assertEqual(decode_cursor(next_cursor), [str(at(3)), str(SKU_3)])
+        self.assertFalse(has_more)
+
+    def test_page_stops_at_the_limit(self):
+        self.set_changes([product(SKU_1, 1), product(SKU_3, 3)], [(SKU_2, at(2))])
+
+        changes, next_cursor, has_more = get_product_changes(limit=2)
+
+        self.products.order_by.assert_called_once_with("updated_at", "sku")
+        self.products.order_by.return_value.values_list.return_value.__getitem__.assert_called_once_with(slice(None, 3))
+        self.assertEqual([c["sku"] for c in changes], [SKU_1, SKU_2])
+        self.assertEqual(decode_cursor(next_cursor), [str(at(2)), str(SKU_2)])
+        self.assertTrue(has_more)
+
+    def test_since_reads_after_the_cursor_and_is_kept_without_changes(self):
+        since = [str(at(5)), str(SKU_1)]
+        products_after = self.products.filter.return_value
+        tombstones_after = self.tombstones.filter.return_value
+        self.set_changes([], [], products_after, tombstones_after)
+
+        changes, next_cursor, has_more = get_product_changes(since, limit=10)
+
+        condition = self.products.filter.call_args.args[0]
+        self.assertIn(("updated_at__gte", since[0]), condition.children)
+        self.assertEqual(changes, [])
+        self.assertEqual(decode_cursor(next_cursor), since)
+        self.assertFalse(has_more)
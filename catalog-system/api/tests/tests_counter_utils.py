@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import patch
+
+from api.utils.counter_utils import ProductViewCounter, record_revalidated_view, write_product_views
+
+SKU_1 = "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"
+SKU_2 = "0b7e3a52-8a5f-4d0e-9a51-2d1f3c4b5a69"
+
+class ProductViewCounterTests(SimpleTestCase):
+    def setUp(self):
+        self.counter = ProductViewCounter(background=False)
+
+    def test_views_are_collected_without_database_writes(self):
+        with patch("api.utils.counter_utils.write_product_views") as write_mock:
+            for _ in range(3):
+                self.counter.add(SKU_1)
+            self.counter.add(SKU_2)
+
+        write_mock.assert_not_called()
+        self.assertEqual(self.counter.pending(SKU_1), 3)
+        self.assertEqual(self.counter.pending(SKU_2), 1)
+
+    def test_flush_writes_every_pending_view_and_invalidates_products(self):
+        with patch("api.utils.counter_utils.write_product_views") as write_mock, \
+            patch("api.utils.counter_utils.invalidate_products") as invalidate_mock:
+            self.counter.add(SKU_1)
+            self.counter.add(SKU_1)
+            self.counter.add(SKU_2)
+
+            flushed = self.counter.flush()
+
+        self.assertEqual(write_mock.call_args.args[0], {SKU_1: 2, SKU_2: 1})
+        self.assertEqual(flushed, [SKU_1, SKU_2])
+        invalidate_mock.assert_called_once()
+        self.assertEqual(self.counter.pending(SKU_1), 0)
+
+    def test_failed_flush_keeps_the_views_for_the_next_one(self):
+        with patch("api.utils.counter_utils.write_product_views", side_effect=Exception("db down")), \
+            patch("api.utils.counter_utils.invalidate_products") as invalidate_mock:
+            self.counter.add(SKU_1)
+            with self.assertRaises(Exception):
+                self.counter.flush()
+            self.counter.add(SKU_1)
+
+        invalidate_mock.assert_not_called()
+        self.assertEqual(self.counter.pending(SKU_1), 2)
+
+    @override_settings(PRODUCT_VIEWS_MAX_BUFFER=2)
+    def test_full_buffer_is_flushed_right_away(self):
+        with patch("api.utils.counter_utils.write_product_views") as write_mock, \
+            patch("api.utils.counter_utils.invalidate_products"):
+            self.counter.add(SKU_1)
+            self.counter.add(SKU_1)
+            write_mock.assert_not_called()
+            self.counter.add(SKU_2)
+
+        self.assertEqual(write_mock.call_args.args[0], {SKU_1: 2, SKU_2: 1})
+
+    @override_settings(PRODUCT_VIEWS_FLUSH_INTERVAL=0.01)
+    def test_background_thread_flushes_after_the_interval(self):
+        counter = ProductViewCounter(background=True)
+        with patch("api.utils.counter_utils.write_product_views") as write_mock, \
+            patch("api.utils.counter_utils.invalidate_products"), \
+            patch("api.utils.buffer_utils.close_old_connections"):
+            counter.add(SKU_1)
+            for _ in range(200):
+                if write_mock.called:
+                    break
+                counter._wake.wait(0.01)
+
+        self.assertEqual(write_mock.call_args.args[0], {SKU_1: 1})
+        self.assertEqual(counter.pending(SKU_1), 0)
+
+    def test_revalidated_views_are_counted_by_their_normalized_sku(self):
+        with patch("api.utils.counter_utils.product_view_counter", self.counter):
+            record_revalidated_view(SKU_1.upper())
+            record_revalidated_view("not-a-sku")
+
+        self.assertEqual(self.counter.pending(SKU_1), 1)
+        self.assertEqual(len(self.counter._pending), 1)
+
+class WriteProductViewsTests(SimpleTestCase):
+    def test_views_are_added_to_products_and_hourly_buckets_per_batch(self):
+        views = {SKU_1: 2, SKU_2: 1}
+        at = datetime(2025, 9, 9, 10, 42, 7, tzinfo=timezone.utc)
+        with patch("api.utils.counter_utils.transaction"), \
+            patch("api.utils.counter_utils.connection") as connection_mock, \
+            patch("api.utils.counter_utils.FLUSH_BATCH_SIZE", 1):
+            write_product_views(views, at)
+
+        cursor = connection_mock.cursor.return_value.__enter__.return_value
+        self.assertEqual(cursor.execute.call_count, 4)
+        update_sql, update_params = cursor.execute.call_args_list[0].args
+        self.assertIn('SET "views" = "api_product"."views" + "pending"."views"', update_sql)
+        self.assertIn('FROM (VALUES (%s::uuid, %s::integer))', update_sql)
+        self.assertEqual(update_params, [SKU_1, 2])
+        bucket_sql, bucket_params = cursor.execute.call_args_list[1].args
+        self.assertIn('ON CONFLICT ("hours", "start", "sku")', bucket_sql)
+        self.assertEqual(bucket_params, [datetime(2025, 9, 9, 10, tzinfo=timezone.utc), 1, SKU_1, 2])
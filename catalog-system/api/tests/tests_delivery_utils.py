@@ -0,0 +1,109 @@
+import smtplib
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import patch, MagicMock
+
+from api.utils.delivery_utils import EmailDelivery, chunk_recipients
+
+RECIPIENTS = [f"user{i}@test.com" for i in range(5)]
+
+@override_settings(EMAIL_BCC_CHUNK_SIZE=2, EMAIL_SEND_RETRIES=1)
+class EmailDeliveryTests(SimpleTestCase):
+    def setUp(self):
+        self.connections = []
+        connection_patch = patch("api.utils.delivery_utils.get_connection", side_effect=self.new_connection)
+        self.get_connection_mock = connection_patch.start()
+        self.addCleanup(connection_patch.stop)
+
+    def new_connection(self, fail_silently):
+        connection = MagicMock()
+        self.connections.append(connection)
+        return connection
+
+    def sent_messages(self, connection):
+        return [c.args[0][0] for c in connection.send_messages.call_args_list]
+
+    def test_recipients_are_split_in_chunks(self):
+        self.assertEqual(chunk_recipients(RECIPIENTS, 2), [RECIPIENTS[0:2], RECIPIENTS[2:4], RECIPIENTS[4:]])
+        self.assertEqual(chunk_recipients([], 2), [])
+
+    def test_chunks_are_sent_as_bcc_over_one_connection(self):
+        delivery = EmailDelivery()
+
+        sent = delivery.send("subject", "body", "noreply@test.com", RECIPIENTS)
+        delivery.send("subject", "body", "noreply@test.com", RECIPIENTS)
+
+        self.assertEqual(sent, 3)
+        self.assertEqual(len(self.connections), 1)
+        self.get_connection_mock.assert_called_once_with(fail_silently=False)
+        messages = self.sent_messages(self.connections[0])
+        self.assertEqual(len(messages), 6)
+        self.assertEqual([message.bcc for message in messages[:3]], [RECIPIENTS[0:2], RECIPIENTS[2:4], RECIPIENTS[4:]])
+        self.assertEqual(messages[0].to, [])
+        self.assertEqual(messages[0].message()["To"], "undisclosed-recipients:;")
+        self.assertEqual(messages[0].from_email, "noreply@test.com")
+        stats = delivery.stats.snapshot()
+        self.assertEqual((stats["emails"], stats["messages"], stats["recipients"]), (2, 6, 10))
+        self.assertEqual((stats["connections"], stats["reconnects"], stats["messages_per_connection"]), (1, 0, 6.0))
+
+    def test_failed_message_is_resent_over_a_new_connection(self):
+        delivery = EmailDelivery()
+        delivery.send("subject", "body", "noreply@test.com", RECIPIENTS[:1])
+        self.connections[0].send_messages.side_effect = smtplib.SMTPServerDisconnected("idle timeout")
+
+        with self.assertLogs("api.utils.delivery_utils", level="WARNING"):
+            sent = delivery.send("subject", "body", "noreply@test.com", RECIPIENTS[:1])
+
+        self.assertEqual(sent, 1)
+        self.assertEqual(len(self.connections), 2)
+        self.connections[0].close.assert_called_once_with()
+        self.assertEqual(len(self.sent_messages(self.connections[1])), 1)
+        self.assertEqual(delivery.stats.snapshot()["reconnects"], 1)
+
+    def test_message_failing_after_the_retries_raises(self):
+        self.get_connection_mock.side_effect = lambda fail_silently: self.failing_connection()
+        delivery = EmailDelivery()
+
+        with self.assertLogs("api.utils.delivery_utils", level="WARNING"), \
+            self.assertRaises(smtplib.SMTPServerDisconnected):
+            delivery.send("subject", "body", "noreply@test.com", RECIPIENTS)
+
+        self.assertEqual(len(self.connections), 2)
+        for connection in self.connections:
+            connection.close.assert_called_once_with()
+        self.assertEqual(delivery.stats.snapshot()["emails"], 0)
+
+    def test_sent_chunks_are_reported_before_a_failing_one(self):
+        delivery = EmailDelivery()
+        delivery.send("subject", "body", "noreply@test.com", RECIPIENTS[:1])
+        self.connections[0].send_messages.side_effect = [None, smtplib.SMTPServerDisconnected("down")]
+        self.get_connection_mock.side_effect = lambda fail_silently: self.failing_connection()
+        sent = []
+
+        with self.assertLogs("api.utils.delivery_utils", level="WARNING"), \
+            self.assertRaises(smtplib.SMTPServerDisconnected):
+            delivery.send("subject", "body", "noreply@test.com", RECIPIENTS, on_chunk_sent=sent.extend)
+
+        self.assertEqual(sent, RECIPIENTS[0:2])
+
+    def failing_connection(self):
+        connection = self.new_connection(False)
+        connection.send_messages.side_effect = smtplib.SMTPServerDisconnected("down")
+        return connection
+
+    def test_fail_silently_returns_zero(self):
+        self.get_connection_mock.side_effect = ConnectionRefusedError("no server")
+        delivery = EmailDelivery()
+
+        with self.assertLogs("api.utils.delivery_utils", level="ERROR"):
+            sent = delivery.send("subject", "body", "noreply@test.com", RECIPIENTS, fail_silently=True)
+
+        self.assertEqual(sent, 0)
+
+    def test_close_closes_the_open_connection(self):
+        delivery = EmailDelivery()
+        delivery.send("subject", "body", "noreply@test.com", RECIPIENTS[:1])
+
+        delivery.close()
+        delivery.close()
+
+        self.connections[0].close.assert_called_once_with()
@@ -1,6 +1,6 @@
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, override_settings
 from unittest.mock import patch, MagicMock
-from api.utils import notify_via_email
+from api.utils import notify_changes_via_email, notify_digest_via_email, notify_via_email
 from types import SimpleNamespace
 
 class EmailNotificationTests(SimpleTestCase):
@@ -9,8 +9,8 @@ class EmailNotificationTests(SimpleTestCase):
     
     def test_send_email_successfully(self):
         # Define mock data and functions
-        with patch("api.utils.email_utils.User.objects.all") as all_mock, \
-            patch("api.utils.email_utils.send_mail") as send_email_mock, \
+        with patch("api.utils.email_utils.get_recipients") as recipients_mock, \
+            patch("api.utils.email_utils.email_delivery.send") as send_email_mock, \
             patch("api.utils.email_utils.EMAIL_HOST_USER", "noreply@test.com"):
             product_id = "123"
             product_name = "test_product"
@@ -38,7 +38,7 @@ class EmailNotificationTests(SimpleTestCase):
                     last_login="2025-09-09T05:37:41.464443Z"
                 ),
             ]
-            all_mock.return_value = existing_users
+            recipients_mock.return_value = [user.email for user in existing_users]
             formatted_subject = f"Product catalog has been recently changed by: {owner}"
             expected_receivers = [
                 "user@test.com",
@@ -54,7 +54,7 @@ class EmailNotificationTests(SimpleTestCase):
             )
         
         # Assertions
-        all_mock.assert_called_once()
+        recipients_mock.assert_called_once()
         send_email_mock.assert_called_once()
         subject, message, from_email, receivers, fail_silently = send_email_mock.call_args[0]
         assert formatted_subject == subject
@@ -64,8 +64,8 @@ class EmailNotificationTests(SimpleTestCase):
         assert fail_silently is True
 
     def test_send_email_db_fails(self):
-        with patch("api.utils.email_utils.User.objects.all", side_effect=Exception("db down")) as all_mock, \
-            patch("api.utils.email_utils.send_mail") as send_email_mock, \
+        with patch("api.utils.email_utils.get_recipients", side_effect=Exception("db down")) as recipients_mock, \
+            patch("api.utils.email_utils.email_delivery.send") as send_email_mock, \
             patch("api.utils.email_utils.EMAIL_HOST_USER", "noreply@test.com"):
             product_id = "123"
             product_name = "test_product"
@@ -93,7 +93,7 @@ class EmailNotificationTests(SimpleTestCase):
                     last_login="2025-09-09T05:37:41.464443Z"
                 ),
             ]
-            all_mock.return_value = existing_users
+            recipients_mock.return_value = [user.email for user in existing_users]
             
             # Test function with mock data
             try:
@@ -104,14 +104,14 @@ class EmailNotificationTests(SimpleTestCase):
                     action
                 )
             except Exception as e:
-                all_mock.assert_called_once()
+                recipients_mock.assert_called_once()
                 send_email_mock.assert_not_called()
                 assert str(e.args[0]) == "Sending email failed"
                 assert isinstance(e.args[1], Exception)
         
     def test_send_email_smtp_fails(self):
-        with patch("api.utils.email_utils.User.objects.all") as all_mock, \
-            patch("api.utils.email_utils.send_mail", side_effect=Exception("smtp down")) as send_email_mock, \
+        with patch("api.utils.email_utils.get_recipients") as recipients_mock, \
+            patch("api.utils.email_utils.email_delivery.send", side_effect=Exception("smtp down")) as send_email_mock, \
             patch("api.utils.email_utils.EMAIL_HOST_USER", "noreply@test.com"):
             product_id = "123"
             product_name = "test_product"
@@ -139,7 +139,7 @@ class EmailNotificationTests(SimpleTestCase):
                     last_login="2025-09-09T05:37:41.464443Z"
                 ),
             ]
-            all_mock.return_value = existing_users
+            recipients_mock.return_value = [user.email for user in existing_users]
             
             # Test function with mock data
             try:
@@ -154,4 +154,86 @@ class EmailNotificationTests(SimpleTestCase):
                 send_email_mock.assert_called_once()
                 assert str(e.args[0]) == "Sending email failed"
                 assert isinstance(e.args[1], Exception)
-        
\ No newline at end of file
+        
+class EmailDigestNotificationTests(SimpleTestCase):
+    @override_settings(NOTIFICATION_DIGEST_MAX_PRODUCTS=50)
+    def test_send_one_digest_for_many_products(self):
+        # Define mock data and functions
+        with patch("api.utils.email_utils.get_recipients") as recipients_mock, \
+            patch("api.utils.email_utils.email_delivery.send") as send_email_mock, \
+            patch("api.utils.email_utils.EMAIL_HOST_USER", "noreply@test.com"):
+            recipients_mock.return_value = ["user@test.com"]
+            products = [(f"sku-{i}", f"product_{i}") for i in range(53)]
+
+            # Test function with mock data
+            notify_digest_via_email(products, "admin@test.com", "CREATE")
+
+        # Assertions
+        send_email_mock.assert_called_once()
+        subject, message, from_email, receivers, fail_silently = send_email_mock.call_args[0]
+        assert subject == "Product catalog has been recently changed by: admin@test.com"
+        assert "Action: CREATE" in message and "Products: 53" in message
+        assert "sku-0: product_0" in message and "sku-50:" not in message
+        assert "and 3 more" in message
+        assert receivers == ["user@test.com"]
+
+    def test_send_digest_smtp_fails(self):
+        with patch("api.utils.email_utils.get_recipients", return_value=[]), \
+            patch("api.utils.email_utils.email_delivery.send", side_effect=Exception("smtp down")):
+
+            with self.assertRaises(Exception) as context:
+                notify_digest_via_email([("123", "test_product")], "admin@test.com", "DELETE")
+
+        assert str(context.exception.args[0]) == "Sending email failed"
+
+class EmailChangesNotificationTests(SimpleTestCase):
+    def test_send_one_email_for_changes_of_many_users(self):
+        # Define mock data and functions
+        with patch("api.utils.email_utils.get_recipients") as recipients_mock, \
+            patch("api.utils.email_utils.email_delivery.send") as send_email_mock, \
+            patch("api.utils.email_utils.EMAIL_HOST_USER", "noreply@test.com"):
+            changes = [
+                ("CREATE", "123", "test_product", "admin@test.com"),
+                ("UPDATE", "123", "test_product", "other@test.com"),
+                ("DELETE", "234", "other_product", "admin@test.com"),
+            ]
+
+            # Test function with mock data
+            notify_changes_via_email(changes, recipients=["user@test.com"])
+
+        # Assertions
+        recipients_mock.assert_not_called()
+        subject, message, from_email, receivers, fail_silently = send_email_mock.call_args[0]
+        assert subject == "Product catalog has been recently changed by: admin@test.com, other@test.com"
+        assert "Changes: 3" in message
+        assert "Action: UPDATE | Product_id: 123 | Product_name: test_product | Changed by: other@test.com" in message
+        assert receivers == ["user@test.com"]
+
+    def test_every_change_of_a_long_session_is_listed(self):
+        # Define mock data and functions
+        with patch("api.utils.email_utils.email_delivery.send") as send_email_mock:
+            changes = [("UPDATE", f"sku-{i}", f"product_{i}", "admin@test.com") for i in range(500)]
+
+            # Test function with mock data
+            notify_changes_via_email(changes, recipients=["user@test.com"])
+
+        # Assertions
+        message = send_email_mock.call_args[0][1]
+        assert "Changes: 500" in message
+        assert message.count("Action: UPDATE") == 500
+        assert "more" not in message
+
+    @override_settings(NOTIFICATION_DIGEST_MAX_PRODUCTS=2)
+    def test_changes_past_the_limit_are_only_counted(self):
+        # Define mock data and functions
+        with patch("api.utils.email_utils.email_delivery.send") as send_email_mock:
+            changes = [("UPDATE", f"sku-{i}", f"product_{i}", "admin@test.com") for i in range(5)]
+
+            # Test function with mock data
+            notify_changes_via_email(changes, recipients=["user@test.com"])
+
+        # Assertions
+        message = send_email_mock.call_args[0][1]
+        assert "Changes: 5" in message
+        assert "Product_id: sku-1 " in message and "Product_id: sku-2 " not in message
+        assert "and 3 more" in message
@@ -0,0 +1,158 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
+from unittest.mock import patch
+
+from api.utils.events_utils import (
+    KEEPALIVE_FRAME,
+    ProductEventBroadcaster,
+    encode_product_event,
+    get_last_event_key,
+    iter_product_events,
+)
+from api.utils.pagination_utils import decode_cursor, encode_cursor
+
+SKU_1 = uuid.UUID("7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10")
+
+def key(second):
+    return datetime(2025, 9, 9, 0, 0, second, tzinfo=timezone.utc), SKU_1
+
+def frames(*seconds):
+    return [(key(second), f"event {second}\n\n".encode()) for second in seconds]
+
+def broadcaster_at(second):
+    """
+    Broadcaster that started polling at the key, without its polling task
+    """
+    broadcaster = ProductEventBroadcaster()
+    broadcaster.cursor = broadcaster.floor = key(second)
+    return broadcaster
+
+def queued(subscriber):
+    items = []
+    while not subscriber.queue.empty():
+        items.append(subscriber.queue.get_nowait())
+    return items
+
+class LastEventKeyTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_key_is_read_from_the_header_or_the_since_cursor(self):
+        cursor = encode_cursor(["2025-09-09 00:00:05+00:00", str(SKU_1)])
+
+        from_header = get_last_event_key(self.factory.get("/products/events", HTTP_LAST_EVENT_ID=cursor))
+        from_since = get_last_event_key(self.factory.get("/products/events", {"since": cursor}))
+
+        self.assertEqual(from_header, key(5))
+        self.assertEqual(from_since, key(5))
+        self.assertIsNone(get_last_event_key(self.factory.get("/products/events")))
+
+    def test_invalid_keys_raise(self):
+        for values in [["2025-09-09 00:00:05+00:00"], ["2025-09-09 00:00:05", str(SKU_1)], ["2025-09-09 00:00:05+00:00", "123"]]:
+            request = self.factory.get("/products/events", HTTP_LAST_EVENT_ID=encode_cursor(values))
+            with self.assertRaises(ValidationError):
+                get_last_event_key(request)
+
+    def test_event_id_is_the_changes_cursor(self):
+        change = {"action": "delete", "sku": SKU_1, "changed_at": key(5)[0]}
+
+        event_key, frame = encode_product_event(change, JSONEncoder(separators=(",", ":")))
+
+        self.assertEqual(event_key, key(5))
+        event_id, event, data = frame.decode().rstrip("\n").split("\n")
+        self.assertEqual(decode_cursor(event_id[len("id: "):]), ["2025-09-09 00:00:05+00:00", str(SKU_1)])
+        self.assertEqual(event, "event: delete")
+        self.assertTrue(data.startswith('data: {"action":"delete"'))
+        self.assertTrue(frame.endswith(b"\n\n"))
+
+@override_settings(PRODUCT_EVENTS_HISTORY_SIZE=3, PRODUCT_EVENTS_CLIENT_BUFFER=4)
+class ProductEventBroadcasterTests(SimpleTestCase):
+    def test_published_events_are_queued_once_to_every_stream(self):
+        broadcaster = broadcaster_at(0)
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+
+        broadcaster.publish(frames(1, 2))
+
+        first_items, second_items = queued(first), queued(second)
+        self.assertEqual(first_items, [(b"event 1\n\nevent 2\n\n", 2)])
+        self.assertIs(second_items[0][0], first_items[0][0])
+        self.assertEqual(broadcaster.cursor, key(2))
+        self.assertEqual(broadcaster.stats.snapshot()["streams"], 2)
+
+    def test_stream_resumes_from_the_history(self):
+        broadcaster = broadcaster_at(0)
+        broadcaster.publish(frames(1, 2, 3, 4))
+
+        resumed = broadcaster.subscribe(key(2))
+
+        self.assertEqual(broadcaster.floor, key(1))
+        self.assertEqual(queued(resumed), [(b"event 3\n\nevent 4\n\n", 2)])
+        self.assertIsNone(resumed.after)
+        self.assertIsNone(broadcaster.subscribe(key(0)))
+
+    def test_stream_ahead_of_the_broadcaster_skips_the_events_it_has(self):
+        broadcaster = broadcaster_at(0)
+        ahead = broadcaster.subscribe(key(2))
+
+        broadcaster.publish(frames(1, 2, 3))
+
+        self.assertEqual(queued(ahead), [(b"event 3\n\n", 1)])
+        self.assertIsNone(ahead.after)
+
+    def test_slow_stream_is_closed_when_its_buffer_is_full(self):
+        broadcaster = broadcaster_at(0)
+        slow = broadcaster.subscribe()
+
+        # A batch bigger than the buffer still goes to an empty queue
+        broadcaster.publish(frames(1, 2, 3, 4, 5))
+        with self.assertLogs("api.utils.events_utils", level="WARNING"):
+            broadcaster.publish(frames(6))
+
+        self.assertEqual(queued(slow), [None])
+        self.assertEqual(slow.pending, 0)
+        self.assertEqual(broadcaster.stats.snapshot(), {"polls": 0, "events": 0, "streams": 0, "dropped": 1})
+
+    def test_keep_alive_is_only_queued_to_idle_streams(self):
+        broadcaster = broadcaster_at(0)
+        idle = broadcaster.subscribe()
+        busy = broadcaster.subscribe(key(0))
+        busy.queue.put_nowait((b"event\n\n", 1))
+
+        broadcaster.keep_alive()
+
+        self.assertEqual(queued(idle), [(KEEPALIVE_FRAME, 0)])
+        self.assertEqual(queued(busy), [(b"event\n\n", 1)])
+
+@override_settings(PRODUCT_EVENTS_HISTORY_SIZE=2, PRODUCT_EVENTS_CLIENT_BUFFER=10, PRODUCT_EVENTS_BATCH_SIZE=2)
+class IterProductEventsTests(SimpleTestCase):
+    def test_stream_behind_the_history_catches_up_from_the_database(self):
+        # Define mock data and functions
+        broadcaster = broadcaster_at(0)
+        broadcaster.publish(frames(1, 2, 3))
+
+        async def start():
+            pass
+
+        async def collect():
+            chunks = []
+            async for chunk in iter_product_events(key(0), broadcaster):
+                chunks.append(chunk)
+                if b"event 3" in chunk:
+                    broadcaster.publish(frames(4))
+                elif b"event 4" in chunk:
+                    await broadcaster.stop()
+            return chunks
+
+        # Test function with mock data
+        with patch.object(broadcaster, "start", start), \
+            patch("api.utils.events_utils.read_product_events", return_value=(frames(1), True)) as read_mock:
+            chunks = asyncio.run(collect())
+
+        # Assertions
+        self.assertEqual(chunks, [b"event 1\n\n", b"event 2\n\nevent 3\n\n", b"event 4\n\n"])
+        read_mock.assert_called_once_with(key(0), 2)
+        self.assertEqual(broadcaster.stats.snapshot()["streams"], 0)
@@ -0,0 +1,98 @@
+import gzip
+import io
+from asgiref.sync import async_to_sync
+from django.http import QueryDict
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+from unittest.mock import patch, MagicMock
+
+from api.models import Product
+from api.utils.export_utils import copy_export, export_products_response, get_export_format, get_export_lines, gzipped, iter_export_lines
+
+class ExportTests(SimpleTestCase):
+    def test_export_format_defaults_to_csv(self):
+        self.assertEqual(get_export_format(QueryDict("")), "csv")
+        self.assertEqual(get_export_format(QueryDict("file_format=ndjson")), "ndjson")
+        with self.assertRaises(ValidationError):
+            get_export_format(QueryDict("file_format=xml"))
+
+    def test_lines_are_rendered_by_the_database_in_sku_order(self):
+        queryset = MagicMock()
+        lines = queryset.order_by.return_value.annotate.return_value.values_list.return_value
+        lines.iterator.return_value = iter(['123,"test_product",10.00,"zebrands",1,2025-09-09T00:00:00.000000Z'])
+
+        exported = list(iter_export_lines(queryset, "csv", chunk_size=10))
+
+        queryset.order_by.assert_called_once_with("sku")
+        lines.iterator.assert_called_once_with(chunk_size=10)
+        self.assertEqual(exported, [
+            "sku,name,price,brand,views,updated_at\n",
+            '123,"test_product",10.00,"zebrands",1,2025-09-09T00:00:00.000000Z\n',
+        ])
+
+    def test_line_sql_quotes_csv_text_and_builds_json_objects(self):
+        csv_sql = str(get_export_lines(Product.objects.all(), "csv").query)
+        ndjson_sql = str(get_export_lines(Product.objects.all(), "ndjson").query)
+
+        self.assertIn("""replace("api_product"."name", '"', '""')""", csv_sql)
+        self.assertIn('row_to_json("row")', ndjson_sql)
+        self.assertIn('"api_product"."price"::text AS "price"', ndjson_sql)
+
+    def test_gzipped_chunks_decompress_to_the_original(self):
+        chunks = [b"sku,name\n", b"1,a\n" * 1000, b""]
+
+        self.assertEqual(gzip.decompress(b"".join(gzipped(iter(chunks)))), b"".join(chunks))
+
+    def test_response_is_a_named_attachment(self):
+        with patch("api.utils.export_utils.iter_export", return_value=iter([b""])):
+            response = export_products_response(MagicMock(), "ndjson", gzip=True)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="products.ndjson.gz"')
+
+    def test_asgi_response_streams_through_an_async_iterator(self):
+        with patch("api.utils.export_utils.iter_export", return_value=iter([b"sku,name\n", b"1,a\n"])):
+            response = export_products_response(MagicMock(), "csv", asgi=True)
+
+            async def read():
+                return b"".join([chunk async for chunk in response.streaming_content])
+
+            body = async_to_sync(read)()
+
+        self.assertTrue(response.is_async)
+        self.assertEqual(body, b"sku,name\n1,a\n")
+
+    def test_copy_export_writes_header_and_copies_the_csv_columns(self):
+        file = io.BytesIO()
+        with patch("api.utils.export_utils.connection") as connection_mock:
+            cursor = connection_mock.cursor.return_value.__enter__.return_value
+            cursor.mogrify.return_value = b'SELECT sku, name FROM "api_product"'
+            cursor.rowcount = 2
+
+            exported = copy_export(Product.objects.filter(brand="zebrands"), "csv", file)
+
+        sql, params = cursor.mogrify.call_args.args
+        self.assertIn('SELECT "api_product"."sku" AS "sku", "api_product"."name" AS "name", "api_product"."price" AS "price"', sql)
+        self.assertTrue(sql.endswith("ORDER BY 1 ASC"))
+        self.assertNotIn("replace(", sql)
+        self.assertEqual(params, ("zebrands",))
+        copy_sql, target = cursor.copy_expert.call_args.args
+        # COPY quotes the text columns itself, so newlines and quotes in a name stay inside its field
+        self.assertEqual(copy_sql, """COPY (SELECT sku, name FROM "api_product") TO STDOUT WITH (FORMAT csv, FORCE_QUOTE ("name", "brand"))""")
+        self.assertIs(target, file)
+        self.assertEqual(file.getvalue(), b"sku,name,price,brand,views,updated_at\n")
+        self.assertEqual(exported, 2)
+
+    def test_copy_export_copies_the_ndjson_lines_unchanged(self):
+        file = io.BytesIO()
+        with patch("api.utils.export_utils.connection") as connection_mock:
+            cursor = connection_mock.cursor.return_value.__enter__.return_value
+            cursor.mogrify.return_value = b'SELECT line FROM "api_product"'
+
+            copy_export(Product.objects.all(), "ndjson", file)
+
+        self.assertIn('row_to_json("row")', cursor.mogrify.call_args.args[0])
+        copy_sql, target = cursor.copy_expert.call_args.args
+        self.assertEqual(copy_sql, """COPY (SELECT line FROM "api_product") TO STDOUT WITH (FORMAT csv, QUOTE E'\\x01', DELIMITER E'\\x02')""")
+        self.assertEqual(file.getvalue(), b"")
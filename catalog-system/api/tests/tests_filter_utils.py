@@ -0,0 +1,122 @@
+import itertools
+import re
+from decimal import Decimal
+from django.http import QueryDict
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from unittest.mock import MagicMock
+
+from api.models import Product
+from api.utils.filter_utils import PRODUCT_ORDERING_FIELDS, filter_products, get_product_ordering, get_sparse_fields
+from api.utils.pagination_utils import ProductCursorPagination, encode_cursor
+
+class FilterProductsTests(SimpleTestCase):
+    def test_single_brand_filters_by_equality(self):
+        queryset = MagicMock()
+
+        filter_products(queryset, QueryDict("brand=zebrands"))
+
+        queryset.filter.assert_called_once_with(brand="zebrands")
+
+    def test_brand_list_filters_by_in_list(self):
+        queryset = MagicMock()
+
+        filter_products(queryset, QueryDict("brand=zebrands,luuna&brand=nooz&brand=luuna"))
+
+        queryset.filter.assert_called_once_with(brand__in=["zebrands", "luuna", "nooz"])
+
+    def test_price_range_and_min_views(self):
+        queryset = MagicMock()
+        queryset.filter.return_value = queryset
+
+        filter_products(queryset, QueryDict("min_price=10&max_price=20.50&min_views=3"))
+
+        self.assertEqual(
+            [c.kwargs for c in queryset.filter.call_args_list],
+            [{"price__gte": Decimal("10")}, {"price__lte": Decimal("20.50")}, {"views__gte": 3}]
+        )
+
+    def test_min_price_above_max_storable_price_returns_no_products(self):
+        queryset = MagicMock()
+
+        result = filter_products(queryset, QueryDict("min_price=1000000000"))
+
+        self.assertEqual(result, queryset.none.return_value)
+
+    def test_invalid_filters_raise_validation_error(self):
+        for params in ["min_price=abc", "min_price=NaN", "max_price=-1", "min_views=1.5", "min_price=5&max_price=1"]:
+            with self.assertRaises(ValidationError):
+                filter_products(MagicMock(), QueryDict(params))
+
+    def test_ordering_accepts_sortable_fields_only(self):
+        self.assertEqual(get_product_ordering(QueryDict("")), "sku")
+        self.assertEqual(get_product_ordering(QueryDict("ordering=-price")), "-price")
+        for ordering in ["brand", "--price", "price,name"]:
+            with self.assertRaises(ValidationError):
+                get_product_ordering(QueryDict(f"ordering={ordering}"))
+
+class SparseFieldsTests(SimpleTestCase):
+    ALLOWED = ["sku", "name", "price", "brand", "views"]
+
+    def test_missing_fields_param_returns_none(self):
+        self.assertIsNone(get_sparse_fields(QueryDict(""), self.ALLOWED))
+
+    def test_fields_keep_the_allowed_order(self):
+        self.assertEqual(get_sparse_fields(QueryDict("fields=price, sku,price"), self.ALLOWED), ["sku", "price"])
+
+    def test_unknown_or_empty_fields_raise_validation_error(self):
+        for value in ["", ",", "sku,password"]:
+            with self.assertRaises(ValidationError):
+                get_sparse_fields(QueryDict(f"fields={value}"), self.ALLOWED)
+
+class ProductQueryPlanTests(SimpleTestCase):
+    """
+    Checks that the SQL of every supported filter and sort combination can be served
+    by an index scan: the ORDER BY columns, after any brand equality, must be the
+    leading columns of one of the indexes declared on Product.
+    """
+    FILTERS = ["", "min_price=10", "max_price=99.99", "min_price=10&max_price=20", "min_views=5"]
+    BRANDS = ["", "brand=zebrands", "brand=zebrands,luuna"]
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.indexes = [tuple(index.fields) for index in Product._meta.indexes]
+
+    def _page_sql(self, query_string, cursor_values=None):
+        if cursor_values:
+            query_string += f"&cursor={encode_cursor(cursor_values)}"
+        request = Request(self.factory.get(f"/products/?{query_string}"))
+        queryset = filter_products(Product.objects.all(), request.query_params)
+        ordering = get_product_ordering(request.query_params)
+        return str(ProductCursorPagination().get_page_queryset(queryset, request, ordering).query)
+
+    def _is_index_served(self, sql):
+        order_by = re.search(r"ORDER BY (.*) LIMIT", sql).group(1)
+        columns = tuple(re.findall(r'"api_product"\."(\w+)" (?:ASC|DESC)', order_by))
+        directions = set(re.findall(r"(ASC|DESC)", order_by))
+        leading = ("brand",) if '"api_product"."brand" = ' in sql else ()
+        if len(directions) != 1:
+            return False
+        if columns == ("sku",) and not leading:
+            # Served by the primary key index
+            return True
+        return any(index[:len(leading + columns)] == leading + columns for index in self.indexes)
+
+    def test_every_filter_and_sort_combination_is_served_by_an_index(self):
+        orderings = [prefix + field for field in PRODUCT_ORDERING_FIELDS for prefix in ["", "-"]]
+        for brand, filters, ordering in itertools.product(self.BRANDS, self.FILTERS, orderings):
+            query_string = "&".join(part for part in [brand, filters, f"ordering={ordering}"] if part)
+            with self.subTest(query_string=query_string):
+                self.assertTrue(self._is_index_served(self._page_sql(query_string)))
+
+    def test_next_page_condition_starts_an_index_range_scan(self):
+        sql = self._page_sql(
+            "brand=zebrands&ordering=-price",
+            ["10.00", "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"]
+        )
+
+        self.assertIn('"api_product"."price" <= 10.00', sql)
+        self.assertIn('ORDER BY "api_product"."price" DESC, "api_product"."sku" DESC', sql)
+        self.assertTrue(self._is_index_served(sql))
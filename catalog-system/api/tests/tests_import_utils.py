@@ -0,0 +1,147 @@
+import gzip
+import io
+import os
+import tempfile
+import uuid
+from decimal import Decimal
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from unittest.mock import patch
+
+from api.utils.import_utils import (
+    CopyStream,
+    ImportStats,
+    clean_import_row,
+    get_import_format,
+    import_products,
+    iter_copy_lines,
+    read_import_rows,
+)
+
+SKU = "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"
+NEW_SKU = "0b6d2a8e-5c1f-4f7a-8e3b-6a9d1c2e4f50"
+
+class CleanImportRowTests(SimpleTestCase):
+    def test_valid_row_is_returned_as_a_tuple(self):
+        sku, name, price, brand = clean_import_row({"sku": SKU, "name": " test_product ", "price": "10.5", "brand": "zebrands"})
+
+        self.assertEqual((sku, name, price, brand), (uuid.UUID(SKU), "test_product", Decimal("10.5"), "zebrands"))
+
+    def test_row_without_sku_gets_a_new_one(self):
+        self.assertIsInstance(clean_import_row({"name": "a", "price": "1", "brand": "b"})[0], uuid.UUID)
+
+    def test_rows_breaking_product_rules_raise_value_error(self):
+        rows = [
+            None,
+            {"sku": "123", "name": "a", "price": "1", "brand": "b"},
+            {"name": "", "price": "1", "brand": "b"},
+            {"name": "a" * 256, "price": "1", "brand": "b"},
+            {"name": "a", "price": "1"},
+            {"name": "a", "price": "0", "brand": "b"},
+            {"name": "a", "price": "0.001", "brand": "b"},
+            {"name": "a", "price": "100000000", "brand": "b"},
+            {"name": "a", "price": "NaN", "brand": "b"},
+            {"name": "a", "price": "abc", "brand": "b"},
+        ]
+        for row in rows:
+            with self.subTest(row=row), self.assertRaises(ValueError):
+                clean_import_row(row)
+
+class ReadImportRowsTests(SimpleTestCase):
+    def test_format_comes_from_the_extension(self):
+        self.assertEqual(get_import_format("products.csv.gz"), "csv")
+        self.assertEqual(get_import_format("products.ndjson.gz"), "ndjson")
+        self.assertEqual(get_import_format("products.jsonl"), "ndjson")
+        self.assertEqual(get_import_format("products.txt", "ndjson"), "ndjson")
+
+    def test_csv_and_ndjson_rows(self):
+        csv_rows = list(read_import_rows(io.StringIO("name,price,brand\na,1,b\n"), "csv"))
+        ndjson_rows = list(read_import_rows(io.StringIO('{"name": "a"}\n\nnot json\n'), "ndjson"))
+
+        self.assertEqual(csv_rows, [{"name": "a", "price": "1", "brand": "b"}])
+        self.assertEqual(ndjson_rows, [{"name": "a"}, None])
+
+class CopyLinesTests(SimpleTestCase):
+    def test_valid_rows_become_copy_lines_and_invalid_ones_are_counted(self):
+        stats = ImportStats()
+        rows = [{"sku": SKU, "name": 'with "quotes", comma', "price": "1", "brand": "b"}, {"name": "a"}]
+
+        stream = CopyStream(iter_copy_lines(rows, stats))
+        first = stream.read(5)
+        rest = stream.read()
+
+        self.assertEqual(first + rest, f'1,{SKU},"with ""quotes"", comma",1,b\r\n')
+        self.assertEqual(stream.read(), "")
+        self.assertEqual((stats.read, stats.invalid), (2, 1))
+        self.assertEqual(stats.errors, [(2, "brand is required")])
+
+    def test_progress_is_reported_every_batch_of_rows(self):
+        reports = []
+        stats = ImportStats(progress=lambda stats: reports.append(stats.read))
+        rows = [{"name": "a", "price": "1", "brand": "b"}] * 5
+        with patch("api.utils.import_utils.PROGRESS_EVERY", 2):
+            list(iter_copy_lines(rows, stats))
+
+        self.assertEqual(reports, [2, 4])
+
+class ImportProductsTests(SimpleTestCase):
+    def test_rows_are_copied_merged_and_audited_in_the_transaction(self):
+        rows = [{"sku": SKU, "name": "a", "price": "1", "brand": "b"}]
+        created = (NEW_SKU, True, "c", Decimal("3.00"), "d", None, None, None)
+        updated = (SKU, False, "a", Decimal("1.00"), "b", "old", Decimal("2.00"), "b")
+        with patch("api.utils.import_utils.transaction"), \
+            patch("api.utils.import_utils.connection") as connection_mock, \
+            patch("api.utils.import_utils.bump_catalog_version") as bump_mock, \
+            patch("api.utils.import_utils.enqueue_notification") as notification_mock, \
+            patch("api.utils.import_utils.record_webhook_events") as events_mock, \
+            patch("api.utils.import_utils.write_product_changes") as audit_mock:
+            cursor = connection_mock.cursor.return_value.__enter__.return_value
+            cursor.copy_expert.side_effect = lambda sql, file: file.read()
+            cursor.fetchone.return_value = (3, 1, 1)
+            changed = connection_mock.chunked_cursor.return_value.__enter__.return_value
+            changed.fetchmany.side_effect = [[created, updated], []]
+
+            stats = import_products(rows)
+
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        self.assertIn("COPY", cursor.copy_expert.call_args.args[0])
+        self.assertTrue(any("ON CONFLICT (\"sku\") DO UPDATE" in sql for sql in statements))
+        self.assertIn("DROP TABLE", statements[-1])
+        self.assertEqual((stats.read, stats.inserted, stats.updated, stats.unchanged), (1, 1, 1, 1))
+        bump_mock.assert_called_once_with()
+        notification_mock.assert_called_once_with("IMPORT", [(NEW_SKU, "c"), (SKU, "a")], None)
+        events_mock.assert_called_once_with([
+            ("CREATE", NEW_SKU, "c", Decimal("3.00"), "d"),
+            ("UPDATE", SKU, "a", Decimal("1.00"), "b"),
+        ])
+        audit_mock.assert_called_once_with(None, [
+            (NEW_SKU, None, { "name": "c", "price": "3.00", "brand": "d" }),
+            (SKU, { "name": "old", "price": "2.00", "brand": "b" }, { "name": "a", "price": "1.00", "brand": "b" }),
+        ])
+
+    def test_staging_tables_are_dropped_when_the_import_fails(self):
+        with patch("api.utils.import_utils.transaction"), \
+            patch("api.utils.import_utils.connection") as connection_mock, \
+            patch("api.utils.import_utils.bump_catalog_version") as bump_mock:
+            cursor = connection_mock.cursor.return_value.__enter__.return_value
+            cursor.copy_expert.side_effect = Exception("db down")
+
+            with self.assertRaises(Exception):
+                import_products([])
+
+        self.assertIn("DROP TABLE", cursor.execute.call_args.args[0])
+        bump_mock.assert_not_called()
+
+class ImportProductsCommandTests(SimpleTestCase):
+    def test_command_reads_gzipped_files_and_prints_a_summary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "products.ndjson.gz")
+            with gzip.open(path, "wt") as file:
+                file.write('{"name": "a", "price": "1", "brand": "b"}\n')
+            out = io.StringIO()
+            with patch("api.management.commands.import_products.import_products") as import_mock:
+                import_mock.side_effect = lambda rows, progress: ImportStats() if list(rows) else None
+
+                call_command("import_products", path, stdout=out, stderr=io.StringIO())
+
+        self.assertIn("0 inserted", out.getvalue())
@@ -0,0 +1,182 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import ANY, patch, MagicMock
+
+from api.models import OutboxNotification
+from api.utils.notification_utils import (
+    claim_notifications,
+    enqueue_notification,
+    fail_notification,
+    get_retry_delay,
+    notification_stats,
+    process_notifications,
+    send_notifications,
+)
+
+SKU_1 = uuid.UUID("7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10")
+NOW = datetime(2025, 9, 9, tzinfo=timezone.utc)
+
+def notification(products, attempts=1):
+    return OutboxNotification(id=1, action="UPDATE", products=products, owner="admin@test.com", attempts=attempts)
+
+@override_settings(
+    NOTIFICATION_COALESCE_WINDOW=60,
+    NOTIFICATION_MAX_ATTEMPTS=3,
+    NOTIFICATION_RETRY_BASE_DELAY=10,
+    NOTIFICATION_RETRY_MAX_DELAY=60,
+    NOTIFICATION_LEASE_SECONDS=300,
+)
+class NotificationOutboxTests(SimpleTestCase):
+    def test_enqueue_stores_the_products_due_after_the_window(self):
+        with patch("api.utils.notification_utils.OutboxNotification.objects.create") as create_mock, \
+            patch("api.utils.notification_utils.timezone.now", return_value=NOW):
+            enqueue_notification("CREATE", [(SKU_1, "test_product")], None)
+
+        create_mock.assert_called_once_with(
+            action="CREATE",
+            products=[[str(SKU_1), "test_product"]],
+            owner="",
+            created_at=NOW,
+            available_at=NOW + timedelta(seconds=60),
+        )
+
+    def test_retry_delay_doubles_up_to_the_max(self):
+        with patch("api.utils.notification_utils.random.uniform", return_value=1.0):
+            delays = [get_retry_delay(attempts).total_seconds() for attempts in [1, 2, 3, 4]]
+
+        self.assertEqual(delays, [10, 20, 40, 60])
+
+    def test_due_notifications_are_claimed_with_the_ones_in_their_window(self):
+        with patch("api.utils.notification_utils.transaction"), \
+            patch("api.utils.notification_utils.OutboxNotification.objects") as objects_mock:
+            pending = objects_mock.select_for_update.return_value.filter.return_value
+            due, waiting = MagicMock(), MagicMock()
+            pending.filter.side_effect = [due, waiting]
+            due.order_by.return_value.values_list.return_value.__getitem__.return_value = [1, 2]
+            waiting.order_by.return_value.values_list.return_value.__getitem__.return_value = [3]
+
+            claim_notifications(10, now=NOW)
+
+        objects_mock.select_for_update.assert_called_once_with(skip_locked=True)
+        objects_mock.select_for_update.return_value.filter.assert_called_once_with(status="PENDING")
+        self.assertEqual(
+            [c.kwargs for c in pending.filter.call_args_list],
+            [{"available_at__lte": NOW}, {"available_at__gt": NOW, "attempts": 0}]
+        )
+        waiting.order_by.return_value.values_list.return_value.__getitem__.assert_called_once_with(slice(None, 8))
+        objects_mock.filter.assert_any_call(id__in=[1, 2, 3])
+        update = objects_mock.filter.return_value.update.call_args.kwargs
+        self.assertEqual(update["available_at"], NOW + timedelta(seconds=300))
+
+    def test_nothing_is_claimed_before_a_notification_is_due(self):
+        with patch("api.utils.notification_utils.transaction"), \
+            patch("api.utils.notification_utils.OutboxNotification.objects") as objects_mock:
+            pending = objects_mock.select_for_update.return_value.filter.return_value
+            pending.filter.return_value.order_by.return_value.values_list.return_value.__getitem__.return_value = []
+
+            claimed = claim_notifications(10, now=NOW)
+
+        self.assertEqual(claimed, [])
+        self.assertEqual(pending.filter.call_count, 1)
+        objects_mock.filter.assert_not_called()
+
+    def test_single_notification_keeps_the_email_of_its_action(self):
+        with patch("api.utils.notification_utils.notify_via_email") as single_mock, \
+            patch("api.utils.notification_utils.notify_digest_via_email") as digest_mock:
+            send_notifications([notification([[str(SKU_1), "test_product"]])], ["user@test.com"])
+            send_notifications([notification([[str(SKU_1), "test_product"], ["123", "other_product"]])], ["user@test.com"])
+
+        single_mock.assert_called_once_with(
+            str(SKU_1), "test_product", "admin@test.com", "UPDATE",
+            fail_silently=False, recipients=["user@test.com"], on_chunk_sent=None
+        )
+        self.assertEqual(len(digest_mock.call_args.args[0]), 2)
+        self.assertFalse(digest_mock.call_args.kwargs["fail_silently"])
+
+    def test_coalesced_notifications_are_sent_in_one_email(self):
+        created = OutboxNotification(action="CREATE", products=[["123", "a"], ["234", "b"]], owner="admin@test.com")
+        deleted = OutboxNotification(action="DELETE", products=[["123", "a"]], owner="other@test.com")
+        with patch("api.utils.notification_utils.notify_changes_via_email") as changes_mock:
+            send_notifications([created, deleted], ["user@test.com"])
+
+        changes_mock.assert_called_once_with([
+            ("CREATE", "123", "a", "admin@test.com"),
+            ("CREATE", "234", "b", "admin@test.com"),
+            ("DELETE", "123", "a", "other@test.com"),
+        ], fail_silently=False, recipients=["user@test.com"], on_chunk_sent=None)
+
+    def test_failed_notification_is_retried_until_the_last_attempt(self):
+        retried = notification([], attempts=2)
+        exhausted = notification([], attempts=3)
+        with patch.object(OutboxNotification, "save") as save_mock, \
+            patch("api.utils.notification_utils.random.uniform", return_value=1.0):
+            fail_notification(retried, Exception("smtp down"), now=NOW)
+            fail_notification(exhausted, Exception("smtp down"), now=NOW)
+
+        self.assertEqual((retried.status, retried.available_at), ("PENDING", NOW + timedelta(seconds=20)))
+        self.assertEqual((exhausted.status, exhausted.last_error), ("FAILED", "smtp down"))
+        self.assertEqual(save_mock.call_count, 2)
+
+    def test_sent_notifications_are_deleted_and_counted(self):
+        notification_stats.reset()
+        claimed = [notification([["123", "a"]]) for _ in range(3)]
+        with patch("api.utils.notification_utils.claim_notifications", return_value=claimed), \
+            patch("api.utils.notification_utils.get_recipients", return_value=["a@test.com", "b@test.com"]), \
+            patch("api.utils.notification_utils.send_notifications") as send_mock, \
+            patch("api.utils.notification_utils.OutboxNotification.objects.filter") as filter_mock:
+            result = process_notifications(10)
+
+        self.assertEqual(result, (3, 0))
+        send_mock.assert_called_once_with(claimed, ["a@test.com", "b@test.com"], on_chunk_sent=ANY)
+        filter_mock.return_value.delete.assert_called_once_with()
+        self.assertEqual(
+            notification_stats.snapshot(),
+            {"notifications": 3, "emails": 1, "messages_sent": 2, "messages_saved": 4}
+        )
+
+    def test_failed_email_reschedules_every_notification(self):
+        claimed = [notification([["123", "a"]]) for _ in range(2)]
+        with patch("api.utils.notification_utils.claim_notifications", return_value=claimed), \
+            patch("api.utils.notification_utils.get_recipients", return_value=[]), \
+            patch("api.utils.notification_utils.send_notifications", side_effect=Exception("smtp down")), \
+            patch("api.utils.notification_utils.fail_notification") as fail_mock:
+            result = process_notifications(10)
+
+        self.assertEqual(result, (0, 2))
+        self.assertEqual([c.args[0] for c in fail_mock.call_args_list], claimed)
+
+    def test_failed_email_keeps_the_recipients_already_sent(self):
+        claimed = [notification([["123", "a"]]) for _ in range(2)]
+
+        def send_first_chunk(notifications, recipients, on_chunk_sent):
+            on_chunk_sent(recipients[:1])
+            raise Exception("smtp down")
+
+        with patch("api.utils.notification_utils.claim_notifications", return_value=claimed), \
+            patch("api.utils.notification_utils.get_recipients", return_value=["a@test.com", "b@test.com"]), \
+            patch("api.utils.notification_utils.send_notifications", side_effect=send_first_chunk), \
+            patch("api.utils.notification_utils.fail_notification") as fail_mock:
+            result = process_notifications(10)
+
+        self.assertEqual(result, (0, 2))
+        self.assertEqual(fail_mock.call_count, 2)
+        self.assertEqual([notification.sent_to for notification in claimed], [["a@test.com"], ["a@test.com"]])
+
+    def test_retry_skips_the_recipients_already_sent(self):
+        notification_stats.reset()
+        resumed = notification([["123", "a"]])
+        resumed.sent_to = ["a@test.com"]
+        fresh = notification([["234", "b"]])
+        with patch("api.utils.notification_utils.claim_notifications", return_value=[resumed, fresh]), \
+            patch("api.utils.notification_utils.get_recipients", return_value=["a@test.com", "b@test.com"]), \
+            patch("api.utils.notification_utils.send_notifications") as send_mock, \
+            patch("api.utils.notification_utils.OutboxNotification.objects.filter") as filter_mock:
+            result = process_notifications(10)
+
+        self.assertEqual(result, (2, 0))
+        self.assertEqual(
+            [c.args[:2] for c in send_mock.call_args_list],
+            [([resumed], ["b@test.com"]), ([fresh], ["a@test.com", "b@test.com"])]
+        )
+        filter_mock.return_value.delete.assert_called_once_with()
@@ -0,0 +1,95 @@
+from django.db.models import Q
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+from unittest.mock import patch, MagicMock
+
+from api.utils.pagination_utils import (
+    ProductCursorPagination,
+    decode_cursor,
+    encode_cursor,
+    estimate_product_count,
+)
+
+class CursorEncodingTests(SimpleTestCase):
+    def test_encoded_cursor_round_trips(self):
+        cursor = encode_cursor(["100.00", "123"])
+
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor), ["100.00", "123"])
+
+    def test_decode_malformed_cursor_raises_validation_error(self):
+        for cursor in ["%%%", encode_cursor([]) + "x", "eyJhIjoxfQ"]:
+            with self.assertRaises(ValidationError):
+                decode_cursor(cursor)
+
+class CursorFilterTests(SimpleTestCase):
+    def setUp(self):
+        self.paginator = ProductCursorPagination()
+
+    def test_single_key_ascending_filter(self):
+        condition = self.paginator.get_cursor_filter(["sku"], ["123"], descending=False)
+
+        self.assertEqual(condition, Q(sku__gt="123"))
+
+    def test_composite_key_descending_filter_is_bounded_on_leading_key(self):
+        condition = self.paginator.get_cursor_filter(["price", "sku"], ["10.00", "123"], descending=True)
+
+        self.assertEqual(
+            condition,
+            Q(price__lte="10.00") & (Q(price__lt="10.00") | Q(price="10.00", sku__lt="123"))
+        )
+
+    def test_key_fields_always_end_with_primary_key(self):
+        self.assertEqual(self.paginator.get_key_fields("sku"), ["sku"])
+        self.assertEqual(self.paginator.get_key_fields("-price"), ["price", "sku"])
+
+class EstimateProductCountTests(SimpleTestCase):
+    def _cursor_returning(self, estimate):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = (estimate,)
+        connection = MagicMock(vendor="postgresql")
+        connection.cursor.return_value.__enter__.return_value = cursor
+        return connection
+
+    def test_large_table_uses_planner_estimate(self):
+        with patch("api.utils.pagination_utils.connection", self._cursor_returning(250000)), \
+            patch("api.utils.pagination_utils.Product.objects.count") as count_mock:
+            estimate = estimate_product_count()
+
+        self.assertEqual(estimate, 250000)
+        count_mock.assert_not_called()
+
+    def test_small_or_unanalyzed_table_falls_back_to_exact_count(self):
+        for reltuples in [-1, 10]:
+            with patch("api.utils.pagination_utils.connection", self._cursor_returning(reltuples)), \
+                patch("api.utils.pagination_utils.Product.objects.count", return_value=7) as count_mock:
+                estimate = estimate_product_count()
+
+            self.assertEqual(estimate, 7)
+            count_mock.assert_called_once_with()
+
+    def test_filtered_queryset_uses_query_plan_estimate(self):
+        queryset = MagicMock()
+        queryset.query.has_filters.return_value = True
+        queryset.order_by.return_value.query.sql_with_params.return_value = ("SELECT 1 WHERE brand = %s", ("Acme",))
+        connection = self._cursor_returning(None)
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = ([{ "Plan": { "Plan Rows": 4200 } }],)
+        with patch("api.utils.pagination_utils.connection", connection):
+            estimate = estimate_product_count(queryset)
+
+        self.assertEqual(estimate, 4200)
+        cursor.execute.assert_called_once_with("EXPLAIN (FORMAT JSON) SELECT 1 WHERE brand = %s", ("Acme",))
+        queryset.count.assert_not_called()
+
+    def test_small_filtered_queryset_falls_back_to_exact_count(self):
+        queryset = MagicMock()
+        queryset.query.has_filters.return_value = True
+        queryset.order_by.return_value.query.sql_with_params.return_value = ("SELECT 1", ())
+        queryset.count.return_value = 3
+        connection = self._cursor_returning(None)
+        connection.cursor.return_value.__enter__.return_value.fetchone.return_value = ('[{"Plan": {"Plan Rows": 5}}]',)
+        with patch("api.utils.pagination_utils.connection", connection):
+            estimate = estimate_product_count(queryset)
+
+        self.assertEqual(estimate, 3)
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+from uuid import UUID, uuid4
+
+from api.models import Product
+from api.serializers import (
+    PRODUCT_FIELDS,
+    ProductSerializer,
+    iter_product_representations,
+    product_rows_to_representation,
+)
+
+class ProductFastPathParityTests(SimpleTestCase):
+    """
+    The values_list fast path must render exactly the same bytes as ProductSerializer
+    """
+    def setUp(self):
+        now = datetime(2025, 9, 9, 5, 37, 41, 464443, tzinfo=timezone.utc)
+        self.rows = [
+            (UUID(int=0), "a", Decimal("0.01"), "b", 0, now),
+            (uuid4(), "Colchón Luuna \"Original\" ñ 🛏", Decimal("99999999.99"), "Luuna", 2147483647, now),
+            (uuid4(), "line\nbreak\ttab \\ slash </script>", Decimal("10.50"), "nooz", 12, now.replace(microsecond=0)),
+            (uuid4(), "x" * 255, Decimal("100.00"), "y" * 255, 1, now.astimezone(timezone(timedelta(hours=-6)))),
+            (uuid4(), "unquantized price", Decimal("7.5"), "mappa", 3, now),
+            (uuid4(), "", Decimal("1E+2"), "", 5, now),
+        ]
+
+    def _serializer_output(self, rows):
+        products = [Product(**dict(zip(PRODUCT_FIELDS, row))) for row in rows]
+        return JSONRenderer().render(ProductSerializer(products, many=True).data)
+
+    def test_fields_match_product_serializer(self):
+        self.assertEqual(PRODUCT_FIELDS, list(ProductSerializer().fields))
+
+    def test_rendered_list_is_byte_identical(self):
+        fast = JSONRenderer().render(product_rows_to_representation(self.rows))
+
+        self.assertEqual(fast, self._serializer_output(self.rows))
+
+    def test_each_row_is_byte_identical(self):
+        for row in self.rows:
+            with self.subTest(row=row):
+                product = Product(**dict(zip(PRODUCT_FIELDS, row)))
+                expected = JSONRenderer().render(ProductSerializer(product).data)
+                fast = JSONRenderer().render(next(iter_product_representations([row])))
+
+                self.assertEqual(fast, expected)
+
+    def test_trailing_annotation_values_are_ignored(self):
+        rows_with_rank = [row + (0.75,) for row in self.rows]
+
+        self.assertEqual(product_rows_to_representation(rows_with_rank), product_rows_to_representation(self.rows))
+
+    def test_empty_rows(self):
+        self.assertEqual(JSONRenderer().render(product_rows_to_representation([])), self._serializer_output([]))
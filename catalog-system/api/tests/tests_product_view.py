@@ -1,10 +1,22 @@
-from django.test import SimpleTestCase
+import json
+import uuid
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, force_authenticate
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from types import SimpleNamespace
+from decimal import Decimal
+from datetime import datetime, timezone
+from django.db.models import Q
+from django.http import StreamingHttpResponse
 
 from api.views import *
+from api.utils.pagination_utils import encode_cursor
+from api.utils.catalog_utils import catalog_etag
+from api.utils.cache_utils import get_product_cache
+from api.utils.counter_utils import ProductViewCounter
+from api.serializers import PRODUCT_FIELDS
 
 def admin_user():
     return SimpleNamespace(is_authenticated=True, is_staff=True)
@@ -15,17 +27,26 @@ def non_admin_user():
 class GetProductsTests(SimpleTestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
+        version_patcher = patch(
+            "api.utils.catalog_utils.get_catalog_version",
+            return_value=SimpleNamespace(version=1, updated_at=datetime(2025, 9, 9, tzinfo=timezone.utc))
+        )
+        version_patcher.start()
+        self.addCleanup(version_patcher.stop)
+        get_product_cache().clear()
         
     def test_get_all_products_and_returns_200(self):
         # Define mock data and functions
         request = self.factory.get("/products/")
         with patch("api.views.product_views.Product.objects.all") as all_mock, \
-            patch("api.views.product_views.ProductSerializer") as serializer_cls:
-            query_set = object()
+            patch("api.views.product_views.product_rows_to_representation") as representation_mock, \
+            patch("api.utils.pagination_utils.estimate_product_count", return_value=2):
+            query_set = MagicMock()
+            page = [SimpleNamespace(sku="123"), SimpleNamespace(sku="234")]
+            query_set.values_list.return_value.order_by.return_value.__getitem__.return_value = page
             all_mock.return_value = query_set
             
-            serializer_instance = MagicMock()
-            serializer_instance.data = [
+            representation_mock.return_value = [
                 {
                     "sku": "123",
                     "name": "test_product_1",
@@ -41,7 +62,6 @@ class GetProductsTests(SimpleTestCase):
                     "views": 200
                 },
             ]
-            serializer_cls.return_value = serializer_instance
             
             # Test function with mock data
             response = get_products(request)
@@ -49,14 +69,252 @@ class GetProductsTests(SimpleTestCase):
         # Assertions
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         all_mock.assert_called_once()
-        serializer_cls.assert_called_once_with(query_set, many=True)
-        self.assertEqual(response.data, serializer_instance.data)
+        query_set.values_list.return_value.order_by.assert_called_once_with("sku")
+        query_set.values_list.return_value.order_by.return_value.__getitem__.assert_called_once_with(slice(None, 51))
+        representation_mock.assert_called_once_with(page, PRODUCT_FIELDS)
+        self.assertEqual(response.data["results"], representation_mock.return_value)
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(response.data["estimated_total"], 2)
+
+    def test_get_products_with_more_rows_than_page_size_returns_next_link(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/", {"page_size": 2})
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.views.product_views.product_rows_to_representation") as representation_mock, \
+            patch("api.utils.pagination_utils.estimate_product_count", return_value=3):
+            query_set = MagicMock()
+            rows = [SimpleNamespace(sku="1"), SimpleNamespace(sku="2"), SimpleNamespace(sku="3")]
+            query_set.values_list.return_value.order_by.return_value.__getitem__.return_value = rows
+            all_mock.return_value = query_set
+            representation_mock.return_value = []
+
+            # Test function with mock data
+            response = get_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        query_set.values_list.return_value.order_by.return_value.__getitem__.assert_called_once_with(slice(None, 3))
+        representation_mock.assert_called_once_with(rows[:2], PRODUCT_FIELDS)
+        self.assertIn(f"cursor={encode_cursor(['2'])}", response.data["next"])
+
+    def test_get_products_with_cursor_filters_after_last_key(self):
+        # Define mock data and functions
+        sku = "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"
+        request = self.factory.get("/products/", {"cursor": encode_cursor([sku])})
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.views.product_views.product_rows_to_representation") as representation_mock, \
+            patch("api.utils.pagination_utils.estimate_product_count", return_value=0):
+            query_set = MagicMock()
+            query_set.values_list.return_value.filter.return_value.order_by.return_value.__getitem__.return_value = []
+            all_mock.return_value = query_set
+            representation_mock.return_value = []
+
+            # Test function with mock data
+            response = get_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        query_set.values_list.return_value.filter.assert_called_once_with(Q(sku__gt=sku))
+        query_set.values_list.return_value.filter.return_value.order_by.assert_called_once_with("sku")
+
+    def test_get_products_with_filters_and_ordering(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/", {"brand": "zebrands", "ordering": "-price"})
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.views.product_views.product_rows_to_representation") as representation_mock, \
+            patch("api.utils.pagination_utils.estimate_product_count", return_value=0):
+            query_set = MagicMock()
+            filtered = query_set.filter.return_value
+            filtered.values_list.return_value.order_by.return_value.__getitem__.return_value = []
+            all_mock.return_value = query_set
+            representation_mock.return_value = []
+
+            # Test function with mock data
+            response = get_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        query_set.filter.assert_called_once_with(brand="zebrands")
+        filtered.values_list.assert_called_once_with(*PRODUCT_FIELDS, named=True)
+        filtered.values_list.return_value.order_by.assert_called_once_with("-price", "-sku")
+
+    def test_get_products_with_sparse_fields_only_fetches_requested_and_key_columns(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/", {"fields": "price,sku,name", "ordering": "views"})
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.utils.pagination_utils.estimate_product_count", return_value=1):
+            query_set = MagicMock()
+            query_set.values_list.return_value.order_by.return_value.__getitem__.return_value = [
+                ("123", "pillow", Decimal("10.00"), 3)
+            ]
+            all_mock.return_value = query_set
+
+            # Test function with mock data
+            response = get_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        query_set.values_list.assert_called_once_with("sku", "name", "price", "views", named=True)
+        self.assertEqual(response.data["results"], [{"sku": "123", "name": "pillow", "price": "10.00"}])
+
+    def test_get_products_with_unknown_fields_and_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/", {"fields": "sku,search_vector"})
+        with patch("api.views.product_views.Product.objects.all") as all_mock:
+            all_mock.return_value = MagicMock()
+
+            # Test function with mock data
+            response = get_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        all_mock.return_value.values_list.assert_not_called()
+
+    def test_get_products_with_invalid_ordering_and_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/", {"ordering": "brand"})
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.views.product_views.product_rows_to_representation") as representation_mock:
+            all_mock.return_value = MagicMock()
+
+            # Test function with mock data
+            response = get_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        representation_mock.assert_not_called()
+
+    def test_get_products_stream_returns_streaming_response(self):
+        # Define mock data and functions
+        for params, headers, ndjson in [
+            ({"stream": "1"}, {}, False),
+            ({}, {"HTTP_ACCEPT": "application/x-ndjson"}, True),
+        ]:
+            request = self.factory.get("/products/", params, **headers)
+            with patch("api.views.product_views.Product.objects.all") as all_mock, \
+                patch("api.views.product_views.stream_products_response") as stream_mock, \
+                patch("api.views.product_views.product_rows_to_representation") as representation_mock:
+                stream_mock.return_value = StreamingHttpResponse(iter([b"[]"]))
+
+                # Test function with mock data
+                response = get_products(request)
+
+            # Assertions
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            stream_mock.assert_called_once_with(all_mock.return_value, PRODUCT_FIELDS, ndjson=ndjson, asgi=False)
+            all_mock.return_value.order_by.assert_not_called()
+            representation_mock.assert_not_called()
+
+    def test_get_products_with_invalid_cursor_and_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/", {"cursor": "not-a-cursor"})
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.views.product_views.product_rows_to_representation") as representation_mock:
+            all_mock.return_value = MagicMock()
+
+            # Test function with mock data
+            response = get_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        representation_mock.assert_not_called()
+
+    def test_get_products_with_invalid_page_size_and_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/", {"page_size": "0"})
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.views.product_views.product_rows_to_representation") as representation_mock:
+            all_mock.return_value = MagicMock()
+
+            # Test function with mock data
+            response = get_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        representation_mock.assert_not_called()
     
+    def test_get_products_with_matching_etag_returns_304_without_reading_products(self):
+        # Define mock data and functions
+        with patch("api.views.product_views.Product.objects.all") as all_mock:
+            etag = catalog_etag(self.factory.get("/products/"))
+            request = self.factory.get("/products/", HTTP_IF_NONE_MATCH=etag)
+
+            # Test function with mock data
+            response = get_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        all_mock.assert_not_called()
+
+    def test_get_products_sets_validators_and_ignores_stale_etag(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/", HTTP_IF_NONE_MATCH='W/"0-stale"')
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.utils.pagination_utils.estimate_product_count", return_value=0):
+            all_mock.return_value.values_list.return_value.order_by.return_value.__getitem__.return_value = []
+
+            # Test function with mock data
+            response = get_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('W/"1-'))
+        self.assertEqual(response["Last-Modified"], "Tue, 09 Sep 2025 00:00:00 GMT")
+
+    def test_get_products_twice_serves_second_response_from_cache(self):
+        # Define mock data and functions
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.views.product_views.product_rows_to_representation", return_value=[{"sku": "123"}]), \
+            patch("api.utils.pagination_utils.estimate_product_count", return_value=1):
+            all_mock.return_value.values_list.return_value.order_by.return_value.__getitem__.return_value = [SimpleNamespace(sku="123")]
+
+            # Test function with mock data
+            first = get_products(self.factory.get("/products/", {"brand": "zebrands"}))
+            first.render()
+            second = get_products(self.factory.get("/products/", {"brand": "zebrands"}))
+
+        # Assertions
+        all_mock.assert_called_once()
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertTrue(second["ETag"].startswith('W/"1-'))
+
+    def test_get_products_after_catalog_write_misses_cache(self):
+        # Define mock data and functions
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.views.product_views.product_rows_to_representation", return_value=[]), \
+            patch("api.utils.pagination_utils.estimate_product_count", return_value=0):
+            all_mock.return_value.values_list.return_value.order_by.return_value.__getitem__.return_value = []
+
+            # Test function with mock data
+            get_products(self.factory.get("/products/"))
+            with patch("api.utils.catalog_utils.get_catalog_version", return_value=SimpleNamespace(version=2, updated_at=None)):
+                response = get_products(self.factory.get("/products/"))
+
+        # Assertions
+        self.assertEqual(all_mock.call_count, 2)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_get_products_errors_are_not_cached(self):
+        # Define mock data and functions
+        with patch("api.views.product_views.Product.objects.all") as all_mock:
+            all_mock.return_value.values_list.side_effect = Exception("db error")
+
+            # Test function with mock data
+            get_products(self.factory.get("/products/"))
+            response = get_products(self.factory.get("/products/"))
+
+        # Assertions
+        self.assertEqual(all_mock.call_count, 2)
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
     def test_get_all_products_db_fails_and_returns_500(self):
         # Define mock data and functions
         request = self.factory.get("/products/")
         with patch("api.views.product_views.Product.objects.all", side_effect=Exception("db down")) as all_mock, \
-            patch("api.views.product_views.ProductSerializer") as serializer_cls:
+            patch("api.views.product_views.product_rows_to_representation") as representation_mock:
 
             # Test function with mock data
             response = get_products(request)
@@ -64,17 +322,175 @@ class GetProductsTests(SimpleTestCase):
         # Assertions
         self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
         all_mock.assert_called_once_with()
-        serializer_cls.assert_not_called()
+        representation_mock.assert_not_called()
+
+class AsyncGetProductsTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        version = SimpleNamespace(version=1, updated_at=datetime(2025, 9, 9, tzinfo=timezone.utc))
+        for name, mock_cls in [("get_catalog_version", MagicMock), ("aget_catalog_version", AsyncMock)]:
+            patcher = patch(f"api.utils.catalog_utils.{name}", new_callable=mock_cls, return_value=version)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        get_product_cache().clear()
+
+    def test_aget_products_reads_page_with_async_orm_and_returns_200(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/", {"page_size": 2})
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.views.product_views.product_rows_to_representation") as representation_mock, \
+            patch("api.utils.pagination_utils.estimate_product_count", return_value=3):
+            rows = [SimpleNamespace(sku="1"), SimpleNamespace(sku="2"), SimpleNamespace(sku="3")]
+            page_queryset = all_mock.return_value.values_list.return_value.order_by.return_value.__getitem__.return_value
+            page_queryset.__aiter__.return_value = rows
+            representation_mock.return_value = [{ "sku": "1" }, { "sku": "2" }]
+
+            # Test function with mock data
+            response = async_to_sync(aget_products)(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        all_mock.return_value.values_list.return_value.order_by.return_value.__getitem__.assert_called_once_with(slice(None, 3))
+        representation_mock.assert_called_once_with(rows[:2], PRODUCT_FIELDS)
+        body = json.loads(response.content)
+        self.assertEqual(body["results"], representation_mock.return_value)
+        self.assertEqual(body["estimated_total"], 3)
+        self.assertIn(f"cursor={encode_cursor(['2'])}", body["next"])
+        self.assertEqual((response["X-Cache"], response["Vary"]), ("MISS", "Accept"))
+        self.assertTrue(response["ETag"].startswith('W/"1-'))
+
+    def test_aget_products_stream_is_served_by_sync_view(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/", {"stream": "1"})
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.views.product_views.stream_products_response") as stream_mock:
+            stream_mock.return_value = StreamingHttpResponse(iter([b"[]"]))
+
+            # Test function with mock data
+            response = async_to_sync(aget_products)(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stream_mock.assert_called_once_with(all_mock.return_value, PRODUCT_FIELDS, ndjson=False, asgi=True)
+
+    def test_aget_products_with_matching_etag_returns_304_without_reading_products(self):
+        # Define mock data and functions
+        with patch("api.views.product_views.Product.objects.all") as all_mock:
+            etag = catalog_etag(self.factory.get("/products/"))
+            request = self.factory.get("/products/", headers={"If-None-Match": etag})
+
+            # Test function with mock data
+            response = async_to_sync(aget_products)(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        all_mock.assert_not_called()
+
+    def test_aget_products_with_invalid_page_size_and_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/", {"page_size": 0})
+        with patch("api.views.product_views.Product.objects.all"):
+
+            # Test function with mock data
+            response = async_to_sync(aget_products)(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(json.loads(response.content), { "message": "page_size must be a positive integer" })
+
+    def test_aget_products_db_fails_and_returns_500(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/")
+        with patch("api.views.product_views.Product.objects.all") as all_mock:
+            page_queryset = all_mock.return_value.values_list.return_value.order_by.return_value.__getitem__.return_value
+            page_queryset.__aiter__.side_effect = Exception("db down")
+
+            # Test function with mock data
+            response = async_to_sync(aget_products)(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(json.loads(response.content), { "message": "db down" })
+
+class SearchProductsTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def test_search_products_and_returns_200(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/search", {"q": "luuna", "mode": "brand"})
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.views.product_views.rank_products") as rank_mock, \
+            patch("api.views.product_views.product_rows_to_representation") as representation_mock:
+            ranked = rank_mock.return_value
+            page = [SimpleNamespace(rank=0.5, sku="123")]
+            ranked.values_list.return_value.order_by.return_value.__getitem__.return_value = page
+            representation_mock.return_value = [
+                {
+                    "sku": "123",
+                    "name": "test_product_1",
+                    "price": "100.00",
+                    "brand": "luuna",
+                    "views": 10
+                }
+            ]
+
+            # Test function with mock data
+            response = search_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rank_mock.assert_called_once_with(all_mock.return_value, "luuna", "brand")
+        ranked.values_list.assert_called_once_with(*PRODUCT_FIELDS, "rank", named=True)
+        ranked.values_list.return_value.order_by.assert_called_once_with("-rank", "-sku")
+        representation_mock.assert_called_once_with(page, PRODUCT_FIELDS)
+        self.assertEqual(response.data, {"next": None, "results": representation_mock.return_value})
+
+    def test_search_products_without_query_and_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/search")
+        with patch("api.views.product_views.product_rows_to_representation") as representation_mock:
+
+            # Test function with mock data
+            response = search_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        representation_mock.assert_not_called()
+
+    def test_search_products_db_fails_and_returns_500(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/search", {"q": "luuna"})
+        with patch("api.views.product_views.rank_products", side_effect=Exception("db down")), \
+            patch("api.views.product_views.product_rows_to_representation") as representation_mock:
+
+            # Test function with mock data
+            response = search_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        representation_mock.assert_not_called()
 
 class GetSingleProductTests(SimpleTestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
+        version = SimpleNamespace(version=1, updated_at=datetime(2025, 9, 9, tzinfo=timezone.utc))
+        for module in ["catalog_utils", "cache_utils"]:
+            version_patcher = patch(f"api.utils.{module}.get_catalog_version", return_value=version)
+            version_patcher.start()
+            self.addCleanup(version_patcher.stop)
+        self.counter = ProductViewCounter(background=False)
+        counter_patcher = patch("api.utils.counter_utils.product_view_counter", self.counter)
+        counter_patcher.start()
+        self.addCleanup(counter_patcher.stop)
+        get_product_cache().clear()
 
     def test_get_single_product_from_id_and_returns_200(self):
         # Define mock data and functions
         request = self.factory.get("/products/123")
         with patch("api.views.product_views.Product.objects.get") as get_mock, \
-            patch("api.views.product_views.ProductSerializer") as serializer_cls:
+            patch("api.views.product_views.ProductSerializer") as serializer_cls, \
+            patch.object(self.counter, "flush") as flush_mock:
             product = SimpleNamespace(views=10)
             product.save = MagicMock()
             get_mock.return_value = product
@@ -84,7 +500,7 @@ class GetSingleProductTests(SimpleTestCase):
                 "name": "test_product_1",
                 "price": 100,
                 "brand": "zebrands",
-                "views": 11
+                "views": 10
             }
             serializer_cls.return_value = serializer_instance
             
@@ -93,12 +509,58 @@ class GetSingleProductTests(SimpleTestCase):
         
         # Assertions
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        assert product.views == 11
-        product.save.assert_called_once()
+        product.save.assert_not_called()
+        flush_mock.assert_not_called()
+        self.assertEqual(self.counter.pending("123"), 1)
         get_mock.assert_called_once_with(sku="123")
         serializer_cls.assert_called_once_with(product)
-        self.assertEqual(response.data, serializer_instance.data)
+        self.assertEqual(response.data, { **serializer_instance.data, "views": 11 })
+
+    def test_get_single_product_twice_reads_database_once(self):
+        # Define mock data and functions
+        sku = "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"
+        with patch("api.views.product_views.Product.objects.get") as get_mock, \
+            patch("api.views.product_views.ProductSerializer") as serializer_cls, \
+            patch.object(self.counter, "flush"):
+            serializer_cls.return_value.data = { "sku": sku, "name": "test_product_1", "views": 10 }
+
+            # Test function with mock data
+            get_single_product(self.factory.get(f"/products/{sku}"), sku)
+            response = get_single_product(self.factory.get(f"/products/{sku}"), sku)
+
+        # Assertions
+        get_mock.assert_called_once_with(sku=sku)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["views"], 12)
+        self.assertEqual(self.counter.pending(sku), 2)
     
+    def test_get_single_product_modified_since_returns_304_without_reading_product(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/123", HTTP_IF_MODIFIED_SINCE="Tue, 09 Sep 2025 00:00:00 GMT")
+        with patch("api.views.product_views.Product.objects.get") as get_mock:
+
+            # Test function with mock data
+            response = get_single_product(request, "123")
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        get_mock.assert_not_called()
+
+    def test_get_single_product_with_matching_etag_returns_304_and_counts_the_view(self):
+        # Define mock data and functions
+        sku = "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"
+        etag = catalog_etag(self.factory.get(f"/products/{sku.upper()}"))
+        request = self.factory.get(f"/products/{sku.upper()}", HTTP_IF_NONE_MATCH=etag)
+        with patch("api.views.product_views.Product.objects.get") as get_mock:
+
+            # Test function with mock data
+            response = get_single_product(request, sku.upper())
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        get_mock.assert_not_called()
+        self.assertEqual(self.counter.pending(sku), 1)
+
     def test_get_single_product_not_found_and_returns_404(self):
         # Define mock data and functions
         request = self.factory.get("/products/nonexistant123")
@@ -126,9 +588,92 @@ class GetSingleProductTests(SimpleTestCase):
         get_mock.assert_called_once_with(sku="123")
         serializer_cls.assert_not_called()
     
+class AsyncGetSingleProductTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        version = SimpleNamespace(version=1, updated_at=datetime(2025, 9, 9, tzinfo=timezone.utc))
+        for module in ["catalog_utils", "cache_utils"]:
+            for name, mock_cls in [("get_catalog_version", MagicMock), ("aget_catalog_version", AsyncMock)]:
+                patcher = patch(f"api.utils.{module}.{name}", new_callable=mock_cls, return_value=version)
+                patcher.start()
+                self.addCleanup(patcher.stop)
+        self.counter = ProductViewCounter(background=False)
+        counter_patcher = patch("api.utils.counter_utils.product_view_counter", self.counter)
+        counter_patcher.start()
+        self.addCleanup(counter_patcher.stop)
+        get_product_cache().clear()
+
+    def test_aget_single_product_twice_reads_database_once_and_returns_200(self):
+        # Define mock data and functions
+        sku = "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"
+        with patch("api.views.product_views.Product.objects.aget", new_callable=AsyncMock) as aget_mock, \
+            patch("api.views.product_views.ProductSerializer") as serializer_cls:
+            serializer_cls.return_value.data = { "sku": sku, "name": "test_product_1", "views": 10 }
+
+            # Test function with mock data
+            async_to_sync(aget_single_product)(self.factory.get(f"/products/{sku}"), sku)
+            response = async_to_sync(aget_single_product)(self.factory.get(f"/products/{sku}"), sku)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        aget_mock.assert_awaited_once_with(sku=sku)
+        serializer_cls.assert_called_once_with(aget_mock.return_value)
+        self.assertEqual(json.loads(response.content), { "sku": sku, "name": "test_product_1", "views": 12 })
+        self.assertEqual(self.counter.pending(sku), 2)
+
+    def test_aget_single_product_with_matching_etag_returns_304_and_counts_the_view(self):
+        # Define mock data and functions
+        sku = "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"
+        etag = catalog_etag(self.factory.get(f"/products/{sku}"))
+        request = self.factory.get(f"/products/{sku}", headers={"If-None-Match": etag})
+        with patch("api.views.product_views.Product.objects.aget", new_callable=AsyncMock) as aget_mock:
+
+            # Test function with mock data
+            response = async_to_sync(aget_single_product)(request, sku)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        aget_mock.assert_not_awaited()
+        self.assertEqual(self.counter.pending(sku), 1)
+
+    def test_aget_single_product_not_found_and_returns_404(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/nonexistant123")
+        with patch("api.views.product_views.Product.objects.aget", new_callable=AsyncMock, side_effect=Product.DoesNotExist):
+
+            # Test function with mock data
+            response = async_to_sync(aget_single_product)(request, "nonexistant123")
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.content, b"")
+
+    def test_aget_single_product_db_fails_on_lookup_and_returns_500(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/123")
+        with patch("api.views.product_views.Product.objects.aget", new_callable=AsyncMock, side_effect=Exception("db down")):
+
+            # Test function with mock data
+            response = async_to_sync(aget_single_product)(request, "123")
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 class CreateProductTests(SimpleTestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
+        bump_patcher = patch("api.views.product_views.bump_catalog_version")
+        self.bump_mock = bump_patcher.start()
+        self.addCleanup(bump_patcher.stop)
+        audit_patcher = patch("api.views.product_views.record_product_changes")
+        self.audit_mock = audit_patcher.start()
+        self.addCleanup(audit_patcher.stop)
+        transaction_patcher = patch("api.views.product_views.transaction")
+        transaction_patcher.start()
+        self.addCleanup(transaction_patcher.stop)
+        webhook_patcher = patch("api.views.product_views.record_webhook_events")
+        self.webhook_mock = webhook_patcher.start()
+        self.addCleanup(webhook_patcher.stop)
 
     def test_creates_product_and_returns_201(self):
         # Define mock data and functions
@@ -140,7 +685,7 @@ class CreateProductTests(SimpleTestCase):
         request = self.factory.post("/products/create", mock_data, format="json")
         force_authenticate(request, user=admin_user())
         with patch("api.views.product_views.ProductSerializer") as serializer_cls, \
-            patch("api.views.product_views.notify_via_email") as email_mock:
+            patch("api.views.product_views.enqueue_notification") as enqueue_mock:
             serializer_instance = MagicMock()
             serializer_instance.is_valid.return_value = True
             serializer_instance.data = {
@@ -148,6 +693,7 @@ class CreateProductTests(SimpleTestCase):
                 "price": 200.00,
                 "brand": "zebrands",
             }
+            serializer_instance.instance = SimpleNamespace(sku="123", name="created_product", price=Decimal("200"), brand="zebrands")
             serializer_cls.return_value = serializer_instance
             
             # Test function with mock data
@@ -155,7 +701,10 @@ class CreateProductTests(SimpleTestCase):
             
         # Assertions
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        email_mock.assert_called_once()
+        self.bump_mock.assert_called_once_with()
+        self.audit_mock.assert_called_once_with(request.user, [("123", None, {"name": "created_product", "price": "200.00", "brand": "zebrands"})])
+        enqueue_mock.assert_called_once()
+        self.webhook_mock.assert_called_once_with([("CREATE", "123", "created_product", Decimal("200"), "zebrands")])
         serializer_cls.assert_called_once_with(data=mock_data)
         serializer_instance.is_valid.assert_called_once_with()
         serializer_instance.save.assert_called_once_with()
@@ -228,9 +777,231 @@ class CreateProductTests(SimpleTestCase):
         serializer_cls.assert_called_once_with(data=mock_data)
         serializer_instance.is_valid.assert_called_once_with()
         
+class BulkCreateProductsTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        bump_patcher = patch("api.views.product_views.bump_catalog_version")
+        self.bump_mock = bump_patcher.start()
+        self.addCleanup(bump_patcher.stop)
+        audit_patcher = patch("api.views.product_views.record_product_changes")
+        self.audit_mock = audit_patcher.start()
+        self.addCleanup(audit_patcher.stop)
+        transaction_patcher = patch("api.views.product_views.transaction")
+        transaction_patcher.start()
+        self.addCleanup(transaction_patcher.stop)
+        webhook_patcher = patch("api.views.product_views.record_webhook_events")
+        self.webhook_mock = webhook_patcher.start()
+        self.addCleanup(webhook_patcher.stop)
+        self.items = [
+            {"name": "test_product_1", "price": 100, "brand": "zebrands"},
+            {"name": "", "price": 100, "brand": "zebrands"},
+            {"name": "test_product_3", "price": 300, "brand": "zebrands"},
+        ]
+
+    def test_admin_bulk_creates_products_and_returns_201(self):
+        # Define mock data and functions
+        request = self.factory.post("/products/bulk/create/", [self.items[0], self.items[2]], format="json")
+        force_authenticate(request, user=admin_user())
+        with patch("api.utils.bulk_utils.Product.objects.bulk_create") as bulk_create_mock, \
+            patch("api.utils.bulk_utils.transaction"), \
+            patch("api.views.product_views.enqueue_notification") as enqueue_mock:
+
+            # Test function with mock data
+            response = bulk_create_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        bulk_create_mock.assert_called_once()
+        self.bump_mock.assert_called_once_with()
+        enqueue_mock.assert_called_once()
+        action, products, owner = enqueue_mock.call_args.args
+        self.assertEqual([name for _, name in products], ["test_product_1", "test_product_3"])
+        self.assertEqual(action, "CREATE")
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual([product["price"] for product in response.data["results"]], ["100.00", "300.00"])
+        self.assertEqual(response.data["errors"], [])
+
+    def test_bulk_create_with_invalid_items_returns_400_without_writes(self):
+        # Define mock data and functions
+        request = self.factory.post("/products/bulk/create/", self.items, format="json")
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.product_views.create_products") as create_mock, \
+            patch("api.views.product_views.enqueue_notification") as enqueue_mock:
+
+            # Test function with mock data
+            response = bulk_create_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1])
+        create_mock.assert_not_called()
+        enqueue_mock.assert_not_called()
+        self.bump_mock.assert_not_called()
+
+    def test_partial_bulk_create_writes_valid_items_and_reports_errors(self):
+        # Define mock data and functions
+        request = self.factory.post("/products/bulk/create/?partial=true", self.items, format="json")
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.product_views.create_products") as create_mock, \
+            patch("api.views.product_views.enqueue_notification") as enqueue_mock:
+            create_mock.side_effect = lambda validated: [Product(**data) for data in validated]
+
+            # Test function with mock data
+            response = bulk_create_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(create_mock.call_args.args[0]), 2)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1])
+        enqueue_mock.assert_called_once()
+
+    def test_bulk_create_with_empty_list_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.post("/products/bulk/create/", [], format="json")
+        force_authenticate(request, user=admin_user())
+
+        # Test function with mock data
+        response = bulk_create_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_non_admin_bulk_creates_products_and_returns_403(self):
+        # Define mock data and functions
+        request = self.factory.post("/products/bulk/create/", self.items, format="json")
+        force_authenticate(request, user=non_admin_user())
+        with patch("api.views.product_views.create_products") as create_mock:
+
+            # Test function with mock data
+            response = bulk_create_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        create_mock.assert_not_called()
+
+    def test_bulk_create_db_fails_and_returns_500(self):
+        # Define mock data and functions
+        request = self.factory.post("/products/bulk/create/", [self.items[0]], format="json")
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.product_views.create_products", side_effect=Exception("db down")), \
+            patch("api.views.product_views.enqueue_notification") as enqueue_mock:
+
+            # Test function with mock data
+            response = bulk_create_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        enqueue_mock.assert_not_called()
+
+class BulkUpsertProductsTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        bump_patcher = patch("api.views.product_views.bump_catalog_version")
+        self.bump_mock = bump_patcher.start()
+        self.addCleanup(bump_patcher.stop)
+        audit_patcher = patch("api.views.product_views.record_product_changes")
+        self.audit_mock = audit_patcher.start()
+        self.addCleanup(audit_patcher.stop)
+        transaction_patcher = patch("api.views.product_views.transaction")
+        transaction_patcher.start()
+        self.addCleanup(transaction_patcher.stop)
+        webhook_patcher = patch("api.views.product_views.record_webhook_events")
+        self.webhook_mock = webhook_patcher.start()
+        self.addCleanup(webhook_patcher.stop)
+        self.items = [
+            {"sku": "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10", "name": "test_product_1", "price": 100, "brand": "zebrands"},
+            {"sku": "0b7e3a52-8a5f-4d0e-9a51-2d1f3c4b5a69", "name": "test_product_2", "price": 200, "brand": "zebrands"},
+        ]
+
+    def test_admin_bulk_upserts_products_and_returns_200(self):
+        # Define mock data and functions
+        request = self.factory.put("/products/bulk/upsert/", self.items, format="json")
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.product_views.upsert_products") as upsert_mock, \
+            patch("api.views.product_views.enqueue_notification") as enqueue_mock:
+            written = [SimpleNamespace(sku="0b7e3a52-8a5f-4d0e-9a51-2d1f3c4b5a69", name="test_product_2", price=Decimal("200"), brand="zebrands")]
+            previous = {"0b7e3a52-8a5f-4d0e-9a51-2d1f3c4b5a69": {"name": "test_product_2", "price": Decimal("150"), "brand": "zebrands"}}
+            upsert_mock.return_value = ({"inserted": 0, "updated": 1, "unchanged": 1}, written, previous)
+
+            # Test function with mock data
+            response = bulk_upsert_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"inserted": 0, "updated": 1, "unchanged": 1, "errors": []})
+        self.assertEqual(len(upsert_mock.call_args.args[0]), 2)
+        self.bump_mock.assert_called_once_with()
+        self.audit_mock.assert_called_once_with(request.user, [(
+            "0b7e3a52-8a5f-4d0e-9a51-2d1f3c4b5a69",
+            {"name": "test_product_2", "price": "150.00", "brand": "zebrands"},
+            {"name": "test_product_2", "price": "200.00", "brand": "zebrands"},
+        )])
+        enqueue_mock.assert_called_once()
+        self.assertEqual(enqueue_mock.call_args.args[0], "UPSERT")
+        self.webhook_mock.assert_called_once_with([
+            ("UPDATE", "0b7e3a52-8a5f-4d0e-9a51-2d1f3c4b5a69", "test_product_2", Decimal("200"), "zebrands")
+        ])
+
+    def test_bulk_upsert_without_changes_skips_notification(self):
+        # Define mock data and functions
+        request = self.factory.put("/products/bulk/upsert/", self.items, format="json")
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.product_views.upsert_products") as upsert_mock, \
+            patch("api.views.product_views.enqueue_notification") as enqueue_mock:
+            upsert_mock.return_value = ({"inserted": 0, "updated": 0, "unchanged": 2}, [], {})
+
+            # Test function with mock data
+            response = bulk_upsert_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.bump_mock.assert_not_called()
+        enqueue_mock.assert_not_called()
+        self.webhook_mock.assert_not_called()
+
+    def test_bulk_upsert_with_duplicated_sku_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.put("/products/bulk/upsert/", [self.items[0], self.items[0]], format="json")
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.product_views.upsert_products") as upsert_mock:
+
+            # Test function with mock data
+            response = bulk_upsert_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        upsert_mock.assert_not_called()
+
+    def test_non_admin_bulk_upserts_products_and_returns_403(self):
+        # Define mock data and functions
+        request = self.factory.put("/products/bulk/upsert/", self.items, format="json")
+        force_authenticate(request, user=non_admin_user())
+        with patch("api.views.product_views.upsert_products") as upsert_mock:
+
+            # Test function with mock data
+            response = bulk_upsert_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        upsert_mock.assert_not_called()
+
 class UpdateProductTests(SimpleTestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
+        bump_patcher = patch("api.views.product_views.bump_catalog_version")
+        self.bump_mock = bump_patcher.start()
+        self.addCleanup(bump_patcher.stop)
+        audit_patcher = patch("api.views.product_views.record_product_changes")
+        self.audit_mock = audit_patcher.start()
+        self.addCleanup(audit_patcher.stop)
+        transaction_patcher = patch("api.views.product_views.transaction")
+        transaction_patcher.start()
+        self.addCleanup(transaction_patcher.stop)
+        webhook_patcher = patch("api.views.product_views.record_webhook_events")
+        self.webhook_mock = webhook_patcher.start()
+        self.addCleanup(webhook_patcher.stop)
 
     def test_admin_update_product_and_returns_200(self):
         # Define mock data and functions
@@ -243,10 +1014,10 @@ class UpdateProductTests(SimpleTestCase):
         force_authenticate(request, user=admin_user())
         with patch("api.views.product_views.Product.objects.get") as get_mock, \
             patch("api.views.product_views.ProductSerializer") as serializer_cls, \
-            patch("api.views.product_views.notify_via_email") as email_mock:
+            patch("api.views.product_views.enqueue_notification") as enqueue_mock:
             product = SimpleNamespace(
                 name="product",
-                price=100,
+                price=Decimal("100"),
                 brand="zebrands"
             )
             get_mock.return_value = product
@@ -258,6 +1029,7 @@ class UpdateProductTests(SimpleTestCase):
                 "brand": "zebrands",
             }
             serializer_instance.save = MagicMock()
+            serializer_instance.instance = SimpleNamespace(sku="123", name="updated_product", price=Decimal("200"), brand="zebrands")
             serializer_cls.return_value = serializer_instance
 
             # Test function with mock data
@@ -265,7 +1037,13 @@ class UpdateProductTests(SimpleTestCase):
             
         # Assertions
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        email_mock.assert_called_once()
+        self.bump_mock.assert_called_once_with()
+        self.audit_mock.assert_called_once_with(request.user, [(
+            "123",
+            {"name": "product", "price": "100.00", "brand": "zebrands"},
+            {"name": "updated_product", "price": "200.00", "brand": "zebrands"},
+        )])
+        enqueue_mock.assert_called_once()
         get_mock.assert_called_once_with(sku="123")
         serializer_cls.assert_called_once_with(product, data=mock_data)
         serializer_instance.is_valid.assert_called_once_with()
@@ -324,7 +1102,7 @@ class UpdateProductTests(SimpleTestCase):
             patch("api.views.product_views.ProductSerializer") as serializer_cls:
             product = SimpleNamespace(
                 name="product",
-                price=100,
+                price=Decimal("100"),
                 brand="zebrands"
             )
             get_mock.return_value = product
@@ -376,7 +1154,7 @@ class UpdateProductTests(SimpleTestCase):
             patch("api.views.product_views.ProductSerializer") as serializer_cls:
             product = SimpleNamespace(
                 name="product",
-                price=100,
+                price=Decimal("100"),
                 brand="zebrands"
             )
             get_mock.return_value = product
@@ -398,16 +1176,33 @@ class UpdateProductTests(SimpleTestCase):
 class DeleteProductTests(SimpleTestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
+        bump_patcher = patch("api.views.product_views.bump_catalog_version")
+        self.bump_mock = bump_patcher.start()
+        self.addCleanup(bump_patcher.stop)
+        audit_patcher = patch("api.views.product_views.record_product_changes")
+        self.audit_mock = audit_patcher.start()
+        self.addCleanup(audit_patcher.stop)
+        transaction_patcher = patch("api.views.product_views.transaction")
+        transaction_patcher.start()
+        self.addCleanup(transaction_patcher.stop)
+        webhook_patcher = patch("api.views.product_views.record_webhook_events")
+        self.webhook_mock = webhook_patcher.start()
+        self.addCleanup(webhook_patcher.stop)
+        tombstone_patcher = patch("api.views.product_views.tombstone_products")
+        self.tombstone_mock = tombstone_patcher.start()
+        self.addCleanup(tombstone_patcher.stop)
     
     def test_admin_delete_product_and_returns_204(self):
         # Define mock data and functions
         request = self.factory.delete("/products/delete/123")
         force_authenticate(request, user=admin_user())
         with patch("api.views.product_views.Product.objects.get") as get_mock, \
-            patch("api.views.product_views.notify_via_email") as email_mock:
+            patch("api.views.product_views.enqueue_notification") as enqueue_mock:
             product = SimpleNamespace(
                 sku = "123",
-                name = "deleted_product"
+                name = "deleted_product",
+                price = Decimal("100"),
+                brand = "zebrands"
             )
             product.delete = MagicMock()
             get_mock.return_value = product
@@ -416,7 +1211,11 @@ class DeleteProductTests(SimpleTestCase):
             
         # Assertions
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
-        email_mock.assert_called_once()
+        self.bump_mock.assert_called_once_with()
+        self.tombstone_mock.assert_called_once_with(["123"])
+        self.audit_mock.assert_called_once_with(request.user, [("123", {"name": "deleted_product", "price": "100.00", "brand": "zebrands"}, None)])
+        enqueue_mock.assert_called_once()
+        self.webhook_mock.assert_called_once_with([("DELETE", "123", "deleted_product", Decimal("100"), "zebrands")])
         get_mock.assert_called_once_with(sku="123")
         product.delete.assert_called_once()
     
@@ -471,7 +1270,9 @@ class DeleteProductTests(SimpleTestCase):
         with patch("api.views.product_views.Product.objects.get") as get_mock:
             product = SimpleNamespace(
                 sku = "123",
-                name = "deleted_product"
+                name = "deleted_product",
+                price = Decimal("100"),
+                brand = "zebrands"
             )
             product.delete = MagicMock(side_effect=Exception("db down"))
             get_mock.return_value = product
@@ -482,4 +1283,341 @@ class DeleteProductTests(SimpleTestCase):
         # Assertions
         self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
         get_mock.assert_called_once_with(sku="123")
-        product.delete.assert_called_once()
\ No newline at end of file
+        product.delete.assert_called_once()
+class GetPopularTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def test_get_popular_products_and_returns_200(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/popular", {"window": "1h", "limit": 5})
+        with patch("api.views.product_views.get_popular_products") as popular_mock:
+            popular_mock.return_value = [{"sku": "123", "window_views": 4}]
+
+            # Test function with mock data
+            response = get_popular(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        popular_mock.assert_called_once_with("1h", 5)
+        self.assertEqual(response.data, {"window": "1h", "results": popular_mock.return_value})
+
+    def test_get_popular_products_with_invalid_window_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/popular", {"window": "3h"})
+        with patch("api.views.product_views.get_popular_products") as popular_mock:
+
+            # Test function with mock data
+            response = get_popular(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        popular_mock.assert_not_called()
+
+    def test_get_popular_products_db_fails_and_returns_500(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/popular")
+        with patch("api.views.product_views.get_popular_products", side_effect=Exception("db down")):
+
+            # Test function with mock data
+            response = get_popular(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class BulkDeleteProductsTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        bump_patcher = patch("api.views.product_views.bump_catalog_version")
+        self.bump_mock = bump_patcher.start()
+        self.addCleanup(bump_patcher.stop)
+        audit_patcher = patch("api.views.product_views.record_product_changes")
+        self.audit_mock = audit_patcher.start()
+        self.addCleanup(audit_patcher.stop)
+        transaction_patcher = patch("api.views.product_views.transaction")
+        transaction_patcher.start()
+        self.addCleanup(transaction_patcher.stop)
+        webhook_patcher = patch("api.views.product_views.record_webhook_events")
+        self.webhook_mock = webhook_patcher.start()
+        self.addCleanup(webhook_patcher.stop)
+
+    def test_admin_bulk_deletes_products_of_brand_and_returns_200(self):
+        # Define mock data and functions
+        request = self.factory.post("/products/bulk/delete/", {"brand": "zebrands"}, format="json")
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.product_views.delete_products") as delete_mock, \
+            patch("api.views.product_views.enqueue_notification") as enqueue_mock:
+            delete_mock.return_value = [("123", "test_product_1", Decimal("10"), "zebrands"), ("234", "test_product_2", Decimal("20"), "zebrands")]
+
+            # Test function with mock data
+            response = bulk_delete_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"deleted": 2})
+        delete_mock.assert_called_once_with(brand="zebrands")
+        self.bump_mock.assert_called_once_with()
+        self.assertEqual([(sku, before["price"], after) for sku, before, after in self.audit_mock.call_args.args[1]], [("123", "10.00", None), ("234", "20.00", None)])
+        enqueue_mock.assert_called_once()
+        self.assertEqual(enqueue_mock.call_args.args[0], "DELETE")
+        self.webhook_mock.assert_called_once_with([
+            ("DELETE", "123", "test_product_1", Decimal("10"), "zebrands"),
+            ("DELETE", "234", "test_product_2", Decimal("20"), "zebrands"),
+        ])
+
+    def test_admin_bulk_deletes_products_by_sku_and_returns_200(self):
+        # Define mock data and functions
+        sku = "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"
+        request = self.factory.post("/products/bulk/delete/", {"skus": [sku]}, format="json")
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.product_views.delete_products") as delete_mock, \
+            patch("api.views.product_views.enqueue_notification") as enqueue_mock:
+            delete_mock.return_value = []
+
+            # Test function with mock data
+            response = bulk_delete_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"deleted": 0})
+        self.assertEqual([str(value) for value in delete_mock.call_args.kwargs["skus"]], [sku])
+        self.bump_mock.assert_not_called()
+        enqueue_mock.assert_not_called()
+
+    def test_bulk_delete_with_invalid_input_returns_400(self):
+        for data in [{}, {"skus": [], }, {"skus": ["not-a-uuid"]}, {"skus": ["7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"], "brand": "zebrands"}]:
+            with self.subTest(data=data):
+                # Define mock data and functions
+                request = self.factory.post("/products/bulk/delete/", data, format="json")
+                force_authenticate(request, user=admin_user())
+                with patch("api.views.product_views.delete_products") as delete_mock:
+
+                    # Test function with mock data
+                    response = bulk_delete_products(request)
+
+                # Assertions
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                delete_mock.assert_not_called()
+
+    def test_non_admin_bulk_deletes_products_and_returns_403(self):
+        # Define mock data and functions
+        request = self.factory.post("/products/bulk/delete/", {"brand": "zebrands"}, format="json")
+        force_authenticate(request, user=non_admin_user())
+        with patch("api.views.product_views.delete_products") as delete_mock:
+
+            # Test function with mock data
+            response = bulk_delete_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        delete_mock.assert_not_called()
+
+    def test_bulk_delete_db_fails_and_returns_500(self):
+        # Define mock data and functions
+        request = self.factory.post("/products/bulk/delete/", {"brand": "zebrands"}, format="json")
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.product_views.delete_products", side_effect=Exception("db down")), \
+            patch("api.views.product_views.enqueue_notification") as enqueue_mock:
+
+            # Test function with mock data
+            response = bulk_delete_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        enqueue_mock.assert_not_called()
+
+class ExportProductsTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def test_admin_exports_filtered_products_and_returns_200(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/export", {"file_format": "ndjson", "gzip": "1", "brand": "zebrands"})
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.product_views.Product.objects.all") as all_mock, \
+            patch("api.views.product_views.export_products_response") as export_mock:
+            export_mock.return_value = StreamingHttpResponse(iter([b""]))
+
+            # Test function with mock data
+            response = export_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        all_mock.return_value.filter.assert_called_once_with(brand="zebrands")
+        export_mock.assert_called_once_with(all_mock.return_value.filter.return_value, "ndjson", True, asgi=False)
+
+    def test_export_with_invalid_format_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/export", {"file_format": "xml"})
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.product_views.export_products_response") as export_mock:
+
+            # Test function with mock data
+            response = export_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        export_mock.assert_not_called()
+
+    def test_non_admin_exports_products_and_returns_403(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/export")
+        force_authenticate(request, user=non_admin_user())
+        with patch("api.views.product_views.export_products_response") as export_mock:
+
+            # Test function with mock data
+            response = export_products(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        export_mock.assert_not_called()
+
+class GetChangesTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def test_get_changes_since_cursor_and_returns_200(self):
+        # Define mock data and functions
+        since = ["2025-09-09 00:00:00+00:00", "123"]
+        request = self.factory.get("/products/changes", {"since": encode_cursor(since), "limit": 2})
+        with patch("api.views.product_views.get_product_changes") as changes_mock:
+            changes_mock.return_value = ([{"action": "delete", "sku": "456"}], "next_cursor", False)
+
+            # Test function with mock data
+            response = get_changes(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        changes_mock.assert_called_once_with(since, 2)
+        self.assertEqual(response.data, {
+            "next": "next_cursor",
+            "has_more": False,
+            "results": [{"action": "delete", "sku": "456"}],
+        })
+
+    def test_get_changes_with_invalid_cursor_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/changes", {"since": "not-a-cursor"})
+        with patch("api.views.product_views.get_product_changes") as changes_mock:
+
+            # Test function with mock data
+            response = get_changes(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        changes_mock.assert_not_called()
+
+    def test_get_changes_db_fails_and_returns_500(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/changes")
+        with patch("api.views.product_views.get_product_changes", side_effect=Exception("db down")):
+
+            # Test function with mock data
+            response = get_changes(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class GetProductEventsTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    def test_get_product_events_resumes_from_last_event_id(self):
+        # Define mock data and functions
+        sku = "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"
+        event_id = encode_cursor(["2025-09-09 00:00:00+00:00", sku])
+        request = self.factory.get("/products/events", headers={"Last-Event-ID": event_id})
+        with patch("api.views.product_views.iter_product_events") as events_mock:
+
+            # Test function with mock data
+            response = async_to_sync(get_product_events)(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        events_mock.assert_called_once_with((datetime(2025, 9, 9, tzinfo=timezone.utc), uuid.UUID(sku)))
+
+    def test_get_product_events_with_invalid_event_id_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/events", headers={"Last-Event-ID": encode_cursor(["yesterday", "123"])})
+        with patch("api.views.product_views.iter_product_events") as events_mock:
+
+            # Test function with mock data
+            response = async_to_sync(get_product_events)(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        events_mock.assert_not_called()
+
+    def test_get_product_events_under_wsgi_returns_501(self):
+        # Define mock data and functions
+        request = RequestFactory().get("/products/events")
+        with patch("api.views.product_views.iter_product_events") as events_mock:
+
+            # Test function with mock data
+            response = async_to_sync(get_product_events)(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+        events_mock.assert_not_called()
+
+    def test_get_product_events_is_documented_by_its_schema_view(self):
+        # Assertions
+        self.assertIs(get_product_events.cls, product_events_schema.cls)
+        self.assertEqual(get_product_events.initkwargs, product_events_schema.initkwargs)
+
+class GetProductAuditTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def test_admin_get_audit_of_product_and_returns_200(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/audit", {"sku": "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10", "page_size": 1})
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.product_views.ProductAuditEntry.objects.all") as all_mock:
+            queryset = all_mock.return_value.filter.return_value
+            entries = [
+                SimpleNamespace(
+                    id=2, sku="7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10", action="UPDATE", user_id=1, user_email="admin@test.com",
+                    before={"name": "a", "price": "1.00", "brand": "b"}, after={"name": "a", "price": "2.00", "brand": "b"},
+                    created_at=datetime(2025, 9, 9, tzinfo=timezone.utc)
+                ),
+                SimpleNamespace(id=1),
+            ]
+            queryset.order_by.return_value.__getitem__.return_value = entries
+
+            # Test function with mock data
+            response = get_product_audit(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queryset.order_by.assert_called_once_with("-id")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["before"]["price"], "1.00")
+        self.assertIn(f"cursor={encode_cursor([2])}", response.data["next"])
+
+    def test_get_audit_with_invalid_user_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/audit", {"user": "abc"})
+        force_authenticate(request, user=admin_user())
+
+        # Test function with mock data
+        response = get_product_audit(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_non_admin_get_audit_and_returns_403(self):
+        # Define mock data and functions
+        request = self.factory.get("/products/audit")
+        force_authenticate(request, user=non_admin_user())
+        with patch("api.views.product_views.ProductAuditEntry.objects.all") as all_mock:
+
+            # Test function with mock data
+            response = get_product_audit(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        all_mock.assert_not_called()
@@ -0,0 +1,68 @@
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import patch, MagicMock
+
+from api.utils.recipient_utils import RecipientRegistry, get_recipients_queryset
+
+@override_settings(NOTIFICATION_RECIPIENTS_CACHE_TIMEOUT=300)
+class RecipientRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.versions = MagicMock()
+        self.versions.filter.return_value.values_list.return_value.first.return_value = 1
+        versions_patch = patch("api.utils.recipient_utils.RecipientsVersion.objects", self.versions)
+        versions_patch.start()
+        self.addCleanup(versions_patch.stop)
+
+    def test_recipients_query_reads_only_the_emails_of_active_users(self):
+        sql = str(get_recipients_queryset().query)
+
+        self.assertIn('SELECT DISTINCT "auth_user"."email"', sql)
+        self.assertIn('"auth_user"."is_active"', sql)
+        self.assertIn('ORDER BY 1 ASC', sql)
+
+    def test_recipients_are_read_once_while_cached(self):
+        registry = RecipientRegistry()
+        with patch("api.utils.recipient_utils.get_recipients_queryset", return_value=["a@test.com"]) as query_mock:
+            first = registry.get()
+            second = registry.get()
+
+        self.assertEqual(first, ["a@test.com"])
+        self.assertIs(first, second)
+        query_mock.assert_called_once_with()
+
+    def test_invalidate_drops_the_recipients_and_bumps_the_version_row(self):
+        registry = RecipientRegistry()
+        self.versions.filter.return_value.update.return_value = 1
+        with patch("api.utils.recipient_utils.get_recipients_queryset", side_effect=[["a@test.com"], ["b@test.com"]]):
+            registry.get()
+            registry.invalidate()
+            recipients = registry.get()
+
+        self.assertEqual(recipients, ["b@test.com"])
+        self.versions.filter.assert_called_with(pk=1)
+        self.versions.filter.return_value.update.assert_called_once()
+        self.versions.get_or_create.assert_not_called()
+
+    def test_invalidate_creates_a_missing_version_row(self):
+        self.versions.filter.return_value.update.return_value = 0
+
+        RecipientRegistry().invalidate()
+
+        self.versions.get_or_create.assert_called_once_with(pk=1, defaults={"version": 1})
+
+    def test_recipients_are_read_again_when_another_process_invalidates_them(self):
+        registry = RecipientRegistry()
+        with patch("api.utils.recipient_utils.get_recipients_queryset", side_effect=[["a@test.com"], ["b@test.com"]]):
+            registry.get()
+            self.versions.filter.return_value.values_list.return_value.first.return_value = 2
+            recipients = registry.get()
+
+        self.assertEqual(recipients, ["b@test.com"])
+
+    @override_settings(NOTIFICATION_RECIPIENTS_CACHE_TIMEOUT=0)
+    def test_expired_recipients_are_read_again(self):
+        registry = RecipientRegistry()
+        with patch("api.utils.recipient_utils.get_recipients_queryset", return_value=["a@test.com"]) as query_mock:
+            registry.get()
+            registry.get()
+
+        self.assertEqual(query_mock.call_count, 2)
@@ -0,0 +1,24 @@
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+
+from api.models import Product
+from api.utils.search_utils import rank_products
+
+class RankProductsTests(SimpleTestCase):
+    def test_search_uses_the_search_vector_and_ranks_results(self):
+        sql = str(rank_products(Product.objects.all(), "running shoes").query)
+
+        self.assertIn('"api_product"."search_vector" @@ (websearch_to_tsquery(english::regconfig, running shoes))', sql)
+        self.assertIn("ts_rank(", sql)
+        self.assertNotIn("LIKE", sql)
+        self.assertNotIn("CASE", sql)
+
+    def test_brand_mode_boosts_exact_brand_matches(self):
+        sql = str(rank_products(Product.objects.all(), "luuna", "brand").query)
+
+        self.assertIn('CASE WHEN UPPER("api_product"."brand"::text) = UPPER(luuna) THEN 1.0 ELSE 0.0 END', sql)
+
+    def test_invalid_search_params_raise_validation_error(self):
+        for text, mode in [(None, "rank"), ("   ", "rank"), ("a" * 256, "rank"), ("shoes", "popularity")]:
+            with self.assertRaises(ValidationError):
+                rank_products(Product.objects.all(), text, mode)
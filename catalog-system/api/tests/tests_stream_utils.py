@@ -0,0 +1,90 @@
+import json
+from asgiref.sync import async_to_sync
+from datetime import datetime, timezone
+from decimal import Decimal
+from django.test import SimpleTestCase
+from unittest.mock import MagicMock
+from uuid import UUID
+
+from api.serializers import PRODUCT_FIELDS
+from api.utils.stream_utils import (
+    NDJSONRenderer,
+    STREAM_CHUNK_SIZE,
+    buffered,
+    iter_json_array,
+    iter_ndjson,
+    stream_products_response,
+)
+
+def products_queryset(rows):
+    queryset = MagicMock()
+    queryset.order_by.return_value.values_list.return_value.iterator.return_value = iter(rows)
+    return queryset
+
+class StreamProductsTests(SimpleTestCase):
+    def setUp(self):
+        self.products = [
+            (UUID(int=1), "pillow", Decimal("10.50"), "luuna", 1, datetime(2025, 9, 9, tzinfo=timezone.utc)),
+            (UUID(int=2), "cama ñ", Decimal("200.00"), "nooz", 0, datetime(2025, 9, 10, tzinfo=timezone.utc)),
+        ]
+
+    def test_ndjson_stream_reads_through_server_side_cursor(self):
+        queryset = products_queryset(self.products)
+
+        response = stream_products_response(queryset, ndjson=True)
+        body = b"".join(response.streaming_content).decode()
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        queryset.order_by.assert_called_once_with("sku")
+        queryset.order_by.return_value.values_list.assert_called_once_with(*PRODUCT_FIELDS)
+        queryset.order_by.return_value.values_list.return_value.iterator.assert_called_once_with(chunk_size=STREAM_CHUNK_SIZE)
+        self.assertEqual(
+            [json.loads(line) for line in body.splitlines()],
+            [
+                {
+                    "sku": str(UUID(int=1)),
+                    "name": "pillow",
+                    "price": "10.50",
+                    "brand": "luuna",
+                    "views": 1,
+                    "updated_at": "2025-09-09T00:00:00Z"
+                },
+                {
+                    "sku": str(UUID(int=2)),
+                    "name": "cama ñ",
+                    "price": "200.00",
+                    "brand": "nooz",
+                    "views": 0,
+                    "updated_at": "2025-09-10T00:00:00Z"
+                },
+            ]
+        )
+
+    def test_json_stream_is_a_valid_array(self):
+        response = stream_products_response(products_queryset(self.products))
+        body = b"".join(response.streaming_content)
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual([row["name"] for row in json.loads(body)], ["pillow", "cama ñ"])
+
+    def test_asgi_stream_is_an_async_iterator(self):
+        response = stream_products_response(products_queryset(self.products), ndjson=True, asgi=True)
+
+        async def read():
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        self.assertTrue(response.is_async)
+        self.assertEqual([json.loads(line)["name"] for line in async_to_sync(read)().splitlines()], ["pillow", "cama ñ"])
+
+    def test_empty_json_stream(self):
+        self.assertEqual("".join(iter_json_array([])), "[]")
+        self.assertEqual("".join(iter_ndjson([])), "")
+
+    def test_small_rows_are_buffered_into_larger_chunks(self):
+        chunks = list(buffered(("x" * 10 for _ in range(25)), buffer_size=100))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [100, 100, 50])
+
+    def test_ndjson_renderer_writes_one_line(self):
+        self.assertEqual(NDJSONRenderer().render({"message": "error"}), b'{"message":"error"}\n')
+        self.assertEqual(NDJSONRenderer().render(None), b"")
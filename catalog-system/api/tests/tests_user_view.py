@@ -58,6 +58,43 @@ class GetUsersTests(SimpleTestCase):
         serializer_cls.assert_called_once_with(query_set, many=True)
         self.assertEqual(response.data, serializer_instance.data)
 
+    def test_admin_get_users_with_sparse_fields_and_returns_200(self):
+        # Define mock data and functions
+        request = self.factory.get("/users/", {"fields": "email,id"})
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.user_views.User.objects.all") as all_mock, \
+            patch("api.views.user_views.UserSerializer") as serializer_cls:
+            serializer_cls.Meta.fields = UserSerializer.Meta.fields
+            query_set = MagicMock()
+            all_mock.return_value = query_set
+            serializer_instance = MagicMock()
+            serializer_instance.data = [{"id": 1, "email": "user@test.com"}]
+            serializer_cls.return_value = serializer_instance
+
+            # Test function with mock data
+            response = get_users(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        query_set.only.assert_called_once_with("id", "email")
+        serializer_cls.assert_called_once_with(query_set.only.return_value, many=True, fields=["id", "email"])
+        self.assertEqual(response.data, serializer_instance.data)
+
+    def test_admin_get_users_with_unknown_fields_and_returns_400(self):
+        # Define mock data and functions
+        request = self.factory.get("/users/", {"fields": "id,password"})
+        force_authenticate(request, user=admin_user())
+        with patch("api.views.user_views.User.objects.all") as all_mock, \
+            patch("api.views.user_views.UserSerializer") as serializer_cls:
+            serializer_cls.Meta.fields = UserSerializer.Meta.fields
+
+            # Test function with mock data
+            response = get_users(request)
+
+        # Assertions
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        serializer_cls.assert_not_called()
+
     def test_non_admin_get_all_users_db_fails_and_returns_403(self):
         # Define mock data and functions
         request = self.factory.get("/users/")
@@ -169,6 +206,9 @@ class GetSingleUser(SimpleTestCase):
 class CreateUserTests(SimpleTestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
+        invalidate_patch = patch("api.views.user_views.invalidate_recipients")
+        self.invalidate_mock = invalidate_patch.start()
+        self.addCleanup(invalidate_patch.stop)
 
     def test_creates_user_and_returns_201(self):
         # Define mock data and functions
@@ -208,6 +248,7 @@ class CreateUserTests(SimpleTestCase):
         serializer_cls.assert_called_once_with(data=mock_data)
         serializer_instance.is_valid.assert_called_once_with()
         serializer_instance.save.assert_called_once_with()
+        self.invalidate_mock.assert_called_once_with()
         self.assertEqual(response.data, serializer_instance.data)
 
     def test_creates_user_same_username_fails_and_returns_201(self):
@@ -324,6 +365,9 @@ class CreateUserTests(SimpleTestCase):
 class UpdateUserTests(SimpleTestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
+        invalidate_patch = patch("api.views.user_views.invalidate_recipients")
+        self.invalidate_mock = invalidate_patch.start()
+        self.addCleanup(invalidate_patch.stop)
 
     def test_admin_update_user_and_returns_200(self):
         # Define mock data and functions
@@ -368,6 +412,7 @@ class UpdateUserTests(SimpleTestCase):
         serializer_cls.assert_called_once_with(user, data=mock_data)
         serializer_instance.is_valid.assert_called_once_with()
         serializer_instance.save.assert_called_once_with()
+        self.invalidate_mock.assert_called_once_with()
         self.assertEqual(response.data, serializer_instance.data)
         
     def test_admin_update_superuser_fails_and_returns_400(self):
@@ -554,6 +599,9 @@ class UpdateUserTests(SimpleTestCase):
 class DeleteUserTests(SimpleTestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
+        invalidate_patch = patch("api.views.user_views.invalidate_recipients")
+        self.invalidate_mock = invalidate_patch.start()
+        self.addCleanup(invalidate_patch.stop)
     
     def test_admin_delete_user_and_returns_204(self):
         # Define mock data and functions
@@ -578,6 +626,7 @@ class DeleteUserTests(SimpleTestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         get_mock.assert_called_once_with(id="1")
         user.delete.assert_called_once()
+        self.invalidate_mock.assert_called_once_with()
     
     def test_admin_delete_super_user_fails_and_returns_400(self):
         # Define mock data and functions
@@ -680,4 +729,5 @@ class DeleteUserTests(SimpleTestCase):
         # Assertions
         self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
         get_mock.assert_called_once_with(id="1")
-        user.delete.assert_called_once()
\ No newline at end of file
+        user.delete.assert_called_once()
+        self.invalidate_mock.assert_not_called()
\ No newline at end of file
@@ -0,0 +1,225 @@
+import hashlib
+import hmac
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import patch, MagicMock
+
+from api.utils.webhook_utils import (
+    WebhookConnectionPool,
+    WebhookDeliveryError,
+    WebhookDispatcher,
+    complete_webhook_deliveries,
+    deliver_webhook,
+    encode_webhook_events,
+    event_to_representation,
+    fail_webhook_delivery,
+    get_webhook_retry_delay,
+    record_webhook_events,
+    sign_webhook,
+)
+
+SKU_1 = uuid.UUID("7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10")
+NOW = datetime(2025, 9, 9, tzinfo=timezone.utc)
+
+def subscription(id, cursor=0, failures=0):
+    return SimpleNamespace(id=id, url=f"http://hook{id}.test/webhook", secret=f"secret{id}", cursor=cursor, failures=failures)
+
+def event(id):
+    return {"id": id, "action": "UPDATE", "sku": str(SKU_1), "name": "test_product", "price": "10.50", "brand": "zebrands"}
+
+@override_settings(WEBHOOK_RETRY_BASE_DELAY=10, WEBHOOK_RETRY_MAX_DELAY=60)
+class WebhookEventTests(SimpleTestCase):
+    def test_events_are_not_written_without_active_subscriptions(self):
+        with patch("api.utils.webhook_utils.WebhookSubscription.objects") as subscriptions_mock, \
+            patch("api.utils.webhook_utils.WebhookEvent.objects.bulk_create") as bulk_create_mock:
+            subscriptions_mock.filter.return_value.exists.return_value = False
+
+            events = record_webhook_events([("CREATE", SKU_1, "test_product", Decimal("10.50"), "zebrands")])
+
+        self.assertEqual(events, [])
+        subscriptions_mock.filter.assert_called_once_with(is_active=True)
+        bulk_create_mock.assert_not_called()
+
+    def test_events_are_written_with_the_product_values(self):
+        with patch("api.utils.webhook_utils.WebhookSubscription.objects") as subscriptions_mock, \
+            patch("api.utils.webhook_utils.WebhookEvent.objects.bulk_create") as bulk_create_mock, \
+            patch("api.utils.webhook_utils.timezone.now", return_value=NOW):
+            subscriptions_mock.filter.return_value.exists.return_value = True
+
+            record_webhook_events([("DELETE", SKU_1, "test_product", Decimal("10.50"), "zebrands")])
+
+        events = bulk_create_mock.call_args.args[0]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(
+            (events[0].action, events[0].sku, events[0].price, events[0].brand, events[0].created_at),
+            ("DELETE", SKU_1, Decimal("10.50"), "zebrands", NOW)
+        )
+
+    def test_event_representation(self):
+        row = (7, "UPDATE", SKU_1, "test_product", Decimal("10.50"), "zebrands", NOW)
+
+        self.assertEqual(event_to_representation(row), {
+            "id": 7,
+            "action": "UPDATE",
+            "sku": str(SKU_1),
+            "name": "test_product",
+            "price": "10.50",
+            "brand": "zebrands",
+            "created_at": NOW.isoformat(),
+        })
+
+    def test_signature_is_the_hmac_of_the_timestamp_and_body(self):
+        body = encode_webhook_events([event(1)])
+
+        signature = sign_webhook("secret", 1700000000, body)
+
+        expected = hmac.new(b"secret", b"1700000000." + body, hashlib.sha256).hexdigest()
+        self.assertEqual(signature, f"t=1700000000,v1={expected}")
+        self.assertEqual(json.loads(body), {"events": [event(1)]})
+
+    def test_retry_delay_doubles_up_to_the_max(self):
+        with patch("api.utils.webhook_utils.random.uniform", return_value=1.0):
+            delays = [get_webhook_retry_delay(failures).total_seconds() for failures in [1, 2, 3, 4]]
+
+        self.assertEqual(delays, [10, 20, 40, 60])
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        with patch("api.utils.webhook_utils.WebhookSubscription.objects") as subscriptions_mock, \
+            patch("api.utils.webhook_utils.random.uniform", return_value=1.0):
+            fail_webhook_delivery(subscription(1, failures=1), WebhookDeliveryError("Endpoint answered with HTTP 500"), NOW)
+
+        subscriptions_mock.filter.assert_called_once_with(id=1)
+        subscriptions_mock.filter.return_value.update.assert_called_once_with(
+            failures=2,
+            next_attempt_at=NOW + timedelta(seconds=20),
+            last_error="Endpoint answered with HTTP 500",
+        )
+
+    def test_completed_deliveries_move_the_cursor_and_reset_the_failures(self):
+        with patch("api.utils.webhook_utils.WebhookSubscription.objects") as subscriptions_mock:
+            complete_webhook_deliveries([1, 2], 42, NOW)
+
+        subscriptions_mock.filter.assert_called_once_with(id__in=[1, 2])
+        subscriptions_mock.filter.return_value.update.assert_called_once_with(
+            cursor=42, failures=0, next_attempt_at=NOW, last_delivered_at=NOW, last_error=""
+        )
+
+@override_settings(WEBHOOK_TIMEOUT=5)
+class WebhookConnectionPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.connections = []
+        connection_patch = patch("api.utils.webhook_utils.http.client.HTTPConnection", side_effect=self.new_connection)
+        connection_patch.start()
+        self.addCleanup(connection_patch.stop)
+
+    def new_connection(self, netloc, timeout):
+        connection = MagicMock(sock=None)
+        connection.request.side_effect = lambda *args: setattr(connection, "sock", MagicMock())
+        connection.getresponse.return_value.status = 200
+        self.connections.append(connection)
+        return connection
+
+    def test_requests_to_the_same_endpoint_reuse_the_connection(self):
+        pool = WebhookConnectionPool()
+
+        pool.post("http://hook.test/webhook?a=1", b"{}", {})
+        pool.post("http://hook.test/webhook?a=1", b"{}", {})
+
+        self.assertEqual(len(self.connections), 1)
+        self.connections[0].request.assert_called_with("POST", "/webhook?a=1", b"{}", {})
+        self.assertEqual(pool.snapshot(), {"requests": 2, "connections": 1})
+
+    def test_request_over_a_closed_connection_is_sent_again(self):
+        pool = WebhookConnectionPool()
+        pool.post("http://hook.test/webhook", b"{}", {})
+        self.connections[0].request.side_effect = ConnectionResetError("closed by the endpoint")
+
+        status = pool.post("http://hook.test/webhook", b"{}", {})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(len(self.connections), 2)
+        self.connections[0].close.assert_called_once_with()
+        self.assertEqual(pool.snapshot(), {"requests": 3, "connections": 2})
+
+    def test_request_over_a_new_connection_is_not_sent_again(self):
+        pool = WebhookConnectionPool()
+
+        with patch("api.utils.webhook_utils.http.client.HTTPConnection", side_effect=self.refused_connection), \
+            self.assertRaises(ConnectionRefusedError):
+            pool.post("http://hook.test/webhook", b"{}", {})
+
+        self.assertEqual(pool.snapshot(), {"requests": 1, "connections": 1})
+
+    def refused_connection(self, netloc, timeout):
+        connection = MagicMock(sock=None)
+        connection.request.side_effect = ConnectionRefusedError("refused")
+        return connection
+
+    def test_delivery_is_signed_and_fails_without_a_2xx(self):
+        pool = MagicMock()
+        pool.post.return_value = 500
+        body = encode_webhook_events([event(1)])
+
+        with patch("api.utils.webhook_utils.time.time", return_value=1700000000), \
+            self.assertRaises(WebhookDeliveryError):
+            deliver_webhook(pool, "http://hook.test/webhook", "secret", body)
+
+        url, sent_body, headers = pool.post.call_args.args
+        self.assertEqual((url, sent_body), ("http://hook.test/webhook", body))
+        self.assertEqual(headers["X-Catalog-Signature"], sign_webhook("secret", 1700000000, body))
+
+class WebhookDispatcherTests(SimpleTestCase):
+    def setUp(self):
+        for name in ["claim_webhook_subscriptions", "get_webhook_events", "deliver_webhook",
+                     "complete_webhook_deliveries", "fail_webhook_delivery", "get_changes_horizon"]:
+            patcher = patch(f"api.utils.webhook_utils.{name}")
+            setattr(self, f"{name}_mock", patcher.start())
+            self.addCleanup(patcher.stop)
+        self.get_changes_horizon_mock.return_value = NOW
+
+    def test_subscriptions_at_the_same_cursor_share_the_batch(self):
+        # Define mock data and functions
+        self.claim_webhook_subscriptions_mock.return_value = [subscription(1), subscription(2), subscription(3, cursor=5)]
+        self.get_webhook_events_mock.side_effect = lambda cursor, horizon, limit: [event(cursor + 1), event(cursor + 2)]
+        self.deliver_webhook_mock.side_effect = [None, None, WebhookDeliveryError("Endpoint answered with HTTP 500")]
+        dispatcher = WebhookDispatcher(4, 100)
+
+        # Test function with mock data
+        started = dispatcher.dispatch()
+        dispatcher.close()
+
+        # Assertions
+        self.assertEqual(started, 3)
+        self.claim_webhook_subscriptions_mock.assert_called_once_with(4, NOW)
+        self.assertEqual([c.args[0] for c in self.get_webhook_events_mock.call_args_list], [0, 5])
+        bodies = [c.args[3] for c in self.deliver_webhook_mock.call_args_list]
+        self.assertIs(bodies[0], bodies[1])
+        subscription_ids, cursor = self.complete_webhook_deliveries_mock.call_args.args
+        self.complete_webhook_deliveries_mock.assert_called_once()
+        self.assertEqual((sorted(subscription_ids), cursor), ([1, 2], 2))
+        self.assertEqual(self.fail_webhook_delivery_mock.call_args.args[0].id, 3)
+        self.assertEqual(dispatcher.stats.snapshot(), {"deliveries": 2, "events": 4, "failures": 1})
+        self.assertFalse(dispatcher.busy)
+
+    def test_only_the_free_threads_are_claimed(self):
+        # Define mock data and functions
+        self.claim_webhook_subscriptions_mock.return_value = [subscription(1)]
+        self.get_webhook_events_mock.return_value = [event(1)]
+        release = threading.Event()
+        self.deliver_webhook_mock.side_effect = lambda *args: release.wait(5)
+        dispatcher = WebhookDispatcher(1, 100)
+
+        # Test function with mock data
+        first = dispatcher.dispatch()
+        second = dispatcher.dispatch()
+        release.set()
+        dispatcher.close()
+
+        # Assertions
+        self.assertEqual((first, second), (1, 0))
+        self.claim_webhook_subscriptions_mock.assert_called_once_with(1, NOW)
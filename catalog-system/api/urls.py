@@ -1,11 +1,25 @@
+from django.conf import settings
 from django.urls import path
 from .views import *
 
+# ASGI servers read products from the event loop, see PRODUCT_ASYNC_READS
+product_list_view = aget_products if settings.PRODUCT_ASYNC_READS else get_products
+product_detail_view = aget_single_product if settings.PRODUCT_ASYNC_READS else get_single_product
+
 urlpatterns = [
     # Products
-    path("products/", get_products, name="get_products"),
+    path("products/", product_list_view, name="get_products"),
     path("products/create/", create_product, name="create_product"),
-    path("products/<str:id>", get_single_product, name="get_single_product"),
+    path("products/bulk/create/", bulk_create_products, name="bulk_create_products"),
+    path("products/bulk/upsert/", bulk_upsert_products, name="bulk_upsert_products"),
+    path("products/bulk/delete/", bulk_delete_products, name="bulk_delete_products"),
+    path("products/search", search_products, name="search_products"),
+    path("products/popular", get_popular, name="get_popular"),
+    path("products/export", export_products, name="export_products"),
+    path("products/changes", get_changes, name="get_changes"),
+    path("products/events", get_product_events, name="get_product_events"),
+    path("products/audit", get_product_audit, name="get_product_audit"),
+    path("products/<str:id>", product_detail_view, name="get_single_product"),
     path("products/update/<str:id>", update_product, name="update_product"),
     path("products/delete/<str:id>", delete_product, name="delete_product"),
 
@@ -15,4 +29,9 @@ urlpatterns = [
     path("users/<str:id>", get_single_user, name="get_single_user"),
     path("users/update/<str:id>", update_user, name="update_user"),
     path("users/delete/<str:id>", delete_user, name="delete_user"),
+
+    # Webhooks
+    path("webhooks/", get_webhooks, name="get_webhooks"),
+    path("webhooks/create/", create_webhook, name="create_webhook"),
+    path("webhooks/delete/<int:id>", delete_webhook, name="delete_webhook"),
 ]
\ No newline at end of file
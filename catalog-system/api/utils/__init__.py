@@ -1 +1,32 @@
-from .email_utils import notify_via_email
\ No newline at end of file
+from .recipient_utils import get_recipients, invalidate_recipients, recipient_registry
+from .delivery_utils import email_delivery
+from .email_utils import notify_changes_via_email, notify_digest_via_email, notify_via_email
+from .pagination_utils import AuditLogPagination, ProductCursorPagination, ProductSearchPagination, estimate_product_count
+from .filter_utils import filter_products, get_product_ordering, get_sparse_fields
+from .search_utils import rank_products
+from .stream_utils import NDJSONRenderer, stream_products_response, wants_stream
+from .catalog_utils import bump_catalog_version, catalog_etag, catalog_last_modified, get_catalog_version, prefetch_catalog_version
+from .cache_utils import (
+    acache_product_response,
+    aget_cached_product,
+    cache_product_response,
+    get_cached_product,
+    invalidate_products,
+    product_cache_stats,
+    product_detail_cache_stats,
+)
+from .async_utils import aiter_sync, async_read_view, is_asgi_request, render_response, schema_from
+from .counter_utils import (
+    acount_revalidated_views,
+    count_revalidated_views,
+    product_view_counter,
+    record_product_view,
+)
+from .analytics_utils import compact_view_buckets, get_popular_limit, get_popular_products, get_popular_window
+from .bulk_utils import create_products, delete_products, get_bulk_items, products_to_representation, upsert_products, validate_bulk_products
+from .export_utils import export_products_response, get_export_format
+from .changes_utils import get_changes_limit, get_changes_since, get_product_changes, tombstone_products
+from .audit_utils import audit_values, filter_audit_entries, record_product_changes, write_product_changes
+from .notification_utils import enqueue_notification, notification_stats, process_notifications
+from .webhook_utils import create_webhook_subscription, record_webhook_events, webhook_values
+from .events_utils import EVENT_STREAM_MEDIA_TYPE, get_last_event_key, iter_product_events
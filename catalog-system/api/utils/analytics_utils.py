@@ -0,0 +1,148 @@
+import heapq
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from api.models import Product, ProductViewBucket
+from api.models.analytics_models import DAILY_BUCKET, HOURLY_BUCKET
+from api.serializers import PRODUCT_FIELDS, product_rows_to_representation
+from api.utils.cache_utils import get_product_cache
+from api.utils.counter_utils import get_hour
+
+logger = logging.getLogger(__name__)
+
+# Window name and the hours it covers, counting the current one
+POPULAR_WINDOWS = {"1h": 1, "24h": 24, "7d": 7 * 24}
+DEFAULT_POPULAR_WINDOW = "24h"
+DEFAULT_POPULAR_LIMIT = 20
+MAX_POPULAR_LIMIT = 100
+# Seconds a worker holds the right to refresh a ranking
+REFRESH_LOCK_TIMEOUT = 30
+
+def get_popular_window(query_params):
+    window = query_params.get("window") or DEFAULT_POPULAR_WINDOW
+    if window not in POPULAR_WINDOWS:
+        raise ValidationError({ "message": f"window must be one of {', '.join(POPULAR_WINDOWS)}" })
+    return window
+
+def get_popular_limit(query_params):
+    value = query_params.get("limit") or DEFAULT_POPULAR_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValidationError({ "message": "limit must be a number" })
+    if not 1 <= limit <= MAX_POPULAR_LIMIT:
+        raise ValidationError({ "message": f"limit must be between 1 and {MAX_POPULAR_LIMIT}" })
+    return limit
+
+def sum_bucket_views(start, end):
+    """
+    Views per sku of the hourly buckets in [start, end)
+    """
+    if start >= end:
+        return Counter()
+    rows = (
+        ProductViewBucket.objects
+        .filter(hours=HOURLY_BUCKET, start__gte=start, start__lt=end)
+        .values_list("sku")
+        .annotate(total=Sum("views"))
+        .order_by()
+    )
+    return Counter(dict(rows))
+
+class WindowRanking:
+    """
+    Views per sku of the finished hours of a window, kept in memory.
+    Finished buckets don't change, so each refresh only reads the hours
+    that entered and left the window since the previous one.
+    """
+    def __init__(self, hours):
+        self.hours = hours
+        self.totals = Counter()
+        self.start = None
+        self.end = None
+        self._lock = threading.Lock()
+
+    def refresh(self, now=None):
+        """
+        Returns the top skus of the window as [(sku, views)]
+        """
+        current_hour = get_hour(now or timezone.now())
+        start = current_hour - timedelta(hours=self.hours - 1)
+        with self._lock:
+            if self.end is None or self.end <= start:
+                self.totals = sum_bucket_views(start, current_hour)
+            else:
+                self.totals.update(sum_bucket_views(self.end, current_hour))
+                self.totals.subtract(sum_bucket_views(self.start, start))
+                self.totals = +self.totals
+            self.start, self.end = start, current_hour
+            totals = self.totals + sum_bucket_views(current_hour, current_hour + timedelta(hours=1))
+        return heapq.nlargest(MAX_POPULAR_LIMIT, totals.items(), key=lambda item: (item[1], str(item[0])))
+
+window_rankings = {window: WindowRanking(hours) for window, hours in POPULAR_WINDOWS.items()}
+
+def build_popular_products(window, now=None):
+    """
+    Representation of the most viewed products of the window, with the
+    views they got in it as `window_views`
+    """
+    top = window_rankings[window].refresh(now)
+    rows = Product.objects.filter(sku__in=[sku for sku, _ in top]).values_list(*PRODUCT_FIELDS)
+    products = {product["sku"]: product for product in product_rows_to_representation(rows, PRODUCT_FIELDS)}
+    # Deleted products keep their buckets until they are compacted
+    return [
+        { **products[str(sku)], "window_views": views }
+        for sku, views in top
+        if str(sku) in products
+    ]
+
+def get_popular_products(window, limit):
+    """
+    Serves the ranking of the window from the products cache. One worker at a
+    time refreshes it once it's older than PRODUCT_POPULAR_REFRESH_INTERVAL,
+    the others keep serving the previous ranking meanwhile.
+    """
+    cache = get_product_cache()
+    key = f"products:popular:{window}"
+    cached = cache.get(key)
+    is_stale = cached is None or time.time() - cached[0] >= settings.PRODUCT_POPULAR_REFRESH_INTERVAL
+    if is_stale and (cached is None or cache.add(f"{key}:refresh", True, REFRESH_LOCK_TIMEOUT)):
+        try:
+            cached = (time.time(), build_popular_products(window))
+            cache.set(key, cached, None)
+        finally:
+            cache.delete(f"{key}:refresh")
+    return cached[1][:limit]
+
+def compact_view_buckets(hourly_days, daily_days, now=None):
+    """
+    Merges the hourly buckets older than hourly_days into daily buckets and
+    drops the daily buckets older than daily_days. Returns the number of
+    hourly buckets compacted and daily buckets dropped.
+    """
+    if hourly_days * 24 < max(POPULAR_WINDOWS.values()):
+        raise ValueError("hourly buckets must cover the longest popular window")
+    today = (now or timezone.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    hourly_before = today - timedelta(days=hourly_days)
+    daily_before = today - timedelta(days=daily_days)
+    table = ProductViewBucket._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO "{table}" ("start", "hours", "sku", "views") '
+            f'SELECT date_trunc(\'day\', "start" AT TIME ZONE \'UTC\') AT TIME ZONE \'UTC\', %s, "sku", SUM("views") '
+            f'FROM "{table}" WHERE "hours" = %s AND "start" < %s '
+            f'GROUP BY 1, "sku" '
+            f'ON CONFLICT ("hours", "start", "sku") '
+            f'DO UPDATE SET "views" = "{table}"."views" + EXCLUDED."views"',
+            [DAILY_BUCKET, HOURLY_BUCKET, hourly_before]
+        )
+        compacted, _ = ProductViewBucket.objects.filter(hours=HOURLY_BUCKET, start__lt=hourly_before).delete()
+        dropped, _ = ProductViewBucket.objects.filter(hours=DAILY_BUCKET, start__lt=daily_before).delete()
+    return compacted, dropped
@@ -0,0 +1,126 @@
+import asyncio
+import functools
+import weakref
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.request import Request
+
+def render_response(request, data=None, status=200):
+    """
+    Renders the data of an async view with the renderer negotiated for the
+    request, like a DRF Response
+    """
+    if data is None:
+        response = HttpResponse(status=status)
+        # Like DRF, an empty response has no content type
+        del response["Content-Type"]
+        return response
+    renderer = request.accepted_renderer
+    content = renderer.render(data, request.accepted_media_type, {"request": request})
+    return HttpResponse(content, status=status, content_type=renderer.media_type)
+
+def is_asgi_request(request):
+    """
+    True when the request, or the Django request of a DRF Request, came
+    through the ASGI server
+    """
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+async def aiter_sync(iterator):
+    """
+    Iterates a sync iterator from the event loop. Under ASGI a streaming
+    response over a sync iterator is read whole into memory before it is
+    sent, this reads one item at a time in the thread of the request
+    instead, so a server side cursor keeps its connection.
+    """
+    iterator = iter(iterator)
+    done = object()
+    read = sync_to_async(next)
+    try:
+        while (item := await read(iterator, done)) is not done:
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            # Closes the server side cursor when the client goes away
+            await sync_to_async(close)()
+
+# Semaphore of the async reads of each event loop
+_read_slots = weakref.WeakKeyDictionary()
+
+def get_read_slots():
+    """
+    Returns the semaphore that bounds the async reads running at once in
+    the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    slots = _read_slots.get(loop)
+    if slots is None:
+        slots = _read_slots[loop] = asyncio.Semaphore(settings.PRODUCT_ASYNC_READS_CONCURRENCY)
+    return slots
+
+def schema_from(api_view):
+    """
+    Documents a plain Django view, like an async view DRF can't serve, with
+    the schema of a DRF view. The schema generator reads these attributes
+    from the view.
+    """
+    def decorator(view):
+        view.cls = api_view.cls
+        view.initkwargs = api_view.initkwargs
+        return view
+    return decorator
+
+def async_read_view(sync_view, fallback=None):
+    """
+    Serves a read view of the API from the event loop of an ASGI server.
+    The decorated coroutine gets the GET requests rendered as JSON, wrapped in
+    a DRF Request, and reads the database with the async ORM. Other methods
+    and formats (the browsable API, NDJSON), and the requests `fallback`
+    returns True for, are served by the sync DRF view in a thread.
+
+    At most PRODUCT_ASYNC_READS_CONCURRENCY coroutines run at once, the
+    other requests wait their turn in the event loop. Every ASGI request runs
+    its queries in a thread and a database connection of its own, so without
+    the limit a burst of requests opens as many connections as requests.
+
+    Both views share the schema, CSRF exemption and response headers of the
+    sync view.
+    """
+    api_view = sync_view.cls(**sync_view.initkwargs)
+    renderers = api_view.get_renderers()
+    negotiator = api_view.get_content_negotiator()
+    headers = api_view.default_response_headers
+    serve_sync = sync_to_async(sync_view)
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != "GET":
+                return await serve_sync(request, *args, **kwargs)
+            api_request = Request(request)
+            try:
+                renderer, media_type = negotiator.select_renderer(api_request, renderers)
+            except NotAcceptable:
+                return await serve_sync(request, *args, **kwargs)
+            api_request.accepted_renderer, api_request.accepted_media_type = renderer, media_type
+            if renderer.format != "json" or (fallback is not None and fallback(api_request)):
+                return await serve_sync(request, *args, **kwargs)
+
+            async with get_read_slots():
+                try:
+                    response = await view(api_request, *args, **kwargs)
+                finally:
+                    # The next request gets the slot and the connection count stays bounded
+                    await sync_to_async(close_old_connections)()
+            for name, value in headers.items():
+                response.headers.setdefault(name, value)
+            return response
+        # The CSRF middleware reads it from the view
+        wrapper.csrf_exempt = sync_view.csrf_exempt
+        return schema_from(sync_view)(wrapper)
+    return decorator
@@ -0,0 +1,125 @@
+import uuid
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from api.models import ProductAuditEntry
+from api.serializers.product_serializers import price_to_representation
+from api.utils.buffer_utils import BufferedWriter
+
+# Product values kept in the audit log
+AUDIT_FIELDS = ["name", "price", "brand"]
+# Entries written per INSERT
+AUDIT_BATCH_SIZE = 1000
+
+def audit_values(product):
+    """
+    Audited values of a product instance or of a dict of its fields
+    """
+    get = product.get if isinstance(product, dict) else lambda field: getattr(product, field)
+    return {
+        "name": get("name"),
+        "price": price_to_representation(get("price")),
+        "brand": get("brand"),
+    }
+
+class AuditLogWriter(BufferedWriter):
+    """
+    Buffers product audit entries and inserts them in batches from a
+    background thread, every PRODUCT_AUDIT_FLUSH_INTERVAL seconds or as soon
+    as PRODUCT_AUDIT_MAX_BUFFER entries are pending. Entries still in the
+    buffer are lost if the worker is killed without exiting.
+    """
+    thread_name = "product-audit-writer"
+
+    def new_buffer(self):
+        return []
+
+    def restore(self, pending):
+        self._pending[:0] = pending
+
+    def write(self, pending):
+        write_audit_entries(pending)
+
+    def get_flush_interval(self):
+        return settings.PRODUCT_AUDIT_FLUSH_INTERVAL
+
+    def get_max_buffer(self):
+        return settings.PRODUCT_AUDIT_MAX_BUFFER
+
+    def add(self, entries):
+        with self._lock:
+            self._pending.extend(entries)
+        self.added()
+
+def write_audit_entries(entries):
+    """
+    Inserts (created_at, action, sku, user_id, user_email, before, after) entries
+    """
+    ProductAuditEntry.objects.bulk_create(
+        [
+            ProductAuditEntry(
+                created_at=created_at,
+                action=action,
+                sku=sku,
+                user_id=user_id,
+                user_email=user_email,
+                before=before,
+                after=after,
+            )
+            for created_at, action, sku, user_id, user_email, before, after in entries
+        ],
+        batch_size=AUDIT_BATCH_SIZE,
+    )
+
+audit_log_writer = AuditLogWriter()
+
+def get_audit_action(before, after):
+    if before is None:
+        return ProductAuditEntry.CREATE
+    if after is None:
+        return ProductAuditEntry.DELETE
+    return ProductAuditEntry.UPDATE
+
+def get_audit_entries(user, changes):
+    """
+    Returns one audit entry per (sku, before, after) change made by the user.
+    `before` is None for a create and `after` is None for a delete.
+    """
+    created_at = timezone.now()
+    user_id = user.pk if getattr(user, "is_authenticated", False) else None
+    user_email = getattr(user, "email", None) or ""
+    return [
+        (created_at, get_audit_action(before, after), sku, user_id, user_email, before, after)
+        for sku, before, after in changes
+    ]
+
+def record_product_changes(user, changes):
+    """
+    Queues the audit entries of the (sku, before, after) changes made by the user
+    """
+    audit_log_writer.add(get_audit_entries(user, changes))
+
+def write_product_changes(user, changes):
+    """
+    Inserts the audit entries of the changes right away instead of queuing
+    them, for writes too big to keep their entries in memory
+    """
+    write_audit_entries(get_audit_entries(user, changes))
+
+def filter_audit_entries(queryset, query_params):
+    """
+    Filters the audit log by sku and by user, each served by its own index
+    """
+    sku = query_params.get("sku")
+    if sku:
+        try:
+            queryset = queryset.filter(sku=uuid.UUID(sku))
+        except ValueError:
+            raise ValidationError({ "message": "sku must be a valid UUID" })
+    user = query_params.get("user")
+    if user:
+        try:
+            queryset = queryset.filter(user_id=int(user))
+        except ValueError:
+            raise ValidationError({ "message": "user must be a number" })
+    return queryset
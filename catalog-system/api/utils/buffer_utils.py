@@ -0,0 +1,101 @@
+import atexit
+import logging
+import threading
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+class BufferedWriter:
+    """
+    Collects records in memory and writes them to the database in batches,
+    so a request doesn't need a write of its own.
+
+    A background thread writes the buffer every `get_flush_interval()`
+    seconds, or as soon as it holds `get_max_buffer()` records, and once
+    more when the worker exits. Records of a failed write are kept for the
+    next one. Subclasses define the buffer and how it is written.
+    """
+    thread_name = "buffered-writer"
+
+    def __init__(self, background=True):
+        self.background = background
+        self._lock = threading.Lock()
+        self._pending = self.new_buffer()
+        self._wake = threading.Event()
+        self._flusher = None
+        if background:
+            atexit.register(self._flush_on_exit)
+
+    def new_buffer(self):
+        raise NotImplementedError
+
+    def restore(self, pending):
+        """
+        Puts back the records of a failed write, called with the lock held
+        """
+        raise NotImplementedError
+
+    def write(self, pending):
+        raise NotImplementedError
+
+    def get_flush_interval(self):
+        raise NotImplementedError
+
+    def get_max_buffer(self):
+        raise NotImplementedError
+
+    def added(self):
+        """
+        Called after records are added to the buffer, with the lock released
+        """
+        full = len(self._pending) >= self.get_max_buffer()
+        if self.background:
+            self._ensure_flusher()
+            if full:
+                self._wake.set()
+        elif full:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the pending records and returns them
+        """
+        with self._lock:
+            pending, self._pending = self._pending, self.new_buffer()
+        if not pending:
+            return pending
+        try:
+            self.write(pending)
+        except Exception:
+            # Nothing was written, the records are retried on the next flush
+            with self._lock:
+                self.restore(pending)
+            raise
+        return pending
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._flusher.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.get_flush_interval())
+            self._wake.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Couldn't flush %s", self.thread_name)
+            finally:
+                close_old_connections()
+
+    def _flush_on_exit(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Couldn't flush %s on exit, %s records lost", self.thread_name, len(self._pending))
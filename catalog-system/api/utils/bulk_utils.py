@@ -0,0 +1,142 @@
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from api.models import Product, ProductTombstone
+from api.serializers import PRODUCT_FIELDS, ProductSerializer, ProductUpsertSerializer, product_rows_to_representation
+
+# Fields written by the bulk upsert, compared to skip unchanged products
+UPSERT_FIELDS = ["name", "price", "brand"]
+
+# Items accepted by a single bulk request
+MAX_BULK_ITEMS = 10000
+# Rows written per INSERT
+BULK_BATCH_SIZE = 1000
+
+def get_bulk_items(data):
+    if not isinstance(data, list) or not data:
+        raise ValidationError({ "message": "Expected a non empty list of products" })
+    if len(data) > MAX_BULK_ITEMS:
+        raise ValidationError({ "message": f"A bulk request can't have more than {MAX_BULK_ITEMS} products" })
+    return data
+
+def validate_bulk_products(items, serializer_class=ProductSerializer, unique_field=None):
+    """
+    Validates every item with the serializer. Returns the validated data of
+    the valid items and the errors of the others as {"index", "errors"}.
+    Items repeating the unique_field of a previous item are errors too.
+    """
+    serializer = serializer_class()
+    validated, errors, seen = [], [], set()
+    for index, item in enumerate(items):
+        try:
+            data = serializer.run_validation(item)
+        except ValidationError as e:
+            errors.append({ "index": index, "errors": e.detail })
+            continue
+        if unique_field is not None:
+            if data[unique_field] in seen:
+                errors.append({ "index": index, "errors": { unique_field: [f"Duplicated {unique_field} in the request"] } })
+                continue
+            seen.add(data[unique_field])
+        validated.append(data)
+    return validated, errors
+
+def create_products(validated):
+    """
+    Inserts the products in batches inside one transaction
+    """
+    products = [Product(**data) for data in validated]
+    with transaction.atomic():
+        Product.objects.bulk_create(products, batch_size=BULK_BATCH_SIZE)
+    return products
+
+def products_to_representation(products):
+    """
+    Representation of product instances through the values_list fast path
+    """
+    return product_rows_to_representation(
+        [tuple(getattr(product, field) for field in PRODUCT_FIELDS) for product in products]
+    )
+
+def upsert_products(validated):
+    """
+    Inserts the new products and updates the changed ones, keyed on sku, in
+    one transaction. Products whose values didn't change are not written.
+    Returns the inserted, updated and unchanged counts, the written products
+    and the previous values of the updated ones by sku.
+    """
+    existing = {}
+    skus = [data["sku"] for data in validated]
+    for start in range(0, len(skus), BULK_BATCH_SIZE):
+        rows = Product.objects.filter(sku__in=skus[start:start + BULK_BATCH_SIZE]).values_list("sku", *UPSERT_FIELDS)
+        existing.update((row[0], row[1:]) for row in rows)
+
+    now = timezone.now()
+    counts = { "inserted": 0, "updated": 0, "unchanged": 0 }
+    changed = []
+    previous = {}
+    for data in validated:
+        current = existing.get(data["sku"])
+        if current == tuple(data[field] for field in UPSERT_FIELDS):
+            counts["unchanged"] += 1
+            continue
+        counts["inserted" if current is None else "updated"] += 1
+        changed.append(Product(**data, updated_at=now))
+        if current is not None:
+            previous[data["sku"]] = dict(zip(UPSERT_FIELDS, current))
+
+    with transaction.atomic():
+        # A product created since it was looked up is updated instead of failing
+        Product.objects.bulk_create(
+            changed,
+            batch_size=BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["sku"],
+            update_fields=[*UPSERT_FIELDS, "updated_at"],
+        )
+    return counts, changed, previous
+
+def _delete_returning(cursor, condition, params, deleted_at):
+    """
+    Deletes the products matching the condition and records their tombstones
+    in one statement. Returns the (sku, name, price, brand) of the deleted products.
+    """
+    table = Product._meta.db_table
+    tombstones = ProductTombstone._meta.db_table
+    cursor.execute(
+        f'WITH "deleted" AS (DELETE FROM "{table}" WHERE {condition} RETURNING "sku", "name", "price", "brand"), '
+        f'"tombstones" AS (INSERT INTO "{tombstones}" ("sku", "deleted_at") SELECT "sku", %s FROM "deleted" '
+        f'ON CONFLICT ("sku") DO UPDATE SET "deleted_at" = EXCLUDED."deleted_at") '
+        f'SELECT "sku", "name", "price", "brand" FROM "deleted"',
+        [*params, deleted_at]
+    )
+    return cursor.fetchall()
+
+def delete_products(skus=None, brand=None):
+    """
+    Deletes the products with the skus, or every product of the brand, one
+    DELETE ... RETURNING per batch inside one transaction. Nothing references
+    Product, so the rows are deleted directly instead of through the ORM
+    collector. Their tombstones are recorded for the changes feed.
+    Returns the (sku, name, price, brand) of the deleted products.
+    """
+    table = Product._meta.db_table
+    deleted_at = timezone.now()
+    deleted = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        if skus is not None:
+            for start in range(0, len(skus), BULK_BATCH_SIZE):
+                batch = [str(sku) for sku in skus[start:start + BULK_BATCH_SIZE]]
+                deleted.extend(_delete_returning(cursor, '"sku" = ANY(%s::uuid[])', [batch], deleted_at))
+        else:
+            while True:
+                rows = _delete_returning(
+                    cursor,
+                    f'"sku" IN (SELECT "sku" FROM "{table}" WHERE "brand" = %s LIMIT %s)',
+                    [brand, BULK_BATCH_SIZE],
+                    deleted_at
+                )
+                deleted.extend(rows)
+                if len(rows) < BULK_BATCH_SIZE:
+                    break
+    return deleted
@@ -0,0 +1,241 @@
+import functools
+import logging
+import threading
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from api.utils.catalog_utils import aget_catalog_version, catalog_etag, get_catalog_version
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_CACHE_ALIAS = "products"
+CACHE_HEADER = "X-Cache"
+
+class CacheStats:
+    """
+    Hit and miss counters of the response cache in this process
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+product_cache_stats = CacheStats()
+product_detail_cache_stats = CacheStats()
+
+def get_product_cache():
+    return caches[PRODUCT_CACHE_ALIAS]
+
+def product_cache_key(request):
+    """
+    Key of a cached response. It embeds the catalog version, so every write
+    moves readers to new keys and the stale entries age out of the cache, and
+    the host, since the pagination links of a response are absolute.
+    """
+    etag = catalog_etag(request)
+    if etag is None:
+        return None
+    return f"products:response:{request.get_host()}:{etag[3:-1]}"
+
+def _is_cacheable(response):
+    if response.status_code != 200 or response.streaming:
+        return False
+    renderer = getattr(response, "accepted_renderer", None)
+    # The browsable API renders the current user in the page
+    return renderer is None or renderer.format != "api"
+
+def _cached_response(cached):
+    content_type, content = cached
+    response = HttpResponse(content, content_type=content_type)
+    response[CACHE_HEADER] = "HIT"
+    return response
+
+def _cache_entry(response):
+    """
+    Returns the (content type, content) to cache of a response, or None
+    when it can't be cached
+    """
+    if not _is_cacheable(response):
+        return None
+    if hasattr(response, "render"):
+        response.render()
+    if len(response.content) > settings.PRODUCT_CACHE_MAX_RESPONSE_BYTES:
+        return None
+    return response["Content-Type"], response.content
+
+def cache_product_response(view):
+    """
+    Serves rendered responses of a product read view from the products cache.
+    Cache errors are logged and the view runs as if the cache was empty.
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = product_cache_key(request) if request.method == "GET" else None
+        if key is None:
+            return view(request, *args, **kwargs)
+
+        cache = get_product_cache()
+        try:
+            cached = cache.get(key)
+        except Exception:
+            logger.exception("Couldn't read %s from the products cache", key)
+            cached = None
+        if cached is not None:
+            product_cache_stats.record(hit=True)
+            return _cached_response(cached)
+
+        product_cache_stats.record(hit=False)
+        response = view(request, *args, **kwargs)
+        entry = _cache_entry(response)
+        if entry is not None:
+            try:
+                cache.set(key, entry)
+            except Exception:
+                logger.exception("Couldn't write %s to the products cache", key)
+        response[CACHE_HEADER] = "MISS"
+        return response
+    return wrapper
+
+def acache_product_response(view):
+    """
+    Async version of cache_product_response, it shares the cached responses
+    of the sync views
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        key = product_cache_key(request) if request.method == "GET" else None
+        if key is None:
+            return await view(request, *args, **kwargs)
+
+        cache = get_product_cache()
+        try:
+            cached = await cache.aget(key)
+        except Exception:
+            logger.exception("Couldn't read %s from the products cache", key)
+            cached = None
+        if cached is not None:
+            product_cache_stats.record(hit=True)
+            return _cached_response(cached)
+
+        product_cache_stats.record(hit=False)
+        response = await view(request, *args, **kwargs)
+        entry = _cache_entry(response)
+        if entry is not None:
+            try:
+                await cache.aset(key, entry)
+            except Exception:
+                logger.exception("Couldn't write %s to the products cache", key)
+        response[CACHE_HEADER] = "MISS"
+        return response
+    return wrapper
+
+def product_detail_cache_key(sku, version):
+    """
+    Key of a cached product body, or None when the sku isn't a valid UUID
+    and can't be a product. Like the list responses, it embeds the catalog
+    version, so a write made by any process moves every reader to a new key.
+    """
+    try:
+        return f"products:sku:{version}:{uuid.UUID(str(sku))}"
+    except ValueError:
+        return None
+
+def get_cached_product(request, sku, load):
+    """
+    Read-through cache of a product body. `load` reads the body from the
+    database when it's not cached, Product.DoesNotExist is not cached.
+    Without a catalog version the body is read without the cache.
+    """
+    try:
+        key = product_detail_cache_key(sku, get_catalog_version(request).version)
+    except Exception:
+        logger.exception("Couldn't read the catalog version of %s", sku)
+        key = None
+    if key is None:
+        return load()
+
+    cache = get_product_cache()
+    try:
+        cached = cache.get(key)
+    except Exception:
+        logger.exception("Couldn't read %s from the products cache", key)
+        cached = None
+    product_detail_cache_stats.record(hit=cached is not None)
+    if cached is not None:
+        return cached
+
+    product = dict(load())
+    try:
+        cache.set(key, product, settings.PRODUCT_DETAIL_CACHE_TIMEOUT)
+    except Exception:
+        logger.exception("Couldn't write %s to the products cache", key)
+    return product
+
+async def aget_cached_product(request, sku, load):
+    """
+    Async version of get_cached_product, `load` is a coroutine function
+    """
+    try:
+        key = product_detail_cache_key(sku, (await aget_catalog_version(request)).version)
+    except Exception:
+        logger.exception("Couldn't read the catalog version of %s", sku)
+        key = None
+    if key is None:
+        return await load()
+
+    cache = get_product_cache()
+    try:
+        cached = await cache.aget(key)
+    except Exception:
+        logger.exception("Couldn't read %s from the products cache", key)
+        cached = None
+    product_detail_cache_stats.record(hit=cached is not None)
+    if cached is not None:
+        return cached
+
+    product = dict(await load())
+    try:
+        await cache.aset(key, product, settings.PRODUCT_DETAIL_CACHE_TIMEOUT)
+    except Exception:
+        logger.exception("Couldn't write %s to the products cache", key)
+    return product
+
+def invalidate_products(skus):
+    """
+    Drops the cached bodies of the products at the current catalog version.
+    Writes don't need it, they bump the version. The view counter calls it
+    after a flush, since view counts don't bump the version.
+    """
+    try:
+        version = get_catalog_version().version
+    except Exception:
+        logger.exception("Couldn't read the catalog version to invalidate %s", skus)
+        return
+    keys = [key for key in (product_detail_cache_key(sku, version) for sku in skus) if key is not None]
+    if not keys:
+        return
+    try:
+        get_product_cache().delete_many(keys)
+    except Exception:
+        logger.exception("Couldn't invalidate %s in the products cache", keys)
@@ -0,0 +1,84 @@
+import functools
+import hashlib
+from django.db.models import F
+from django.utils import timezone
+from api.models import CatalogVersion
+from api.models.catalog_models import CATALOG_VERSION_ID
+
+def bump_catalog_version():
+    """
+    Marks the catalog as changed. Called by every write on products.
+    """
+    now = timezone.now()
+    updated = CatalogVersion.objects.filter(pk=CATALOG_VERSION_ID).update(version=F("version") + 1, updated_at=now)
+    if not updated:
+        CatalogVersion.objects.get_or_create(pk=CATALOG_VERSION_ID, defaults={"version": 1, "updated_at": now})
+
+def get_catalog_version(request=None):
+    """
+    Returns the catalog version row, read once per request
+    """
+    cached = getattr(request, "_catalog_version", None)
+    if cached is not None:
+        return cached
+    version = CatalogVersion.objects.filter(pk=CATALOG_VERSION_ID).only("version", "updated_at").first()
+    if version is None:
+        version = CatalogVersion(pk=CATALOG_VERSION_ID)
+    if request is not None:
+        request._catalog_version = version
+    return version
+
+async def aget_catalog_version(request=None):
+    """
+    Async version of get_catalog_version
+    """
+    cached = getattr(request, "_catalog_version", None)
+    if cached is not None:
+        return cached
+    version = await CatalogVersion.objects.filter(pk=CATALOG_VERSION_ID).only("version", "updated_at").afirst()
+    if version is None:
+        version = CatalogVersion(pk=CATALOG_VERSION_ID)
+    if request is not None:
+        request._catalog_version = version
+    return version
+
+def prefetch_catalog_version(view):
+    """
+    Reads the catalog version of the request before an async view runs, so
+    catalog_etag and catalog_last_modified don't query from the event loop
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            await aget_catalog_version(request)
+        except Exception:
+            # catalog_etag can't read it from the event loop either, so the
+            # request is served without conditional processing
+            pass
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+def catalog_etag(request, *args, **kwargs):
+    """
+    Weak ETag of a catalog read: the catalog version plus everything in the request
+    that changes the representation. It is weak because view counters change
+    without bumping the version.
+    """
+    try:
+        version = get_catalog_version(request)
+    except Exception:
+        # Without a version the request is served without conditional processing
+        return None
+    representation = "|".join([
+        request.path,
+        request.META.get("QUERY_STRING", ""),
+        request.META.get("HTTP_ACCEPT", ""),
+    ])
+    digest = hashlib.sha1(representation.encode()).hexdigest()[:16]
+    return f'W/"{version.version}-{digest}"'
+
+def catalog_last_modified(request, *args, **kwargs):
+    try:
+        return get_catalog_version(request).updated_at
+    except Exception:
+        return None
@@ -0,0 +1,117 @@
+import heapq
+import itertools
+from datetime import timedelta
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from api.models import Product, ProductTombstone
+from api.serializers import PRODUCT_FIELDS, iter_product_representations
+from api.utils.pagination_utils import ProductCursorPagination, decode_cursor, encode_cursor
+
+DEFAULT_CHANGES_LIMIT = 100
+MAX_CHANGES_LIMIT = 1000
+
+def get_changes_limit(query_params):
+    value = query_params.get("limit") or DEFAULT_CHANGES_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValidationError({ "message": "limit must be a number" })
+    if not 1 <= limit <= MAX_CHANGES_LIMIT:
+        raise ValidationError({ "message": f"limit must be between 1 and {MAX_CHANGES_LIMIT}" })
+    return limit
+
+def get_changes_since(query_params):
+    """
+    Decodes the `since` cursor into the (changed_at, sku) of the last change
+    the consumer has, or None to read every change from the beginning
+    """
+    since = query_params.get("since")
+    if not since:
+        return None
+    values = decode_cursor(since)
+    if len(values) != 2:
+        raise ValidationError({ "message": "Invalid cursor" })
+    return values
+
+def tombstone_products(skus, deleted_at=None):
+    """
+    Records the delete of the products, called in the transaction that deletes them
+    """
+    deleted_at = deleted_at or timezone.now()
+    ProductTombstone.objects.bulk_create(
+        [ProductTombstone(sku=sku, deleted_at=deleted_at) for sku in skus],
+        update_conflicts=True,
+        unique_fields=["sku"],
+        update_fields=["deleted_at"],
+    )
+
+def get_changes_horizon():
+    """
+    Returns the time up to which the feed is complete. Rows are stamped before
+    their transaction commits, so a change stamped earlier can still appear.
+    The feed stops PRODUCT_CHANGES_SAFETY_LAG seconds before now, or before the
+    start of the oldest transaction that is writing, so a cursor never moves
+    past a change that isn't visible yet.
+    """
+    lag = timedelta(seconds=settings.PRODUCT_CHANGES_SAFETY_LAG)
+    if connection.vendor != "postgresql":
+        return timezone.now() - lag
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT LEAST(now(), ("
+            "SELECT min(xact_start) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND backend_xid IS NOT NULL AND pid <> pg_backend_pid()"
+            ")) - %s",
+            [lag]
+        )
+        return cursor.fetchone()[0]
+
+def get_product_changes(since=None, limit=DEFAULT_CHANGES_LIMIT):
+    """
+    Returns (changes, next cursor, has more) of the inserts, updates and
+    deletes after the cursor, in the order they were written. Products and
+    tombstones are each read with an index range scan and merged by time.
+    """
+    horizon = get_changes_horizon()
+    products = Product.objects.filter(updated_at__lt=horizon)
+    tombstones = ProductTombstone.objects.filter(deleted_at__lt=horizon)
+    if since is not None:
+        pagination = ProductCursorPagination()
+        try:
+            products = products.filter(pagination.get_cursor_filter(["updated_at", "sku"], since, False))
+            tombstones = tombstones.filter(pagination.get_cursor_filter(["deleted_at", "sku"], since, False))
+        except (DjangoValidationError, ValueError):
+            raise ValidationError({ "message": "Invalid cursor" })
+
+    sku_index, updated_at_index = PRODUCT_FIELDS.index("sku"), PRODUCT_FIELDS.index("updated_at")
+    updated = (
+        (row[updated_at_index], row[sku_index], row)
+        for row in products.order_by("updated_at", "sku").values_list(*PRODUCT_FIELDS)[:limit + 1]
+    )
+    deleted = (
+        (deleted_at, sku, None)
+        for sku, deleted_at in tombstones.order_by("deleted_at", "sku").values_list("sku", "deleted_at")[:limit + 1]
+    )
+    merged = list(itertools.islice(heapq.merge(updated, deleted, key=lambda change: change[:2]), limit + 1))
+    has_more = len(merged) > limit
+    merged = merged[:limit]
+
+    changes = []
+    for changed_at, sku, row in merged:
+        if row is None:
+            changes.append({ "action": "delete", "sku": sku, "changed_at": changed_at })
+        else:
+            changes.append({
+                "action": "upsert",
+                "sku": sku,
+                "changed_at": changed_at,
+                "product": next(iter_product_representations([row])),
+            })
+    if merged:
+        next_cursor = encode_cursor(merged[-1][:2])
+    else:
+        next_cursor = encode_cursor(since) if since is not None else None
+    return changes, next_cursor, has_more
@@ -0,0 +1,138 @@
+import functools
+import uuid
+from collections import Counter
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from api.models import Product, ProductViewBucket
+from api.models.analytics_models import HOURLY_BUCKET
+from api.utils.buffer_utils import BufferedWriter
+from api.utils.cache_utils import invalidate_products
+
+# SKUs written per UPDATE statement
+FLUSH_BATCH_SIZE = 1000
+
+class ProductViewCounter(BufferedWriter):
+    """
+    Collects product views in memory and adds them to the database in batches,
+    so reading a product doesn't need a write of its own.
+
+    A background thread flushes the pending views every
+    PRODUCT_VIEWS_FLUSH_INTERVAL seconds, or as soon as
+    PRODUCT_VIEWS_MAX_BUFFER products have pending views, and once more when
+    the worker exits. Views of a failed flush are kept for the next one.
+    """
+    thread_name = "product-views-flusher"
+
+    def new_buffer(self):
+        return Counter()
+
+    def restore(self, pending):
+        self._pending.update(pending)
+
+    def write(self, pending):
+        write_product_views(pending)
+
+    def get_flush_interval(self):
+        return settings.PRODUCT_VIEWS_FLUSH_INTERVAL
+
+    def get_max_buffer(self):
+        return settings.PRODUCT_VIEWS_MAX_BUFFER
+
+    def add(self, sku, count=1):
+        with self._lock:
+            self._pending[sku] += count
+        self.added()
+
+    def pending(self, sku):
+        with self._lock:
+            return self._pending[sku]
+
+    def flush(self):
+        """
+        Adds the pending views to each product and returns the flushed SKUs
+        """
+        pending = super().flush()
+        if not pending:
+            return []
+        # Cached bodies carry the views of the moment they were read
+        invalidate_products(pending)
+        return list(pending)
+
+def get_hour(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+def write_product_views(views, at=None):
+    """
+    Adds {sku: views} to the products and to their hourly bucket in one
+    transaction, one statement per batch of SKUs, so either every view is
+    written or none is. Views are counted in the hour they are flushed, so a
+    bucket doesn't change once its hour is over.
+    """
+    table = Product._meta.db_table
+    buckets = ProductViewBucket._meta.db_table
+    hour = get_hour(at or timezone.now())
+    items = list(views.items())
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(items), FLUSH_BATCH_SIZE):
+            batch = items[start:start + FLUSH_BATCH_SIZE]
+            values = ", ".join(["(%s::uuid, %s::integer)"] * len(batch))
+            params = [value for sku, count in batch for value in (str(sku), count)]
+            cursor.execute(
+                f'UPDATE "{table}" SET "views" = "{table}"."views" + "pending"."views" '
+                f'FROM (VALUES {values}) AS "pending" ("sku", "views") '
+                f'WHERE "{table}"."sku" = "pending"."sku"',
+                params
+            )
+            cursor.execute(
+                f'INSERT INTO "{buckets}" ("start", "hours", "sku", "views") '
+                f'SELECT %s, %s, "pending"."sku", "pending"."views" '
+                f'FROM (VALUES {values}) AS "pending" ("sku", "views") '
+                f'ON CONFLICT ("hours", "start", "sku") '
+                f'DO UPDATE SET "views" = "{buckets}"."views" + EXCLUDED."views"',
+                [hour, HOURLY_BUCKET, *params]
+            )
+
+product_view_counter = ProductViewCounter()
+
+def record_product_view(sku):
+    """
+    Counts a view of the product and returns the views not yet written to it
+    """
+    product_view_counter.add(sku)
+    return product_view_counter.pending(sku)
+
+def record_revalidated_view(sku):
+    """
+    Counts a view of the product answered with 304 Not Modified. The sku
+    comes from the URL, so it's normalized like the serialized ones.
+    """
+    try:
+        product_view_counter.add(str(uuid.UUID(str(sku))))
+    except ValueError:
+        pass
+
+def count_revalidated_views(view):
+    """
+    Counts the views of a product detail view that `condition` answers with
+    304 Not Modified before the view itself runs and counts them
+    """
+    @functools.wraps(view)
+    def wrapper(request, id, *args, **kwargs):
+        response = view(request, id, *args, **kwargs)
+        if response.status_code == 304:
+            record_revalidated_view(id)
+        return response
+    return wrapper
+
+def acount_revalidated_views(view):
+    """
+    Async version of count_revalidated_views
+    """
+    @functools.wraps(view)
+    async def wrapper(request, id, *args, **kwargs):
+        response = await view(request, id, *args, **kwargs)
+        if response.status_code == 304:
+            record_revalidated_view(id)
+        return response
+    return wrapper
@@ -0,0 +1,139 @@
+import logging
+import smtplib
+import threading
+import time
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+logger = logging.getLogger(__name__)
+
+# To header of the chunked emails, the recipients only appear in their envelope
+UNDISCLOSED_RECIPIENTS = "undisclosed-recipients:;"
+# Errors after which the connection is opened again and the message resent
+RECONNECT_ERRORS = (smtplib.SMTPException, OSError)
+
+class DeliveryStats:
+    """
+    Counters of the emails sent through the delivery engine in this process
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.emails = 0
+            self.messages = 0
+            self.recipients = 0
+            self.connections = 0
+            self.reconnects = 0
+            self.seconds = 0.0
+
+    def record(self, messages, recipients, seconds):
+        with self._lock:
+            self.emails += 1
+            self.messages += messages
+            self.recipients += recipients
+            self.seconds += seconds
+
+    def opened(self, reconnect=False):
+        with self._lock:
+            self.connections += 1
+            if reconnect:
+                self.reconnects += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "emails": self.emails,
+                "messages": self.messages,
+                "recipients": self.recipients,
+                "connections": self.connections,
+                "reconnects": self.reconnects,
+                "messages_per_connection": self.messages / self.connections if self.connections else 0.0,
+                "messages_per_second": self.messages / self.seconds if self.seconds else 0.0,
+            }
+
+def chunk_recipients(recipients, size):
+    return [recipients[start:start + size] for start in range(0, len(recipients), size)]
+
+class EmailDelivery:
+    """
+    Sends emails over one long lived SMTP connection instead of one
+    connection per email.
+
+    Recipients are split into EMAIL_BCC_CHUNK_SIZE chunks sent as BCC, so
+    no recipient sees the others and every message stays under the
+    recipients limit of the provider. When a message fails the connection
+    is opened again and the message resent, up to EMAIL_SEND_RETRIES times.
+    """
+    def __init__(self, stats=None):
+        self._lock = threading.Lock()
+        self._connection = None
+        self.stats = stats or DeliveryStats()
+
+    def _open(self, reconnect=False):
+        self._close()
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        self._connection = connection
+        self.stats.opened(reconnect)
+        return connection
+
+    def _close(self):
+        if self._connection is None:
+            return
+        try:
+            self._connection.close()
+        except Exception:
+            logger.exception("Couldn't close the SMTP connection")
+        self._connection = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _send_message(self, message):
+        attempt = 0
+        while True:
+            connection = self._connection or self._open()
+            try:
+                # One message per call, so a retry doesn't resend the chunks before it
+                connection.send_messages([message])
+                return
+            except RECONNECT_ERRORS:
+                if attempt >= settings.EMAIL_SEND_RETRIES:
+                    self._close()
+                    raise
+                attempt += 1
+                logger.warning("Sending an email failed, reconnecting (attempt %s)", attempt, exc_info=True)
+                self._open(reconnect=True)
+
+    def send(self, subject, message, from_email, recipient_list, fail_silently=False, on_chunk_sent=None):
+        """
+        Sends the email to every recipient and returns the number of
+        messages sent, one per chunk of recipients. on_chunk_sent is called
+        with the recipients of each chunk once it is sent, so a caller can
+        skip them when it retries a failed email.
+        """
+        chunks = chunk_recipients(list(recipient_list), settings.EMAIL_BCC_CHUNK_SIZE)
+        messages = [
+            EmailMessage(subject, message, from_email, bcc=chunk, headers={"To": UNDISCLOSED_RECIPIENTS})
+            for chunk in chunks
+        ]
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                for email in messages:
+                    self._send_message(email)
+                    if on_chunk_sent is not None:
+                        on_chunk_sent(email.bcc)
+        except Exception:
+            if not fail_silently:
+                raise
+            logger.exception("Couldn't send the email %r", subject)
+            return 0
+        self.stats.record(len(messages), len(recipient_list), time.perf_counter() - start)
+        return len(messages)
+
+email_delivery = EmailDelivery()
@@ -1,16 +1,14 @@
-from django.core.mail import send_mail
+from django.conf import settings
 from main.settings import EMAIL_HOST_USER
-from django.contrib.auth import get_user_model
+from api.utils.delivery_utils import email_delivery
+from api.utils.recipient_utils import get_recipients
 
-User = get_user_model()
-
-def notify_via_email(product_id, product_name, owner, action, fail_silently=True):
+def notify_via_email(product_id, product_name, owner, action, fail_silently=True, recipients=None, on_chunk_sent=None):
     """
     Sends email notifications to all existing users in the database
     """
     try:
-        users = User.objects.all()
-        receiver_list = [user.email for user in users if user.email]
+        receiver_list = get_recipients() if recipients is None else recipients
         formatted_subject = f"Product catalog has been recently changed by: {owner}"
         formatted_message = f"""
         Summary:
@@ -19,6 +17,60 @@ def notify_via_email(product_id, product_name, owner, action, fail_silently=True
         - Product_name: {product_name}
         - Changed by: {owner}
         """
-        send_mail(formatted_subject, formatted_message, EMAIL_HOST_USER, receiver_list, fail_silently)
+        email_delivery.send(formatted_subject, formatted_message, EMAIL_HOST_USER, receiver_list, fail_silently, on_chunk_sent=on_chunk_sent)
+    except Exception as e:
+        raise Exception("Sending email failed", e)
+
+def notify_digest_via_email(products, owner, action, fail_silently=True, recipients=None, on_chunk_sent=None):
+    """
+    Sends one email notification to all existing users for a batch of
+    products, given as (product_id, product_name) pairs. Past
+    NOTIFICATION_DIGEST_MAX_PRODUCTS products the rest are only counted.
+    """
+    try:
+        receiver_list = get_recipients() if recipients is None else recipients
+        listed = "\n".join(
+            f"        - {product_id}: {product_name}"
+            for product_id, product_name in products[:settings.NOTIFICATION_DIGEST_MAX_PRODUCTS]
+        )
+        remaining = len(products) - settings.NOTIFICATION_DIGEST_MAX_PRODUCTS
+        if remaining > 0:
+            listed += f"\n        - and {remaining} more"
+        formatted_subject = f"Product catalog has been recently changed by: {owner}"
+        formatted_message = f"""
+        Summary:
+        - Action: {action}
+        - Products: {len(products)}
+        - Changed by: {owner}
+{listed}
+        """
+        email_delivery.send(formatted_subject, formatted_message, EMAIL_HOST_USER, receiver_list, fail_silently, on_chunk_sent=on_chunk_sent)
+    except Exception as e:
+        raise Exception("Sending email failed", e)
+
+def notify_changes_via_email(changes, fail_silently=True, recipients=None, on_chunk_sent=None):
+    """
+    Sends one email notification to all existing users for changes made by
+    any user, given as (action, product_id, product_name, owner) tuples.
+    Past NOTIFICATION_DIGEST_MAX_PRODUCTS changes the rest are only counted.
+    """
+    try:
+        receiver_list = get_recipients() if recipients is None else recipients
+        owners = ", ".join(dict.fromkeys(owner for *_, owner in changes))
+        listed = "\n".join(
+            f"        - Action: {action} | Product_id: {product_id} | Product_name: {product_name} | Changed by: {owner}"
+            for action, product_id, product_name, owner in changes[:settings.NOTIFICATION_DIGEST_MAX_PRODUCTS]
+        )
+        remaining = len(changes) - settings.NOTIFICATION_DIGEST_MAX_PRODUCTS
+        if remaining > 0:
+            listed += f"\n        - and {remaining} more"
+        formatted_subject = f"Product catalog has been recently changed by: {owners}"
+        formatted_message = f"""
+        Summary:
+        - Changes: {len(changes)}
+        - Changed by: {owners}
+{listed}
+        """
+        email_delivery.send(formatted_subject, formatted_message, EMAIL_HOST_USER, receiver_list, fail_silently, on_chunk_sent=on_chunk_sent)
     except Exception as e:
-        raise Exception("Sending email failed", e)
\ No newline at end of file
+        raise Exception("Sending email failed", e)
@@ -0,0 +1,307 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
+from api.utils.changes_utils import get_changes_horizon, get_product_changes
+from api.utils.pagination_utils import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+KEEPALIVE_FRAME = b": keep-alive\n\n"
+# Lowest sku, a start key with it skips every change made before the start time
+MIN_SKU = uuid.UUID(int=0)
+
+def get_last_event_key(request):
+    """
+    Decodes the `Last-Event-ID` header, or the `since` cursor of the changes
+    feed, into the (changed_at, sku) of the last change the client has
+    """
+    value = request.headers.get("Last-Event-ID") or request.GET.get("since")
+    if not value:
+        return None
+    values = decode_cursor(value)
+    if len(values) != 2:
+        raise ValidationError({ "message": "Invalid event id" })
+    try:
+        changed_at, sku = parse_datetime(values[0]), uuid.UUID(values[1])
+    except ValueError:
+        raise ValidationError({ "message": "Invalid event id" })
+    if changed_at is None or timezone.is_naive(changed_at):
+        raise ValidationError({ "message": "Invalid event id" })
+    return changed_at, sku
+
+def encode_product_event(change, encoder):
+    """
+    Returns the key of a change of the changes feed and its event frame.
+    The event id is the changes feed cursor of the change.
+    """
+    key = (change["changed_at"], change["sku"])
+    data = encoder.encode(change)
+    return key, f"id: {encode_cursor(key)}\nevent: {change['action']}\ndata: {data}\n\n".encode()
+
+def read_product_events(after, limit):
+    """
+    Returns the encoded events of the changes after the key and if there are more
+    """
+    close_old_connections()
+    since = None if after is None else [str(value) for value in after]
+    changes, _, has_more = get_product_changes(since, limit)
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    return [encode_product_event(change, encoder) for change in changes], has_more
+
+def get_events_start_key():
+    close_old_connections()
+    return get_changes_horizon(), MIN_SKU
+
+class ProductEventStats:
+    """
+    Counters of the product event streams of this process
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.polls = 0
+            self.events = 0
+            self.streams = 0
+            self.dropped = 0
+
+    def record_poll(self, events):
+        with self._lock:
+            self.polls += 1
+            self.events += events
+
+    def record_stream(self, opened):
+        with self._lock:
+            self.streams += 1 if opened else -1
+
+    def record_drop(self):
+        with self._lock:
+            self.dropped += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {"polls": self.polls, "events": self.events, "streams": self.streams, "dropped": self.dropped}
+
+class EventSubscriber:
+    def __init__(self, after):
+        # Events up to this key were already sent to the stream
+        self.after = after
+        # Events queued and not handed to the server yet
+        self.pending = 0
+        self.queue = asyncio.Queue()
+
+class ProductEventBroadcaster:
+    """
+    Reads the changes feed once per process and pushes every change to the
+    connected event streams. The feed has the latest state of each product,
+    so the writes made to a product between two polls arrive as one event.
+    The changes of a poll are encoded once and the same bytes are queued to
+    every stream, so an idle stream only costs its connection and its queue. A stream with more than
+    PRODUCT_EVENTS_CLIENT_BUFFER events waiting is closed instead of
+    buffering without bound, its client reconnects with `Last-Event-ID`.
+
+    The latest events are kept in memory so a reconnecting stream resumes
+    without a query. The queries run in a thread of their own, so every
+    stream of the process shares one database connection.
+    """
+    def __init__(self):
+        self.stats = ProductEventStats()
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="product-events")
+        self._loop = None
+        self._task = None
+        self._ready = None
+        self._subscribers = set()
+        self._history = deque()
+        # Key of the last change read
+        self.cursor = None
+        # Every event after this key is in the history
+        self.floor = None
+
+    async def start(self):
+        """
+        Starts polling from the running event loop, if it isn't already, and
+        waits for the key it starts from
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._subscribers = set()
+            self._history.clear()
+            self.cursor = self.floor = None
+            self._ready = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        await self._ready.wait()
+
+    async def stop(self):
+        """
+        Stops polling and closes the connected streams
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscriber in list(self._subscribers):
+            self.drop(subscriber)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self.cursor is None:
+            try:
+                self.cursor = self.floor = await loop.run_in_executor(self.executor, get_events_start_key)
+            except Exception:
+                logger.exception("Couldn't start the product event streams")
+                await asyncio.sleep(settings.PRODUCT_EVENTS_POLL_INTERVAL)
+        self._ready.set()
+
+        keepalive_at = time.monotonic() + settings.PRODUCT_EVENTS_KEEPALIVE_INTERVAL
+        while True:
+            try:
+                frames, has_more = await loop.run_in_executor(
+                    self.executor, read_product_events, self.cursor, settings.PRODUCT_EVENTS_BATCH_SIZE
+                )
+            except Exception:
+                logger.exception("Couldn't read the product changes")
+                frames, has_more = [], False
+            self.stats.record_poll(len(frames))
+            if frames:
+                self.publish(frames)
+            if time.monotonic() >= keepalive_at:
+                self.keep_alive()
+                keepalive_at = time.monotonic() + settings.PRODUCT_EVENTS_KEEPALIVE_INTERVAL
+            if not has_more:
+                await asyncio.sleep(settings.PRODUCT_EVENTS_POLL_INTERVAL)
+
+    def publish(self, frames):
+        """
+        Adds the (key, frame) events to the history and queues them to every stream
+        """
+        self._history.extend(frames)
+        while len(self._history) > settings.PRODUCT_EVENTS_HISTORY_SIZE:
+            self.floor = self._history.popleft()[0]
+        self.cursor = frames[-1][0]
+        data = b"".join(frame for _, frame in frames)
+        for subscriber in list(self._subscribers):
+            if subscriber.after is None:
+                self.push(subscriber, data, len(frames))
+                continue
+            # The stream connected ahead of the broadcaster
+            pending = [frame for key, frame in frames if key > subscriber.after]
+            if pending:
+                self.push(subscriber, b"".join(pending), len(pending))
+            if subscriber.after <= self.cursor:
+                subscriber.after = None
+
+    def push(self, subscriber, data, events):
+        if subscriber.pending and subscriber.pending + events > settings.PRODUCT_EVENTS_CLIENT_BUFFER:
+            logger.warning("Closing a product event stream that fell %s events behind", subscriber.pending)
+            self.drop(subscriber)
+            return
+        subscriber.pending += events
+        subscriber.queue.put_nowait((data, events))
+
+    def keep_alive(self):
+        """
+        Queues a comment to the idle streams so proxies keep them open and
+        closed connections are noticed
+        """
+        for subscriber in self._subscribers:
+            if subscriber.queue.empty():
+                subscriber.queue.put_nowait((KEEPALIVE_FRAME, 0))
+
+    def subscribe(self, after=None):
+        """
+        Connects a stream that has the events up to the key, or only wants
+        the new events without a key. Returns None when the events after the
+        key are no longer in memory, the stream reads them from the database
+        and subscribes again.
+        """
+        if after is None:
+            pending = []
+        elif after < self.floor:
+            return None
+        else:
+            pending = [frame for key, frame in self._history if key > after]
+            if len(pending) > settings.PRODUCT_EVENTS_CLIENT_BUFFER:
+                return None
+        subscriber = EventSubscriber(after if after is not None and after > self.cursor else None)
+        if pending:
+            subscriber.pending = len(pending)
+            subscriber.queue.put_nowait((b"".join(pending), len(pending)))
+        self._subscribers.add(subscriber)
+        self.stats.record_stream(True)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        if subscriber in self._subscribers:
+            self._subscribers.discard(subscriber)
+            self.stats.record_stream(False)
+
+    def drop(self, subscriber):
+        """
+        Disconnects the stream and frees its queue, the stream ends once it
+        reads what it's sending
+        """
+        self.unsubscribe(subscriber)
+        self.stats.record_drop()
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.pending = 0
+        subscriber.queue.put_nowait(None)
+
+product_events = ProductEventBroadcaster()
+
+async def iter_product_events(after=None, broadcaster=product_events):
+    """
+    Yields the event frames of the changes after the key, then of the new
+    changes as they're read. A stream behind the events kept in memory
+    catches up from the database first.
+    """
+    loop = asyncio.get_running_loop()
+    await broadcaster.start()
+    subscriber = broadcaster.subscribe(after)
+    while subscriber is None:
+        frames, has_more = await loop.run_in_executor(
+            broadcaster.executor, read_product_events, after, settings.PRODUCT_EVENTS_BATCH_SIZE
+        )
+        if frames:
+            after = frames[-1][0]
+            yield b"".join(frame for _, frame in frames)
+        elif not has_more:
+            # The feed of this query ends before the one of the broadcaster
+            await asyncio.sleep(settings.PRODUCT_EVENTS_POLL_INTERVAL)
+        subscriber = broadcaster.subscribe(after)
+
+    try:
+        while True:
+            chunks = []
+            item = await subscriber.queue.get()
+            while item is not None:
+                data, events = item
+                subscriber.pending -= events
+                chunks.append(data)
+                # Whatever else is queued goes out in the same write
+                if subscriber.queue.empty():
+                    break
+                item = subscriber.queue.get_nowait()
+            if chunks:
+                yield chunks[0] if len(chunks) == 1 else b"".join(chunks)
+            if item is None:
+                return
+    finally:
+        broadcaster.unsubscribe(subscriber)
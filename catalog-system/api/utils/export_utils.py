@@ -0,0 +1,135 @@
+import zlib
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+from api.serializers import PRODUCT_FIELDS
+from api.utils.async_utils import aiter_sync
+from api.utils.stream_utils import NDJSON_MEDIA_TYPE, buffered
+
+EXPORT_FORMATS = ["csv", "ndjson"]
+# Rows fetched from the server side cursor per round trip
+EXPORT_CHUNK_SIZE = 5000
+
+# Timestamps as the API renders them, in UTC with a Z suffix
+_UPDATED_AT = """to_char("api_product"."updated_at" AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"')"""
+
+def _csv_text(column):
+    return f"""'"' || replace("api_product"."{column}", '"', '""') || '"'"""
+
+# Each exported line is rendered by PostgreSQL, Python only joins them
+EXPORT_LINES = {
+    "csv": " || ',' || ".join([
+        '"api_product"."sku"::text',
+        _csv_text("name"),
+        '"api_product"."price"::text',
+        _csv_text("brand"),
+        '"api_product"."views"::text',
+        _UPDATED_AT,
+    ]),
+    "ndjson": '(SELECT row_to_json("row")::text FROM (SELECT ' + ", ".join([
+        '"api_product"."sku"',
+        '"api_product"."name"',
+        '"api_product"."price"::text AS "price"',
+        '"api_product"."brand"',
+        '"api_product"."views"',
+        f'{_UPDATED_AT} AS "updated_at"',
+    ]) + ') AS "row")',
+}
+EXPORT_CONTENT_TYPES = {"csv": "text/csv", "ndjson": NDJSON_MEDIA_TYPE}
+
+def get_export_format(query_params):
+    export_format = query_params.get("file_format") or "csv"
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationError({ "message": f"file_format must be one of {', '.join(EXPORT_FORMATS)}" })
+    return export_format
+
+def get_export_header(export_format):
+    return ",".join(PRODUCT_FIELDS) + "\n" if export_format == "csv" else ""
+
+def get_export_lines(queryset, export_format):
+    """
+    Queryset of the rendered line of each product, in sku order
+    """
+    return (
+        queryset.order_by("sku")
+        .annotate(export_line=RawSQL(EXPORT_LINES[export_format], []))
+        .values_list("export_line", flat=True)
+    )
+
+def iter_export_lines(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields each product of the queryset as a CSV or NDJSON line, read through
+    a server side cursor
+    """
+    yield get_export_header(export_format)
+    for line in get_export_lines(queryset, export_format).iterator(chunk_size=chunk_size):
+        yield line + "\n"
+
+def get_export_columns(queryset):
+    """
+    Queryset of the exported columns of each product, in sku order
+    """
+    return (
+        queryset.order_by("sku")
+        .annotate(export_updated_at=RawSQL(_UPDATED_AT, []))
+        .values_list("sku", "name", "price", "brand", "views", "export_updated_at")
+    )
+
+# COPY options of each format. CSV is rendered by COPY from the columns,
+# quoting the text ones like the lines of the API. NDJSON lines are copied
+# unchanged: JSON escapes every control character, so the quote and
+# delimiter characters never appear in them and no line is quoted.
+COPY_OPTIONS = {
+    "csv": 'FORMAT csv, FORCE_QUOTE ("name", "brand")',
+    "ndjson": "FORMAT csv, QUOTE E'\\x01', DELIMITER E'\\x02'",
+}
+
+def copy_export(queryset, export_format, file):
+    """
+    Writes the export into a binary file with COPY TO STDOUT, so rows go from
+    PostgreSQL to the file without being read one by one in Python.
+    Returns the number of exported products.
+    """
+    if export_format == "csv":
+        rows = get_export_columns(queryset)
+    else:
+        rows = get_export_lines(queryset, export_format)
+    sql, params = rows.query.sql_with_params()
+    file.write(get_export_header(export_format).encode())
+    with connection.cursor() as cursor:
+        query = cursor.mogrify(sql, params).decode()
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH ({COPY_OPTIONS[export_format]})", file)
+        return cursor.rowcount
+
+def gzipped(chunks, level=1):
+    """
+    Compresses byte chunks into a gzip stream on the fly. The fastest level
+    keeps compression from becoming the bottleneck of the export.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def iter_export(queryset, export_format, gzip=False):
+    """
+    Byte chunks of the export, of about STREAM_BUFFER_SIZE before compression
+    """
+    chunks = buffered(iter_export_lines(queryset, export_format))
+    return gzipped(chunks) if gzip else chunks
+
+def export_products_response(queryset, export_format, gzip=False, asgi=False):
+    """
+    Streams the export as a file attachment, through an async iterator under ASGI
+    """
+    filename = f"products.{export_format}" + (".gz" if gzip else "")
+    chunks = iter_export(queryset, export_format, gzip)
+    response = StreamingHttpResponse(
+        aiter_sync(chunks) if asgi else chunks,
+        content_type="application/gzip" if gzip else EXPORT_CONTENT_TYPES[export_format]
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
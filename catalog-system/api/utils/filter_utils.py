@@ -0,0 +1,84 @@
+from decimal import Decimal, InvalidOperation
+from rest_framework.exceptions import ValidationError
+
+PRODUCT_ORDERING_FIELDS = ["sku", "price", "name", "views"]
+DEFAULT_PRODUCT_ORDERING = "sku"
+# Largest value that fits Product.price (max_digits=10, decimal_places=2)
+MAX_PRICE = Decimal("99999999.99")
+
+def get_sparse_fields(query_params, allowed_fields):
+    """
+    Parses `fields`, a comma separated subset of allowed_fields.
+    Returns None when the param is missing so every field is used.
+    """
+    value = query_params.get("fields")
+    if value is None:
+        return None
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = requested - set(allowed_fields)
+    if not requested or unknown:
+        raise ValidationError({
+            "message": f"fields must be a comma separated list of {', '.join(allowed_fields)}"
+        })
+    return [field for field in allowed_fields if field in requested]
+
+def get_brand_filter(query_params):
+    """
+    Collects brands from repeated `brand` params and comma separated lists
+    """
+    brands = []
+    for value in query_params.getlist("brand"):
+        brands.extend(brand.strip() for brand in value.split(",") if brand.strip())
+    return list(dict.fromkeys(brands))
+
+def _parse_param(query_params, name, parse, minimum):
+    value = query_params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        parsed = parse(value)
+    except (ValueError, InvalidOperation):
+        raise ValidationError({ "message": f"{name} must be a number" })
+    if isinstance(parsed, Decimal) and not parsed.is_finite():
+        raise ValidationError({ "message": f"{name} must be a number" })
+    if parsed < minimum:
+        raise ValidationError({ "message": f"{name} must be greater than or equal to {minimum}" })
+    return parsed
+
+def filter_products(queryset, query_params):
+    """
+    Applies the brand, price range and views filters from the query params.
+    Brand is always an equality so it can lead the composite indexes of Product.
+    """
+    brands = get_brand_filter(query_params)
+    if len(brands) == 1:
+        queryset = queryset.filter(brand=brands[0])
+    elif brands:
+        queryset = queryset.filter(brand__in=brands)
+
+    min_price = _parse_param(query_params, "min_price", Decimal, 0)
+    max_price = _parse_param(query_params, "max_price", Decimal, 0)
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise ValidationError({ "message": "min_price can't be greater than max_price" })
+    if min_price is not None and min_price > MAX_PRICE:
+        return queryset.none()
+    if min_price is not None:
+        queryset = queryset.filter(price__gte=min_price)
+    if max_price is not None:
+        queryset = queryset.filter(price__lte=min(max_price, MAX_PRICE))
+
+    min_views = _parse_param(query_params, "min_views", int, 0)
+    if min_views is not None:
+        queryset = queryset.filter(views__gte=min_views)
+    return queryset
+
+def get_product_ordering(query_params):
+    """
+    Validates the `ordering` param, a sortable field optionally prefixed with `-`
+    """
+    ordering = query_params.get("ordering") or DEFAULT_PRODUCT_ORDERING
+    if ordering.lstrip("-") not in PRODUCT_ORDERING_FIELDS or ordering.startswith("--"):
+        raise ValidationError({
+            "message": f"ordering must be one of {', '.join(PRODUCT_ORDERING_FIELDS)} optionally prefixed with -"
+        })
+    return ordering
@@ -0,0 +1,257 @@
+import csv
+import gzip
+import io
+import json
+import time
+import uuid
+from decimal import Decimal, InvalidOperation, ROUND_DOWN
+from django.core.validators import MinValueValidator
+from django.db import connection, transaction
+from api.models import Product
+from api.utils.audit_utils import audit_values, write_product_changes
+from api.utils.catalog_utils import bump_catalog_version
+from api.utils.notification_utils import enqueue_notification
+from api.utils.webhook_utils import record_webhook_events
+
+IMPORT_FORMATS = ["csv", "ndjson"]
+# Rows read between two progress reports
+PROGRESS_EVERY = 100000
+# Changed products read per round trip for their notification, events and audit entries
+CHANGES_CHUNK_SIZE = 10000
+
+_name_field = Product._meta.get_field("name")
+_brand_field = Product._meta.get_field("brand")
+_price_field = Product._meta.get_field("price")
+MIN_PRICE = next(v.limit_value for v in _price_field.validators if isinstance(v, MinValueValidator))
+PRICE_QUANTUM = Decimal(1).scaleb(-_price_field.decimal_places)
+MAX_PRICE = Decimal(10) ** (_price_field.max_digits - _price_field.decimal_places) - PRICE_QUANTUM
+
+def get_import_format(path, file_format=None):
+    if file_format:
+        return file_format
+    name = path[:-3] if path.endswith(".gz") else path
+    return "ndjson" if name.endswith((".ndjson", ".jsonl")) else "csv"
+
+def open_import_file(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+def read_import_rows(file, file_format):
+    """
+    Yields each row of the file as a dict, one at a time
+    """
+    if file_format == "csv":
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # Reported as an invalid row
+            yield None
+
+def _clean_text(row, field):
+    value = row.get(field.name)
+    value = "" if value is None else str(value).strip()
+    if not value:
+        raise ValueError(f"{field.name} is required")
+    if len(value) > field.max_length:
+        raise ValueError(f"{field.name} can't be longer than {field.max_length} characters")
+    return value
+
+def clean_import_row(row):
+    """
+    Applies the rules of the Product fields to a row and returns it as
+    (sku, name, price, brand). Rows without sku get a new one.
+    Raises ValueError when the row is not a valid product.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("row must be an object")
+    sku = row.get("sku")
+    try:
+        sku = uuid.UUID(str(sku)) if sku else uuid.uuid4()
+    except ValueError:
+        raise ValueError("sku must be a valid UUID")
+    name = _clean_text(row, _name_field)
+    brand = _clean_text(row, _brand_field)
+    try:
+        price = Decimal(str(row.get("price")).strip())
+    except InvalidOperation:
+        raise ValueError("price must be a number")
+    if not price.is_finite() or price < MIN_PRICE or price > MAX_PRICE:
+        raise ValueError(f"price must be between {MIN_PRICE} and {MAX_PRICE}")
+    if price != price.quantize(PRICE_QUANTUM, rounding=ROUND_DOWN):
+        raise ValueError(f"price can't have more than {_price_field.decimal_places} decimal places")
+    return sku, name, price, brand
+
+class CopyStream(io.TextIOBase):
+    """
+    Read only file over an iterator of text chunks, so COPY FROM STDIN can
+    consume rows as they are produced instead of from a buffered file
+    """
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+class ImportStats:
+    def __init__(self, progress=None):
+        self.read = 0
+        self.invalid = 0
+        self.errors = []
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.started = time.monotonic()
+        self.progress = progress
+
+    @property
+    def rows_per_second(self):
+        elapsed = time.monotonic() - self.started
+        return self.read / elapsed if elapsed else 0.0
+
+def iter_copy_lines(rows, stats, max_errors=20):
+    """
+    Validates the rows and yields them as CSV lines for COPY, with the row
+    number used to keep the last row of a repeated sku
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for line, row in enumerate(rows, start=1):
+        stats.read += 1
+        try:
+            sku, name, price, brand = clean_import_row(row)
+        except ValueError as e:
+            stats.invalid += 1
+            if len(stats.errors) < max_errors:
+                stats.errors.append((line, str(e)))
+        else:
+            writer.writerow((line, sku, name, price, brand))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if stats.progress is not None and stats.read % PROGRESS_EVERY == 0:
+            stats.progress(stats)
+
+STAGING_TABLE = "import_products_staging"
+CHANGED_TABLE = "import_products_changed"
+
+def _merge_sql(table):
+    """
+    Inserts the new products and updates the changed ones. Unchanged rows
+    match the WHERE of the conflict action, so they are not rewritten.
+    The written products are kept in the changed table with their previous
+    values, every part of the statement reads the products as they were
+    before it.
+    """
+    return f'''
+        WITH "staged" AS (
+            SELECT DISTINCT ON ("sku") "sku", "name", "price", "brand"
+            FROM "{STAGING_TABLE}"
+            ORDER BY "sku", "line" DESC
+        ), "previous" AS (
+            SELECT "sku", "name", "price", "brand" FROM "{table}"
+            WHERE "sku" IN (SELECT "sku" FROM "staged")
+        ), "merged" AS (
+            INSERT INTO "{table}" ("sku", "name", "price", "brand", "views", "updated_at")
+            SELECT "sku", "name", "price", "brand", 0, now() FROM "staged"
+            ON CONFLICT ("sku") DO UPDATE SET
+                "name" = EXCLUDED."name",
+                "price" = EXCLUDED."price",
+                "brand" = EXCLUDED."brand",
+                "updated_at" = EXCLUDED."updated_at"
+            WHERE ("{table}"."name", "{table}"."price", "{table}"."brand")
+                IS DISTINCT FROM (EXCLUDED."name", EXCLUDED."price", EXCLUDED."brand")
+            RETURNING "sku", "name", "price", "brand", ("xmax" = 0) AS "inserted"
+        ), "changed" AS (
+            INSERT INTO "{CHANGED_TABLE}"
+            SELECT "sku", "merged"."inserted", "merged"."name", "merged"."price", "merged"."brand",
+                "previous"."name", "previous"."price", "previous"."brand"
+            FROM "merged" LEFT JOIN "previous" USING ("sku")
+        )
+        SELECT
+            (SELECT count(*) FROM "staged"),
+            count(*) FILTER (WHERE "inserted"),
+            count(*) FILTER (WHERE NOT "inserted")
+        FROM "merged"
+    '''
+
+def iter_import_changes():
+    """
+    Yields the products written by the import in chunks of rows of
+    (sku, inserted, name, price, brand, previous name, previous price, previous brand)
+    """
+    with connection.chunked_cursor() as changed:
+        changed.execute(f'SELECT * FROM "{CHANGED_TABLE}"')
+        while rows := changed.fetchmany(CHANGES_CHUNK_SIZE):
+            yield rows
+
+def import_products(rows, progress=None):
+    """
+    Loads the rows through COPY into a staging table and merges them into
+    the products in one statement, in one transaction. Memory doesn't
+    depend on the number of rows. Returns the ImportStats of the import.
+
+    Like the other writes, the written products get their outbox
+    notification and webhook events in the transaction. Their audit entries
+    are inserted in it too, a chunk at a time, instead of being queued to
+    the audit log writer, which would keep every entry of the import in memory.
+    """
+    stats = ImportStats(progress)
+    table = Product._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TEMPORARY TABLE "{STAGING_TABLE}" ('
+            f'"line" bigint, "sku" uuid, "name" varchar(255), "price" numeric(10, 2), "brand" varchar(255))'
+        )
+        cursor.execute(
+            f'CREATE TEMPORARY TABLE "{CHANGED_TABLE}" ('
+            f'"sku" uuid, "inserted" boolean, "name" varchar(255), "price" numeric(10, 2), "brand" varchar(255), '
+            f'"previous_name" varchar(255), "previous_price" numeric(10, 2), "previous_brand" varchar(255))'
+        )
+        try:
+            with transaction.atomic():
+                cursor.copy_expert(
+                    f'COPY "{STAGING_TABLE}" ("line", "sku", "name", "price", "brand") FROM STDIN WITH (FORMAT csv)',
+                    CopyStream(iter_copy_lines(rows, stats))
+                )
+                cursor.execute(_merge_sql(table))
+                staged, stats.inserted, stats.updated = cursor.fetchone()
+                stats.unchanged = staged - stats.inserted - stats.updated
+                # One notification per chunk, the worker coalesces them into one email
+                for changes in iter_import_changes():
+                    enqueue_notification("IMPORT", [(sku, name) for sku, _, name, *_ in changes], None)
+                    record_webhook_events([
+                        ("CREATE" if inserted else "UPDATE", sku, name, price, brand)
+                        for sku, inserted, name, price, brand, *_ in changes
+                    ])
+                    write_product_changes(None, [
+                        (
+                            sku,
+                            None if inserted else audit_values({ "name": previous_name, "price": previous_price, "brand": previous_brand }),
+                            audit_values({ "name": name, "price": price, "brand": brand })
+                        )
+                        for sku, inserted, name, price, brand, previous_name, previous_price, previous_brand in changes
+                    ])
+            # Cached copies are keyed by the catalog version, every server reads the new values
+            if stats.inserted or stats.updated:
+                bump_catalog_version()
+        finally:
+            cursor.execute(f'DROP TABLE IF EXISTS "{STAGING_TABLE}", "{CHANGED_TABLE}"')
+    return stats
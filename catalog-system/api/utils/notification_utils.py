@@ -0,0 +1,192 @@
+import random
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from api.models import OutboxNotification
+from api.utils.email_utils import notify_changes_via_email, notify_digest_via_email, notify_via_email
+from api.utils.recipient_utils import get_recipients
+
+# Characters of the last error kept on a notification
+MAX_ERROR_LENGTH = 1000
+
+class NotificationStats:
+    """
+    Counters of the notification worker in this process. A message is one
+    email delivered to one recipient.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.notifications = 0
+            self.emails = 0
+            self.messages_sent = 0
+            self.messages_saved = 0
+
+    def record(self, notifications, recipients):
+        """
+        Counts one email sent for the coalesced notifications, each of which
+        would have been an email of its own
+        """
+        with self._lock:
+            self.notifications += notifications
+            self.emails += 1
+            self.messages_sent += recipients
+            self.messages_saved += (notifications - 1) * recipients
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "notifications": self.notifications,
+                "emails": self.emails,
+                "messages_sent": self.messages_sent,
+                "messages_saved": self.messages_saved,
+            }
+
+notification_stats = NotificationStats()
+
+def enqueue_notification(action, products, owner):
+    """
+    Adds the notification of a change to the outbox. Called inside the
+    transaction of the change, so it is only sent if the change commits.
+    It is due once NOTIFICATION_COALESCE_WINDOW seconds have passed, and is
+    sent with every other change made until then.
+    """
+    now = timezone.now()
+    return OutboxNotification.objects.create(
+        action=action,
+        products=[[str(sku), name] for sku, name in products],
+        owner=owner or "",
+        created_at=now,
+        available_at=now + timedelta(seconds=settings.NOTIFICATION_COALESCE_WINDOW),
+    )
+
+def get_retry_delay(attempts):
+    """
+    Exponential backoff with jitter after the given number of failed attempts
+    """
+    delay = min(
+        settings.NOTIFICATION_RETRY_BASE_DELAY * 2 ** (attempts - 1),
+        settings.NOTIFICATION_RETRY_MAX_DELAY
+    )
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+def claim_notifications(batch_size, now=None):
+    """
+    Leases up to batch_size notifications to this worker once one of them is
+    due. The ones still in their coalescing window are claimed with it, so
+    every change made within the window goes in the same email. SKIP LOCKED
+    lets several workers claim at once, and the lease makes the notifications
+    due again if the worker dies before they're sent.
+    """
+    now = now or timezone.now()
+    pending = OutboxNotification.objects.select_for_update(skip_locked=True).filter(status=OutboxNotification.PENDING)
+    with transaction.atomic():
+        ids = list(
+            pending.filter(available_at__lte=now)
+            .order_by("available_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        if len(ids) < batch_size:
+            # Retries keep their backoff, only notifications never tried are sent early
+            ids += list(
+                pending.filter(available_at__gt=now, attempts=0)
+                .order_by("available_at")
+                .values_list("id", flat=True)[:batch_size - len(ids)]
+            )
+        OutboxNotification.objects.filter(id__in=ids).update(
+            available_at=now + timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS),
+            attempts=F("attempts") + 1,
+        )
+    return list(OutboxNotification.objects.filter(id__in=ids).order_by("id"))
+
+def send_notifications(notifications, recipients, on_chunk_sent=None):
+    """
+    Sends one email for the notifications, raising when it isn't sent.
+    A single notification keeps the email of its action.
+    """
+    if len(notifications) == 1:
+        notification, = notifications
+        if len(notification.products) == 1:
+            (sku, name), = notification.products
+            notify_via_email(
+                sku, name, notification.owner, notification.action,
+                fail_silently=False, recipients=recipients, on_chunk_sent=on_chunk_sent
+            )
+        else:
+            notify_digest_via_email(
+                notification.products, notification.owner, notification.action,
+                fail_silently=False, recipients=recipients, on_chunk_sent=on_chunk_sent
+            )
+        return
+    changes = [
+        (notification.action, sku, name, notification.owner)
+        for notification in notifications
+        for sku, name in notification.products
+    ]
+    notify_changes_via_email(changes, fail_silently=False, recipients=recipients, on_chunk_sent=on_chunk_sent)
+
+def fail_notification(notification, error, now=None):
+    """
+    Schedules the next attempt of a notification, or marks it FAILED once
+    it used NOTIFICATION_MAX_ATTEMPTS attempts
+    """
+    now = now or timezone.now()
+    notification.last_error = str(error)[:MAX_ERROR_LENGTH]
+    if notification.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+        notification.status = OutboxNotification.FAILED
+    else:
+        notification.available_at = now + get_retry_delay(notification.attempts)
+    notification.save(update_fields=["status", "available_at", "last_error", "sent_to"])
+
+def group_by_sent_to(notifications):
+    """
+    Groups the notifications by the emails that already got them, so no
+    email of a retry goes to someone who got it in the failed attempt
+    """
+    groups = {}
+    for notification in notifications:
+        groups.setdefault(frozenset(notification.sent_to), []).append(notification)
+    return groups.items()
+
+def process_notifications(batch_size):
+    """
+    Claims one batch of notifications and sends them in one email, one per
+    group of notifications a failed attempt already sent to some emails.
+    Returns the number of notifications (sent, failed).
+    """
+    notifications = claim_notifications(batch_size)
+    if not notifications:
+        return 0, 0
+    try:
+        recipients = get_recipients()
+    except Exception as e:
+        for notification in notifications:
+            fail_notification(notification, e)
+        return 0, len(notifications)
+
+    sent, failed = [], []
+    for sent_to, group in group_by_sent_to(notifications):
+        pending = [email for email in recipients if email not in sent_to]
+        delivered = []
+        try:
+            send_notifications(group, pending, on_chunk_sent=delivered.extend)
+        except Exception as e:
+            # The next attempt resumes after the chunks this one sent
+            for notification in group:
+                notification.sent_to = [*notification.sent_to, *delivered]
+                fail_notification(notification, e)
+            failed += group
+            continue
+        sent += group
+        notification_stats.record(len(group), len(pending))
+    if sent:
+        OutboxNotification.objects.filter(id__in=[notification.id for notification in sent]).delete()
+    return len(sent), len(failed)
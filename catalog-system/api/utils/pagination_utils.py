@@ -0,0 +1,226 @@
+import base64
+import json
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from api.models import Product
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Below this estimate an exact COUNT(*) is cheap and more accurate than the planner statistics
+EXACT_COUNT_THRESHOLD = 1000
+
+def encode_cursor(values):
+    """
+    Encodes the key values of the last row of a page into an opaque cursor
+    """
+    payload = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    """
+    Decodes an opaque cursor back into the list of key values it was built from
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError):
+        raise ValidationError({ "message": "Invalid cursor" })
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValidationError({ "message": "Invalid cursor" })
+    return values
+
+def get_plan_rows(queryset):
+    """
+    Returns the number of rows the planner expects the queryset to return
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def estimate_product_count(queryset=None):
+    """
+    Returns the planner estimate of the products matching the queryset instead of a full COUNT(*).
+    Without filters it is the row estimate of the product table, with filters the
+    row estimate of the query plan. Small or never analyzed tables fall back to an exact count.
+    """
+    filtered = queryset is not None and queryset.query.has_filters()
+    if connection.vendor == "postgresql":
+        if filtered:
+            estimate = get_plan_rows(queryset)
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [Product._meta.db_table]
+                )
+                row = cursor.fetchone()
+            estimate = row[0] if row else -1
+        if estimate >= EXACT_COUNT_THRESHOLD:
+            return estimate
+    return queryset.count() if filtered else Product.objects.count()
+
+async def aestimate_product_count(queryset=None):
+    """
+    Async version of estimate_product_count, the planner estimate is read
+    with a raw cursor, which the async ORM doesn't have
+    """
+    return await sync_to_async(estimate_product_count)(queryset)
+
+class ProductCursorPagination(BasePagination):
+    """
+    Keyset pagination for products. Each page is fetched with a range condition
+    on an indexed key instead of an OFFSET, so every page costs the same.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = DEFAULT_PAGE_SIZE
+    max_page_size = MAX_PAGE_SIZE
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            raise ValidationError({ "message": "page_size must be a positive integer" })
+        if page_size < 1:
+            raise ValidationError({ "message": "page_size must be a positive integer" })
+        return min(page_size, self.max_page_size)
+
+    def get_key_fields(self, ordering):
+        """
+        Returns the ordering field followed by the primary key as tie breaker
+        """
+        field = ordering.lstrip("-")
+        return [field] if field == "sku" else [field, "sku"]
+
+    def get_query_fields(self, fields, ordering):
+        """
+        Appends the key fields the cursor is built from to the requested fields
+        """
+        return list(fields) + [field for field in self.get_key_fields(ordering) if field not in fields]
+
+    def get_cursor_filter(self, key_fields, values, descending):
+        """
+        Builds the condition that selects the rows after the cursor.
+        The leading bound on the first key lets the database start an index range scan.
+        """
+        lookup = "lt" if descending else "gt"
+        first_field, first_value = key_fields[0], values[0]
+        if len(key_fields) == 1:
+            return Q(**{f"{first_field}__{lookup}": first_value})
+        second_field, second_value = key_fields[1], values[1]
+        return Q(**{f"{first_field}__{lookup}e": first_value}) & (
+            Q(**{f"{first_field}__{lookup}": first_value}) |
+            Q(**{first_field: first_value, f"{second_field}__{lookup}": second_value})
+        )
+
+    def get_page_queryset(self, queryset, request, ordering="sku"):
+        """
+        Returns the ordered and sliced queryset for the requested page.
+        One extra row is fetched to know if there is a next page.
+        """
+        self.page_size_value = self.get_page_size(request)
+        descending = ordering.startswith("-")
+        self.key_fields = self.get_key_fields(ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(self.key_fields):
+                raise ValidationError({ "message": "Invalid cursor" })
+            try:
+                queryset = queryset.filter(self.get_cursor_filter(self.key_fields, values, descending))
+            except (DjangoValidationError, ValueError):
+                raise ValidationError({ "message": "Invalid cursor" })
+
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(*[f"{prefix}{field}" for field in self.key_fields])
+        return queryset[:self.page_size_value + 1]
+
+    def paginate_queryset(self, queryset, request, view=None, ordering="sku"):
+        self.request = request
+        self.queryset = queryset
+        return self.get_page_rows(list(self.get_page_queryset(queryset, request, ordering)))
+
+    async def apaginate_queryset(self, queryset, request, view=None, ordering="sku"):
+        """
+        Async version of paginate_queryset, the page is read with the async ORM
+        """
+        self.request = request
+        self.queryset = queryset
+        return self.get_page_rows([row async for row in self.get_page_queryset(queryset, request, ordering)])
+
+    def get_page_rows(self, rows):
+        """
+        Drops the extra row of the page and builds the next cursor from the last row
+        """
+        self.next_cursor = None
+        if len(rows) > self.page_size_value:
+            rows = rows[:self.page_size_value]
+            last = rows[-1]
+            self.next_cursor = encode_cursor([getattr(last, field) for field in self.key_fields])
+        return rows
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "estimated_total": estimate_product_count(self.queryset),
+            "results": data,
+        })
+
+    async def aget_paginated_data(self, data):
+        """
+        Async version of get_paginated_response, returns the body of the page
+        """
+        return {
+            "next": self.get_next_link(),
+            "estimated_total": await aestimate_product_count(self.queryset),
+            "results": data,
+        }
+
+
+class ProductSearchPagination(ProductCursorPagination):
+    """
+    Keyset pagination for search results ordered by rank. The catalog estimate
+    does not apply to a subset of products so it is left out of the response.
+    """
+    page_size = 20
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+
+class AuditLogPagination(ProductCursorPagination):
+    """
+    Keyset pagination for the audit log, newest entries first. The id alone
+    is unique, so it is the only key of the cursor.
+    """
+    def get_key_fields(self, ordering):
+        return ["id"]
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
@@ -0,0 +1,76 @@
+import threading
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from api.models import RecipientsVersion
+from api.models.notification_models import RECIPIENTS_VERSION_ID
+
+User = get_user_model()
+
+def get_recipients_queryset():
+    """
+    Emails of the active users with an email, read from the
+    auth_user_recipient_email_idx partial index
+    """
+    return (
+        User.objects.filter(is_active=True)
+        .exclude(email="")
+        .order_by("email")
+        .values_list("email", flat=True)
+        .distinct()
+    )
+
+class RecipientRegistry:
+    """
+    Keeps the emails notified of catalog changes in memory, so sending a
+    notification doesn't read the users table.
+
+    The list is read again after invalidate() or once it is older than
+    NOTIFICATION_RECIPIENTS_CACHE_TIMEOUT seconds. invalidate() also bumps the
+    recipients version row, which every get() reads by primary key, so the
+    other processes, like the notification worker, drop their copy too.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._emails = None
+        self._version = None
+        self._loaded_at = 0.0
+
+    def _shared_version(self):
+        return RecipientsVersion.objects.filter(pk=RECIPIENTS_VERSION_ID).values_list("version", flat=True).first()
+
+    def get(self):
+        version = self._shared_version()
+        with self._lock:
+            age = time.monotonic() - self._loaded_at
+            if self._emails is not None and self._version == version \
+                    and age < settings.NOTIFICATION_RECIPIENTS_CACHE_TIMEOUT:
+                return self._emails
+        emails = list(get_recipients_queryset())
+        with self._lock:
+            self._emails = emails
+            self._version = version
+            self._loaded_at = time.monotonic()
+        return emails
+
+    def invalidate(self):
+        with self._lock:
+            self._emails = None
+        updated = RecipientsVersion.objects.filter(pk=RECIPIENTS_VERSION_ID).update(version=F("version") + 1)
+        if not updated:
+            RecipientsVersion.objects.get_or_create(pk=RECIPIENTS_VERSION_ID, defaults={"version": 1})
+
+recipient_registry = RecipientRegistry()
+
+def get_recipients():
+    """
+    Emails of the users notified of catalog changes
+    """
+    return recipient_registry.get()
+
+def invalidate_recipients():
+    """
+    Drops the cached recipients, called after a user is written
+    """
+    recipient_registry.invalidate()
@@ -0,0 +1,34 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from rest_framework.exceptions import ValidationError
+from api.models.product_models import SEARCH_CONFIG
+
+SEARCH_MODES = ["rank", "brand"]
+DEFAULT_SEARCH_MODE = "rank"
+MAX_QUERY_LENGTH = 255
+# Added to the text rank of products whose brand is exactly the searched text
+BRAND_MATCH_BOOST = 1.0
+
+def rank_products(queryset, text, mode=DEFAULT_SEARCH_MODE):
+    """
+    Filters the products matching the text through the GIN index of the search vector
+    and annotates their `rank`. The rank is cast to double precision so the value
+    sent back in pagination cursors compares exactly against the database.
+    """
+    text = (text or "").strip()
+    if not text:
+        raise ValidationError({ "message": "q is required" })
+    if len(text) > MAX_QUERY_LENGTH:
+        raise ValidationError({ "message": f"q can't be longer than {MAX_QUERY_LENGTH} characters" })
+    if mode not in SEARCH_MODES:
+        raise ValidationError({ "message": f"mode must be one of {', '.join(SEARCH_MODES)}" })
+
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+    rank = SearchRank(F("search_vector"), query)
+    if mode == "brand":
+        rank = rank + Case(
+            When(brand__iexact=text, then=Value(BRAND_MATCH_BOOST)),
+            default=Value(0.0),
+        )
+    return queryset.filter(search_vector=query).annotate(rank=Cast(rank, FloatField()))
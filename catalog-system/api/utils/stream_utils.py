@@ -0,0 +1,82 @@
+import json
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+from api.serializers import PRODUCT_FIELDS, iter_product_representations
+from api.utils.async_utils import aiter_sync
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Rows fetched from the server side cursor per round trip
+STREAM_CHUNK_SIZE = 2000
+# Bytes buffered before a chunk is written to the client
+STREAM_BUFFER_SIZE = 64 * 1024
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders newline delimited JSON. Streamed responses write their own rows,
+    this renderer is used for errors returned by views that negotiate NDJSON.
+    """
+    media_type = NDJSON_MEDIA_TYPE
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return (json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")) + "\n").encode()
+
+def wants_stream(request):
+    """
+    The client asks for a stream with `?stream=1` or by negotiating NDJSON
+    """
+    if getattr(request, "accepted_renderer", None) is not None and request.accepted_renderer.format == "ndjson":
+        return True
+    return request.query_params.get("stream", "").lower() in ("1", "true")
+
+def buffered(chunks, buffer_size=STREAM_BUFFER_SIZE):
+    """
+    Joins small string chunks into blocks of about buffer_size bytes
+    """
+    buffer, size = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+def iter_product_rows(queryset, fields=PRODUCT_FIELDS, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Iterates the representation of each product read as plain tuples through
+    a server side cursor, so no model instance is built per row
+    """
+    rows = queryset.order_by("sku").values_list(*fields).iterator(chunk_size=chunk_size)
+    return iter_product_representations(rows, fields)
+
+def iter_ndjson(rows):
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+def iter_json_array(rows):
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    separator = "["
+    for row in rows:
+        yield separator + encoder.encode(row)
+        separator = ","
+    yield "[]" if separator == "[" else "]"
+
+def stream_products_response(queryset, fields=PRODUCT_FIELDS, ndjson=False, asgi=False):
+    """
+    Streams every product of the queryset, keeping worker memory flat
+    regardless of the size of the catalog. Under ASGI the chunks are read
+    through an async iterator, which the server sends as they're read.
+    """
+    rows = iter_product_rows(queryset, fields)
+    chunks = buffered(iter_ndjson(rows) if ndjson else iter_json_array(rows))
+    return StreamingHttpResponse(
+        aiter_sync(chunks) if asgi else chunks,
+        content_type=NDJSON_MEDIA_TYPE if ndjson else "application/json"
+    )
@@ -0,0 +1,333 @@
+import hashlib
+import hmac
+import http.client
+import json
+import logging
+import random
+import secrets
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+from urllib.parse import urlsplit
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, Max, Min, OuterRef
+from django.utils import timezone
+from api.models import WebhookEvent, WebhookSubscription
+from api.serializers.product_serializers import price_to_representation
+from api.utils.changes_utils import get_changes_horizon
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Catalog-Signature"
+USER_AGENT = "catalog-system-webhooks"
+# Events written per INSERT
+EVENT_BATCH_SIZE = 1000
+# Characters of the last error kept on a subscription
+MAX_ERROR_LENGTH = 1000
+EVENT_FIELDS = ["id", "action", "sku", "name", "price", "brand", "created_at"]
+
+def webhook_values(product):
+    """
+    (sku, name, price, brand) of a product instance, as taken by record_webhook_events
+    """
+    return product.sku, product.name, product.price, product.brand
+
+def record_webhook_events(changes):
+    """
+    Writes the events of product changes, given as (action, sku, name, price,
+    brand). Called inside the transaction of the change, so only committed
+    changes are delivered. Nothing is written without active subscriptions.
+    """
+    if not changes or not WebhookSubscription.objects.filter(is_active=True).exists():
+        return []
+    now = timezone.now()
+    return WebhookEvent.objects.bulk_create([
+        WebhookEvent(action=action, sku=sku, name=name, price=price, brand=brand, created_at=now)
+        for action, sku, name, price, brand in changes
+    ], batch_size=EVENT_BATCH_SIZE)
+
+def create_webhook_subscription(url):
+    """
+    Subscribes the url to the events written from now on
+    """
+    last = WebhookEvent.objects.aggregate(last=Max("id"))["last"]
+    return WebhookSubscription.objects.create(url=url, secret=secrets.token_hex(32), cursor=last or 0)
+
+def sign_webhook(secret, timestamp, body):
+    """
+    Value of the signature header: the HMAC-SHA256 of "<timestamp>.<body>"
+    with the secret of the subscription
+    """
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+def event_to_representation(row):
+    event_id, action, sku, name, price, brand, created_at = row
+    return {
+        "id": event_id,
+        "action": action,
+        "sku": str(sku),
+        "name": name,
+        "price": price_to_representation(price),
+        "brand": brand,
+        "created_at": created_at.isoformat(),
+    }
+
+def get_webhook_retry_delay(failures):
+    """
+    Exponential backoff with jitter after the given number of failed deliveries
+    """
+    delay = min(
+        settings.WEBHOOK_RETRY_BASE_DELAY * 2 ** (failures - 1),
+        settings.WEBHOOK_RETRY_MAX_DELAY
+    )
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+def claim_webhook_subscriptions(limit, horizon, now=None):
+    """
+    Leases up to limit due subscriptions with events to deliver. SKIP LOCKED
+    lets several workers claim at once, and the lease makes the subscription
+    due again if the worker dies during the delivery.
+    """
+    now = now or timezone.now()
+    pending = WebhookEvent.objects.filter(id__gt=OuterRef("cursor"), created_at__lt=horizon)
+    with transaction.atomic():
+        subscriptions = list(
+            WebhookSubscription.objects.select_for_update(skip_locked=True)
+            .filter(Exists(pending), is_active=True, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:limit]
+        )
+        if subscriptions:
+            WebhookSubscription.objects.filter(id__in=[subscription.id for subscription in subscriptions]).update(
+                next_attempt_at=now + timedelta(seconds=settings.WEBHOOK_LEASE_SECONDS)
+            )
+    return subscriptions
+
+def get_webhook_events(cursor, horizon, limit):
+    """
+    Returns the events after the cursor in the order they were written
+    """
+    rows = (
+        WebhookEvent.objects.filter(id__gt=cursor, created_at__lt=horizon)
+        .order_by("id")
+        .values_list(*EVENT_FIELDS)[:limit]
+    )
+    return [event_to_representation(row) for row in rows]
+
+def complete_webhook_deliveries(subscription_ids, cursor, now=None):
+    """
+    Moves the subscriptions that received the events up to the cursor
+    """
+    now = now or timezone.now()
+    WebhookSubscription.objects.filter(id__in=subscription_ids).update(
+        cursor=cursor, failures=0, next_attempt_at=now, last_delivered_at=now, last_error=""
+    )
+
+def fail_webhook_delivery(subscription, error, now=None):
+    """
+    Schedules the next delivery of the subscription with backoff, the
+    events are kept until it succeeds
+    """
+    now = now or timezone.now()
+    failures = subscription.failures + 1
+    WebhookSubscription.objects.filter(id=subscription.id).update(
+        failures=failures,
+        next_attempt_at=now + get_webhook_retry_delay(failures),
+        last_error=str(error)[:MAX_ERROR_LENGTH],
+    )
+
+def prune_webhook_events(horizon):
+    """
+    Deletes the events every active subscription has received
+    """
+    oldest = WebhookSubscription.objects.filter(is_active=True).aggregate(cursor=Min("cursor"))["cursor"]
+    if oldest is None:
+        return WebhookEvent.objects.filter(created_at__lt=horizon).delete()[0]
+    return WebhookEvent.objects.filter(id__lte=oldest).delete()[0]
+
+class WebhookDeliveryError(Exception):
+    pass
+
+class WebhookConnectionPool:
+    """
+    Keeps one keep-alive HTTP connection per endpoint and delivery thread,
+    so deliveries to the same endpoint reuse it instead of connecting again
+    """
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    def _connections(self):
+        if not hasattr(self._local, "connections"):
+            self._local.connections = {}
+        return self._local.connections
+
+    def _get(self, scheme, netloc):
+        connections = self._connections()
+        if (scheme, netloc) not in connections:
+            connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            connections[scheme, netloc] = connection_class(netloc, timeout=settings.WEBHOOK_TIMEOUT)
+        return connections[scheme, netloc]
+
+    def _discard(self, scheme, netloc):
+        connection = self._connections().pop((scheme, netloc), None)
+        if connection is not None:
+            connection.close()
+
+    def post(self, url, body, headers):
+        """
+        Sends the request and returns the response status
+        """
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        while True:
+            connection = self._get(parts.scheme, parts.netloc)
+            reused = connection.sock is not None
+            with self._lock:
+                self.requests += 1
+                self.connections += not reused
+            try:
+                connection.request("POST", path, body, headers)
+                response = connection.getresponse()
+                # The body is read so the connection can take the next request
+                response.read()
+                return response.status
+            except ConnectionError:
+                self._discard(parts.scheme, parts.netloc)
+                # The endpoint closed an idle connection, sent again over a new one
+                if not reused:
+                    raise
+            except Exception:
+                self._discard(parts.scheme, parts.netloc)
+                raise
+
+    def snapshot(self):
+        with self._lock:
+            return {"requests": self.requests, "connections": self.connections}
+
+def encode_webhook_events(events):
+    return json.dumps({"events": events}, separators=(",", ":")).encode()
+
+def deliver_webhook(pool, url, secret, body):
+    """
+    Posts the encoded batch of events to the endpoint, signed with its
+    secret. Raises WebhookDeliveryError when the endpoint doesn't answer
+    with a 2xx.
+    """
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": USER_AGENT,
+        SIGNATURE_HEADER: sign_webhook(secret, int(time.time()), body),
+    }
+    status = pool.post(url, body, headers)
+    if not 200 <= status < 300:
+        raise WebhookDeliveryError(f"Endpoint answered with HTTP {status}")
+
+class WebhookStats:
+    """
+    Counters of the webhook worker in this process
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.deliveries = 0
+            self.events = 0
+            self.failures = 0
+
+    def record(self, events, failed=False):
+        with self._lock:
+            if failed:
+                self.failures += 1
+            else:
+                self.deliveries += 1
+                self.events += events
+
+    def snapshot(self):
+        with self._lock:
+            return {"deliveries": self.deliveries, "events": self.events, "failures": self.failures}
+
+class WebhookDispatcher:
+    """
+    Delivers the events of several subscriptions at once from a thread pool.
+    Subscriptions are claimed as threads free up, so a slow endpoint only
+    holds its own thread while the others keep being delivered. The threads
+    only do HTTP, the database is read and written from the caller thread.
+
+    Subscriptions at the same cursor get the same batch, so it's read and
+    encoded once however many endpoints it fans out to.
+    """
+    def __init__(self, concurrency, batch_size):
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.pool = WebhookConnectionPool()
+        self.stats = WebhookStats()
+        self._executor = ThreadPoolExecutor(concurrency, thread_name_prefix="webhook-delivery")
+        self._in_flight = {}
+
+    @property
+    def busy(self):
+        return bool(self._in_flight)
+
+    def dispatch(self):
+        """
+        Starts the delivery of the due subscriptions that fit in the free
+        threads and returns how many were started
+        """
+        free = self.concurrency - len(self._in_flight)
+        if free <= 0:
+            return 0
+        horizon = get_changes_horizon()
+        batches = {}
+        started = 0
+        for subscription in claim_webhook_subscriptions(free, horizon):
+            if subscription.cursor not in batches:
+                events = get_webhook_events(subscription.cursor, horizon, self.batch_size)
+                batches[subscription.cursor] = events and (events[-1]["id"], len(events), encode_webhook_events(events))
+            if not batches[subscription.cursor]:
+                # The events were pruned after the claim
+                WebhookSubscription.objects.filter(id=subscription.id).update(next_attempt_at=timezone.now())
+                continue
+            cursor, count, body = batches[subscription.cursor]
+            future = self._executor.submit(deliver_webhook, self.pool, subscription.url, subscription.secret, body)
+            self._in_flight[future] = (subscription, cursor, count)
+            started += 1
+        return started
+
+    def collect(self, timeout=None):
+        """
+        Waits up to timeout seconds for a delivery to finish, records the
+        finished ones and returns how many finished
+        """
+        if not self._in_flight:
+            return 0
+        done, _ = wait(self._in_flight, timeout, return_when=FIRST_COMPLETED)
+        delivered = {}
+        for future in done:
+            subscription, cursor, count = self._in_flight.pop(future)
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning("Delivering webhook %s to %s failed: %s", subscription.id, subscription.url, e)
+                fail_webhook_delivery(subscription, e)
+                self.stats.record(count, failed=True)
+            else:
+                delivered.setdefault(cursor, []).append(subscription.id)
+                self.stats.record(count)
+        for cursor, subscription_ids in delivered.items():
+            complete_webhook_deliveries(subscription_ids, cursor)
+        return len(done)
+
+    def close(self):
+        """
+        Waits for the deliveries in flight and stops the threads
+        """
+        while self._in_flight:
+            self.collect()
+        self._executor.shutdown()
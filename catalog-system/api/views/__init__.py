@@ -1,2 +1,3 @@
 from .product_views import *
-from .user_views import *
\ No newline at end of file
+from .user_views import *
+from .webhook_views import *
@@ -1,12 +1,69 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import condition, require_GET
 from rest_framework import serializers
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
-from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample, inline_serializer
-from api.models import Product
-from api.serializers import ProductSerializer
-from api.utils import notify_via_email
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample, OpenApiParameter, inline_serializer
+from api.models import Product, ProductAuditEntry
+from api.serializers import ProductAuditEntrySerializer, ProductBulkDeleteSerializer, ProductSerializer, ProductUpsertSerializer, PRODUCT_FIELDS, product_rows_to_representation
+from api.utils import (
+    AuditLogPagination,
+    EVENT_STREAM_MEDIA_TYPE,
+    ProductCursorPagination,
+    ProductSearchPagination,
+    NDJSONRenderer,
+    acache_product_response,
+    acount_revalidated_views,
+    aget_cached_product,
+    async_read_view,
+    audit_values,
+    bump_catalog_version,
+    cache_product_response,
+    count_revalidated_views,
+    create_products,
+    delete_products,
+    enqueue_notification,
+    export_products_response,
+    filter_audit_entries,
+    catalog_etag,
+    catalog_last_modified,
+    filter_products,
+    get_bulk_items,
+    get_cached_product,
+    get_changes_limit,
+    get_changes_since,
+    get_export_format,
+    get_last_event_key,
+    get_popular_limit,
+    get_popular_products,
+    get_popular_window,
+    get_product_changes,
+    get_product_ordering,
+    is_asgi_request,
+    get_sparse_fields,
+    iter_product_events,
+    prefetch_catalog_version,
+    products_to_representation,
+    rank_products,
+    record_product_changes,
+    record_product_view,
+    record_webhook_events,
+    render_response,
+    schema_from,
+    stream_products_response,
+    tombstone_products,
+    upsert_products,
+    validate_bulk_products,
+    wants_stream,
+    webhook_values,
+)
 
 ERROR_SCHEMA = {
     "type": "object",
@@ -15,26 +72,428 @@ ERROR_SCHEMA = {
     }
 }
 
+NOT_MODIFIED_DESCRIPTION = (
+    "Returned when the `If-None-Match` or `If-Modified-Since` headers match the current catalog version. "
+    "Product view counters don't change the version"
+)
+
+FIELDS_PARAMETER = OpenApiParameter(
+    "fields",
+    str,
+    many=True,
+    explode=False,
+    enum=PRODUCT_FIELDS,
+    description="Comma separated list of the product fields to return, e.g. `sku,name,price` (default all fields)"
+)
+
 @extend_schema(
+    operation_id="products_list",
     tags=["Products"],
     summary="Get all products",
-    description="Gets all the available products from the catalog",
+    description=(
+        "Gets the available products from the catalog one page at a time. Use the `next` link to fetch the following page. "
+        "Send `stream=1` to receive the whole filtered catalog as a streamed JSON array, "
+        "or `Accept: application/x-ndjson` to receive it as newline delimited JSON"
+    ),
     auth=[],
+    parameters=[
+        OpenApiParameter("stream", bool, description="Stream every matching product instead of one page"),
+        FIELDS_PARAMETER,
+        OpenApiParameter("brand", str, many=True, description="Only products of this brand. Repeat the param or separate brands with commas to match any of them"),
+        OpenApiParameter("min_price", float, description="Only products with a price greater than or equal to this value"),
+        OpenApiParameter("max_price", float, description="Only products with a price lower than or equal to this value"),
+        OpenApiParameter("min_views", int, description="Only products with at least this number of views"),
+        OpenApiParameter(
+            "ordering",
+            str,
+            enum=["sku", "-sku", "price", "-price", "name", "-name", "views", "-views"],
+            description="Field used to sort the products, prefix it with `-` for descending order (default sku)"
+        ),
+        OpenApiParameter("cursor", str, description="Opaque cursor taken from the `next` link of the previous page"),
+        OpenApiParameter("page_size", int, description="Number of products per page (default 50, max 500)"),
+    ],
     responses={
-        200: ProductSerializer(many=True),
+        200: inline_serializer(
+            name="ProductPage",
+            fields={
+                "next": serializers.URLField(allow_null=True),
+                "estimated_total": serializers.IntegerField(
+                    help_text="Planner estimate of the products matching the filters, exact below 1000 products"
+                ),
+                "results": ProductSerializer(many=True)
+            }
+        ),
+        304: OpenApiResponse(description=NOT_MODIFIED_DESCRIPTION),
+        400: OpenApiResponse(response=ERROR_SCHEMA),
         500: OpenApiResponse(response=ERROR_SCHEMA)
     }
 )
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
+@cache_product_response
 @api_view(["GET"])
 @permission_classes([AllowAny])
+@renderer_classes([JSONRenderer, BrowsableAPIRenderer, NDJSONRenderer])
 def get_products(request):
     """
-    Gets products from data base
+    Gets a page of products from data base, or streams all of them
+    """
+    try:
+        products = filter_products(Product.objects.all(), request.query_params)
+        fields = get_sparse_fields(request.query_params, PRODUCT_FIELDS) or PRODUCT_FIELDS
+        if wants_stream(request):
+            return stream_products_response(
+                products, fields, ndjson=request.accepted_renderer.format == "ndjson", asgi=is_asgi_request(request)
+            )
+        ordering = get_product_ordering(request.query_params)
+        paginator = ProductCursorPagination()
+        rows = products.values_list(*paginator.get_query_fields(fields, ordering), named=True)
+        page = paginator.paginate_queryset(rows, request, ordering=ordering)
+        return paginator.get_paginated_response(product_rows_to_representation(page, fields))
+    except ValidationError as e:
+        return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            { "message": e },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@async_read_view(get_products, fallback=wants_stream)
+@prefetch_catalog_version
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
+@acache_product_response
+async def aget_products(request):
+    """
+    Gets a page of products from data base with the async ORM, streams are served by get_products
+    """
+    try:
+        products = filter_products(Product.objects.all(), request.query_params)
+        fields = get_sparse_fields(request.query_params, PRODUCT_FIELDS) or PRODUCT_FIELDS
+        ordering = get_product_ordering(request.query_params)
+        paginator = ProductCursorPagination()
+        rows = products.values_list(*paginator.get_query_fields(fields, ordering), named=True)
+        page = await paginator.apaginate_queryset(rows, request, ordering=ordering)
+        data = await paginator.aget_paginated_data(product_rows_to_representation(page, fields))
+        return render_response(request, data)
+    except ValidationError as e:
+        return render_response(request, e.detail, status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return render_response(request, { "message": str(e) }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@extend_schema(
+    tags=["Products"],
+    summary="Search products",
+    description="Full text search over the name and brand of the products, ordered by relevance. Use the `next` link to fetch the following page",
+    auth=[],
+    parameters=[
+        OpenApiParameter("q", str, required=True, description="Text to search. Supports quoted phrases, `or` and `-` to exclude words"),
+        OpenApiParameter(
+            "mode",
+            str,
+            enum=["rank", "brand"],
+            description="`rank` orders by text relevance, `brand` also boosts products whose brand is exactly the searched text (default rank)"
+        ),
+        OpenApiParameter("cursor", str, description="Opaque cursor taken from the `next` link of the previous page"),
+        OpenApiParameter("page_size", int, description="Number of products per page (default 20, max 500)"),
+        FIELDS_PARAMETER,
+    ],
+    responses={
+        200: inline_serializer(
+            name="ProductSearchPage",
+            fields={
+                "next": serializers.URLField(allow_null=True),
+                "results": ProductSerializer(many=True)
+            }
+        ),
+        400: OpenApiResponse(response=ERROR_SCHEMA),
+        500: OpenApiResponse(response=ERROR_SCHEMA)
+    }
+)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def search_products(request):
+    """
+    Search products by name and brand in data base
+    """
+    try:
+        products = rank_products(
+            Product.objects.all(),
+            request.query_params.get("q"),
+            request.query_params.get("mode", "rank")
+        )
+        fields = get_sparse_fields(request.query_params, PRODUCT_FIELDS) or PRODUCT_FIELDS
+        paginator = ProductSearchPagination()
+        rows = products.values_list(*paginator.get_query_fields(fields, "-rank"), named=True)
+        page = paginator.paginate_queryset(rows, request, ordering="-rank")
+        return paginator.get_paginated_response(product_rows_to_representation(page, fields))
+    except ValidationError as e:
+        return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            { "message": e },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@extend_schema(
+    tags=["Products"],
+    summary="Export products",
+    description=(
+        "Streams a snapshot of the products as a CSV or NDJSON file, optionally gzipped, in sku order. "
+        "Accepts the same filters as the product list. You need to be authenticated and be an Admin to use this endpoint"
+    ),
+    parameters=[
+        OpenApiParameter("file_format", str, enum=["csv", "ndjson"], description="Format of the file (default csv)"),
+        OpenApiParameter("gzip", bool, description="Compress the file with gzip"),
+        OpenApiParameter("brand", str, many=True, description="Only products of this brand. Repeat the param or separate brands with commas to match any of them"),
+        OpenApiParameter("min_price", float, description="Only products with a price greater than or equal to this value"),
+        OpenApiParameter("max_price", float, description="Only products with a price lower than or equal to this value"),
+        OpenApiParameter("min_views", int, description="Only products with at least this number of views"),
+    ],
+    responses={
+        (200, "text/csv"): OpenApiTypes.BINARY,
+        (200, "application/x-ndjson"): OpenApiTypes.BINARY,
+        (200, "application/gzip"): OpenApiTypes.BINARY,
+        400: OpenApiResponse(response=ERROR_SCHEMA),
+        500: OpenApiResponse(response=ERROR_SCHEMA)
+    }
+)
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def export_products(request):
+    """
+    Stream every product from data base as a file
+    """
+    try:
+        products = filter_products(Product.objects.all(), request.query_params)
+        export_format = get_export_format(request.query_params)
+        gzip = request.query_params.get("gzip", "").lower() in ("1", "true")
+        return export_products_response(products, export_format, gzip, asgi=is_asgi_request(request))
+    except ValidationError as e:
+        return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            { "message": e },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@extend_schema(
+    tags=["Products"],
+    summary="Get the most viewed products",
+    description="Gets the products with the most views during the last hours, refreshed about every minute",
+    auth=[],
+    parameters=[
+        OpenApiParameter("window", str, enum=["1h", "24h", "7d"], description="Time window of the views, including the current hour (default 24h)"),
+        OpenApiParameter("limit", int, description="Number of products to return (default 20, max 100)"),
+    ],
+    responses={
+        200: inline_serializer(
+            name="PopularProducts",
+            fields={
+                "window": serializers.CharField(),
+                "results": inline_serializer(
+                    name="PopularProduct",
+                    fields={
+                        "sku": serializers.UUIDField(),
+                        "name": serializers.CharField(),
+                        "price": serializers.DecimalField(max_digits=10, decimal_places=2),
+                        "brand": serializers.CharField(),
+                        "views": serializers.IntegerField(),
+                        "updated_at": serializers.DateTimeField(),
+                        "window_views": serializers.IntegerField(),
+                    },
+                    many=True
+                )
+            }
+        ),
+        400: OpenApiResponse(response=ERROR_SCHEMA),
+        500: OpenApiResponse(response=ERROR_SCHEMA)
+    }
+)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def get_popular(request):
+    """
+    Get the most viewed products of a time window
     """
     try:
-        products = Product.objects.all()
-        serializer = ProductSerializer(products, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        window = get_popular_window(request.query_params)
+        limit = get_popular_limit(request.query_params)
+        return Response(
+            { "window": window, "results": get_popular_products(window, limit) },
+            status=status.HTTP_200_OK
+        )
+    except ValidationError as e:
+        return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            { "message": e },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@extend_schema(
+    tags=["Products"],
+    summary="Get the product changes since a cursor",
+    description=(
+        "Gets the products inserted, updated or deleted after the `since` cursor, in the order they were written. "
+        "Without `since` it starts from the first change, which returns the whole catalog. "
+        "Store the `next` cursor and send it back as `since` to keep a copy of the catalog current. "
+        "Changes show up a few seconds after they are made and view counters don't count as changes"
+    ),
+    auth=[],
+    parameters=[
+        OpenApiParameter("since", str, description="Cursor returned as `next` by the previous call"),
+        OpenApiParameter("limit", int, description="Number of changes to return (default 100, max 1000)"),
+    ],
+    responses={
+        200: inline_serializer(
+            name="ProductChanges",
+            fields={
+                "next": serializers.CharField(allow_null=True),
+                "has_more": serializers.BooleanField(),
+                "results": inline_serializer(
+                    name="ProductChange",
+                    fields={
+                        "action": serializers.ChoiceField(choices=["upsert", "delete"]),
+                        "sku": serializers.UUIDField(),
+                        "changed_at": serializers.DateTimeField(),
+                        "product": ProductSerializer(required=False),
+                    },
+                    many=True
+                )
+            }
+        ),
+        400: OpenApiResponse(response=ERROR_SCHEMA),
+        500: OpenApiResponse(response=ERROR_SCHEMA)
+    }
+)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def get_changes(request):
+    """
+    Get the products changed after a cursor
+    """
+    try:
+        since = get_changes_since(request.query_params)
+        limit = get_changes_limit(request.query_params)
+        changes, next_cursor, has_more = get_product_changes(since, limit)
+        return Response(
+            { "next": next_cursor, "has_more": has_more, "results": changes },
+            status=status.HTTP_200_OK
+        )
+    except ValidationError as e:
+        return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            { "message": e },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+EVENTS_ONLY_ASGI_MESSAGE = "The event stream is only served by the ASGI server"
+
+@extend_schema(
+    tags=["Products"],
+    summary="Stream product changes",
+    description=(
+        "Streams the changes of the changes feed as server-sent events, from the `Last-Event-ID` header "
+        "or the `since` cursor, or else from now. Each event is named after the action of the change, "
+        "`upsert` or `delete`, its data is the change as returned by `/api/products/changes` and its id is "
+        "the changes feed cursor of the change. Like the feed, changes are coalesced: a product changed "
+        "several times between two reads of the feed gets one event with its latest values, and a product "
+        "created and deleted in between only gets the `delete`. Only served by the ASGI server, on port 3002"
+    ),
+    auth=[],
+    parameters=[
+        OpenApiParameter("since", str, description="Cursor of the changes feed to start from"),
+        OpenApiParameter(
+            "Last-Event-ID",
+            str,
+            OpenApiParameter.HEADER,
+            description="Id of the last event received, sent by `EventSource` when it reconnects"
+        ),
+    ],
+    responses={
+        (200, EVENT_STREAM_MEDIA_TYPE): OpenApiResponse(
+            response=OpenApiTypes.STR,
+            examples=[
+                OpenApiExample(
+                    "Product event example",
+                    value=(
+                        'id: WyIyMDI1LTA5LTA5IDAwOjAwOjAwKzAwOjAwIiwiMTIzIl0\n'
+                        'event: delete\n'
+                        'data: {"action":"delete","sku":"123","changed_at":"2025-09-09T00:00:00Z"}\n\n'
+                    )
+                )
+            ]
+        ),
+        400: OpenApiResponse(response=ERROR_SCHEMA),
+        501: OpenApiResponse(response=ERROR_SCHEMA, description="Returned by the WSGI server")
+    }
+)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def product_events_schema(request):
+    """
+    Schema of get_product_events, an async view DRF can't serve
+    """
+    return Response({ "message": EVENTS_ONLY_ASGI_MESSAGE }, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+@schema_from(product_events_schema)
+@require_GET
+async def get_product_events(request):
+    """
+    Stream the product changes as server-sent events, from the `Last-Event-ID`
+    or `since` cursor or else from now. Only served by the ASGI server.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({ "message": EVENTS_ONLY_ASGI_MESSAGE }, status=status.HTTP_501_NOT_IMPLEMENTED)
+    try:
+        after = get_last_event_key(request)
+    except ValidationError as e:
+        return JsonResponse(e.detail, status=status.HTTP_400_BAD_REQUEST)
+    response = StreamingHttpResponse(iter_product_events(after), content_type=EVENT_STREAM_MEDIA_TYPE)
+    response["Cache-Control"] = "no-cache"
+    # Proxies must not buffer the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+@extend_schema(
+    tags=["Products"],
+    summary="Get the product audit log",
+    description=(
+        "Gets the creates, updates and deletes of products with their values before and after the change "
+        "and the user that made them, newest first. Entries show up about a second after the change. "
+        "You need to be authenticated and be an Admin to use this endpoint"
+    ),
+    parameters=[
+        OpenApiParameter("sku", str, description="Only the changes of this product"),
+        OpenApiParameter("user", int, description="Only the changes made by this user id"),
+        OpenApiParameter("cursor", str, description="Opaque cursor taken from the `next` link of the previous page"),
+        OpenApiParameter("page_size", int, description="Number of entries per page (default 50, max 500)"),
+    ],
+    responses={
+        200: inline_serializer(
+            name="ProductAuditPage",
+            fields={
+                "next": serializers.URLField(allow_null=True),
+                "results": ProductAuditEntrySerializer(many=True)
+            }
+        ),
+        400: OpenApiResponse(response=ERROR_SCHEMA),
+        500: OpenApiResponse(response=ERROR_SCHEMA)
+    }
+)
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def get_product_audit(request):
+    """
+    Get the audit log of products from data base
+    """
+    try:
+        entries = filter_audit_entries(ProductAuditEntry.objects.all(), request.query_params)
+        paginator = AuditLogPagination()
+        page = paginator.paginate_queryset(entries, request, ordering="-id")
+        return paginator.get_paginated_response(ProductAuditEntrySerializer(page, many=True).data)
+    except ValidationError as e:
+        return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             { "message": e },
@@ -82,8 +541,16 @@ def create_product(request):
     try:
         serializer = ProductSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
-            notify_via_email(serializer.instance.sku, serializer.instance.name, getattr(request.user, "email", None), "CREATE")
+            with transaction.atomic():
+                serializer.save()
+                enqueue_notification(
+                    "CREATE",
+                    [(serializer.instance.sku, serializer.instance.name)],
+                    getattr(request.user, "email", None)
+                )
+                record_webhook_events([("CREATE", *webhook_values(serializer.instance))])
+            bump_catalog_version()
+            record_product_changes(request.user, [(serializer.instance.sku, None, audit_values(serializer.instance))])
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
@@ -92,6 +559,170 @@ def create_product(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+BULK_ERRORS_SCHEMA = inline_serializer(
+    name="BulkItemError",
+    fields={
+        "index": serializers.IntegerField(),
+        "errors": serializers.DictField()
+    },
+    many=True
+)
+
+PARTIAL_PARAMETER = OpenApiParameter(
+    "partial",
+    bool,
+    description="Write the valid products and report the errors of the invalid ones instead of rejecting the whole request"
+)
+
+@extend_schema(
+    tags=["Products"],
+    summary="Create many products",
+    description=(
+        "Creates up to 10000 products in one transaction and sends one notification for all of them. "
+        "You need to be authenticated and be an Admin to use this endpoint"
+    ),
+    parameters=[PARTIAL_PARAMETER],
+    request=inline_serializer(
+        name="BulkProductInput",
+        fields={
+            "name": serializers.CharField(),
+            "price": serializers.DecimalField(
+                max_digits=10,
+                decimal_places=2
+            ),
+            "brand": serializers.CharField()
+        },
+        many=True
+    ),
+    examples=[
+        OpenApiExample(
+            "Create products example",
+            value=[
+                {"name": "test_product_1", "price": 100, "brand": "zebrands"},
+                {"name": "test_product_2", "price": 200, "brand": "zebrands"}
+            ],
+            request_only=True
+        )
+    ],
+    responses={
+        201: inline_serializer(
+            name="BulkCreateResult",
+            fields={
+                "created": serializers.IntegerField(),
+                "results": ProductSerializer(many=True),
+                "errors": BULK_ERRORS_SCHEMA
+            }
+        ),
+        400: OpenApiResponse(response=ERROR_SCHEMA),
+        500: OpenApiResponse(response=ERROR_SCHEMA)
+    }
+)
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def bulk_create_products(request):
+    """
+    Create many products in data base
+    """
+    try:
+        items = get_bulk_items(request.data)
+        validated, errors = validate_bulk_products(items)
+        partial = request.query_params.get("partial", "").lower() in ("1", "true")
+        if errors and (not partial or not validated):
+            return Response({ "errors": errors }, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            products = create_products(validated)
+            enqueue_notification(
+                "CREATE",
+                [(product.sku, product.name) for product in products],
+                getattr(request.user, "email", None)
+            )
+            record_webhook_events([("CREATE", *webhook_values(product)) for product in products])
+        bump_catalog_version()
+        record_product_changes(request.user, [(product.sku, None, audit_values(product)) for product in products])
+        return Response(
+            { "created": len(products), "results": products_to_representation(products), "errors": errors },
+            status=status.HTTP_201_CREATED
+        )
+    except ValidationError as e:
+        return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            { "message": e },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@extend_schema(
+    tags=["Products"],
+    summary="Create or update many products",
+    description=(
+        "Creates or updates up to 10000 products identified by their sku in one transaction. "
+        "Products whose name, price and brand didn't change are not written. "
+        "Sends one notification for all the written products. You need to be authenticated and be an Admin to use this endpoint"
+    ),
+    parameters=[PARTIAL_PARAMETER],
+    request=ProductUpsertSerializer(many=True),
+    examples=[
+        OpenApiExample(
+            "Upsert products example",
+            value=[
+                {"sku": "7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10", "name": "test_product_1", "price": 120, "brand": "zebrands"}
+            ],
+            request_only=True
+        )
+    ],
+    responses={
+        200: inline_serializer(
+            name="BulkUpsertResult",
+            fields={
+                "inserted": serializers.IntegerField(),
+                "updated": serializers.IntegerField(),
+                "unchanged": serializers.IntegerField(),
+                "errors": BULK_ERRORS_SCHEMA
+            }
+        ),
+        400: OpenApiResponse(response=ERROR_SCHEMA),
+        500: OpenApiResponse(response=ERROR_SCHEMA)
+    }
+)
+@api_view(["PUT"])
+@permission_classes([IsAdminUser])
+def bulk_upsert_products(request):
+    """
+    Create or update many products in data base based on their sku
+    """
+    try:
+        items = get_bulk_items(request.data)
+        validated, errors = validate_bulk_products(items, ProductUpsertSerializer, unique_field="sku")
+        partial = request.query_params.get("partial", "").lower() in ("1", "true")
+        if errors and (not partial or not validated):
+            return Response({ "errors": errors }, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            counts, products, previous = upsert_products(validated)
+            if products:
+                enqueue_notification(
+                    "UPSERT",
+                    [(product.sku, product.name) for product in products],
+                    getattr(request.user, "email", None)
+                )
+                record_webhook_events([
+                    ("UPDATE" if product.sku in previous else "CREATE", *webhook_values(product))
+                    for product in products
+                ])
+        if products:
+            bump_catalog_version()
+            record_product_changes(request.user, [
+                (product.sku, audit_values(previous[product.sku]) if product.sku in previous else None, audit_values(product))
+                for product in products
+            ])
+        return Response({ **counts, "errors": errors }, status=status.HTTP_200_OK)
+    except ValidationError as e:
+        return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response(
+            { "message": e },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
 @extend_schema(
     tags=["Products"],
     description="Gets one product from the catalog based on the id",
@@ -99,10 +730,13 @@ def create_product(request):
     auth=[],
     responses={
         200: ProductSerializer,        
+        304: OpenApiResponse(description=NOT_MODIFIED_DESCRIPTION),
         404: OpenApiResponse(response=ERROR_SCHEMA),
         500: OpenApiResponse(response=ERROR_SCHEMA)
     }
 )
+@count_revalidated_views
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def get_single_product(request, id):
@@ -110,11 +744,9 @@ def get_single_product(request, id):
     Get one product based on id from database
     """
     try:
-        product = Product.objects.get(sku=id)
-        product.views = product.views + 1
-        product.save()
-        serializer = ProductSerializer(product)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        product = get_cached_product(request, id, lambda: ProductSerializer(Product.objects.get(sku=id)).data)
+        pending_views = record_product_view(product["sku"])
+        return Response({ **product, "views": product["views"] + pending_views }, status=status.HTTP_200_OK)
     except Product.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
@@ -122,6 +754,26 @@ def get_single_product(request, id):
             { "message": e },
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+@async_read_view(get_single_product)
+@acount_revalidated_views
+@prefetch_catalog_version
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
+async def aget_single_product(request, id):
+    """
+    Get one product based on id from database with the async ORM
+    """
+    async def load():
+        return ProductSerializer(await Product.objects.aget(sku=id)).data
+
+    try:
+        product = await aget_cached_product(request, id, load)
+        pending_views = record_product_view(product["sku"])
+        return render_response(request, { **product, "views": product["views"] + pending_views })
+    except Product.DoesNotExist:
+        return render_response(request, status=status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        return render_response(request, { "message": str(e) }, status.HTTP_500_INTERNAL_SERVER_ERROR)
     
 @extend_schema(
     tags=["Products"],
@@ -166,8 +818,17 @@ def update_product(request, id):
         product = Product.objects.get(sku=id)
         serializer = ProductSerializer(product, data=request.data)
         if serializer.is_valid():
-            serializer.save()
-            notify_via_email(serializer.instance.sku, serializer.instance.name, getattr(request.user, "email", None), "UPDATE")
+            before = audit_values(product)
+            with transaction.atomic():
+                serializer.save()
+                enqueue_notification(
+                    "UPDATE",
+                    [(serializer.instance.sku, serializer.instance.name)],
+                    getattr(request.user, "email", None)
+                )
+                record_webhook_events([("UPDATE", *webhook_values(serializer.instance))])
+            bump_catalog_version()
+            record_product_changes(request.user, [(serializer.instance.sku, before, audit_values(serializer.instance))])
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     except Product.DoesNotExist:
@@ -206,8 +867,14 @@ def delete_product(request, id):
         product = Product.objects.get(sku=id)
         product_sku = product.sku
         product_name = product.name
-        product.delete()
-        notify_via_email(product_sku, product_name, getattr(request.user, "email", None), "DELETE")
+        before = audit_values(product)
+        with transaction.atomic():
+            product.delete()
+            tombstone_products([product_sku])
+            enqueue_notification("DELETE", [(product_sku, product_name)], getattr(request.user, "email", None))
+            record_webhook_events([("DELETE", product_sku, product_name, product.price, product.brand)])
+        bump_catalog_version()
+        record_product_changes(request.user, [(product_sku, before, None)])
         return Response(status=status.HTTP_204_NO_CONTENT)
     except Product.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
@@ -216,3 +883,63 @@ def delete_product(request, id):
             { "message": e },
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+@extend_schema(
+    tags=["Products"],
+    summary="Delete many products",
+    description=(
+        "Deletes up to 10000 products by sku, or every product of a brand, in one transaction "
+        "and sends one notification for all of them. You need to be authenticated and an Admin to use this endpoint"
+    ),
+    request=ProductBulkDeleteSerializer,
+    examples=[
+        OpenApiExample(
+            "Delete products by sku example",
+            value={"skus": ["7d1c4c9e-3f4e-4d6b-9a59-2f0f6f0f7a10"]},
+            request_only=True
+        ),
+        OpenApiExample(
+            "Delete products of a brand example",
+            value={"brand": "zebrands"},
+            request_only=True
+        )
+    ],
+    responses={
+        200: inline_serializer(
+            name="BulkDeleteResult",
+            fields={
+                "deleted": serializers.IntegerField()
+            }
+        ),
+        400: OpenApiResponse(response=ERROR_SCHEMA),
+        500: OpenApiResponse(response=ERROR_SCHEMA)
+    }
+)
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def bulk_delete_products(request):
+    """
+    Delete many products from database by sku or brand
+    """
+    try:
+        serializer = ProductBulkDeleteSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            deleted = delete_products(**serializer.validated_data)
+            if deleted:
+                enqueue_notification("DELETE", [(sku, name) for sku, name, *_ in deleted], getattr(request.user, "email", None))
+                record_webhook_events([("DELETE", *values) for values in deleted])
+        if deleted:
+            bump_catalog_version()
+            record_product_changes(request.user, [
+                (sku, audit_values({ "name": name, "price": price, "brand": brand }), None)
+                for sku, name, price, brand in deleted
+            ])
+        return Response({ "deleted": len(deleted) }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response(
+            { "message": e },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
\ No newline at end of file
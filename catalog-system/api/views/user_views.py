@@ -3,8 +3,10 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
-from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
+from rest_framework.exceptions import ValidationError
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample, OpenApiParameter
 from api.serializers import UserInputSerializer, UserSerializer
+from api.utils import get_sparse_fields, invalidate_recipients
 
 User = get_user_model()
 
@@ -19,8 +21,19 @@ ERROR_SCHEMA = {
     tags=["Users"],
     summary="Get all users",
     description="Get all the users in the system",
+    parameters=[
+        OpenApiParameter(
+            "fields",
+            str,
+            many=True,
+            explode=False,
+            enum=UserSerializer.Meta.fields,
+            description="Comma separated list of the user fields to return, e.g. `id,email` (default all fields)"
+        ),
+    ],
     responses={
         200: UserSerializer(many=True),
+        400: OpenApiResponse(response=ERROR_SCHEMA),
         500: OpenApiResponse(response=ERROR_SCHEMA)
     }
 )
@@ -32,8 +45,14 @@ def get_users(request):
     """
     try:
         users = User.objects.all()
-        serializer = UserSerializer(users, many=True)
+        fields = get_sparse_fields(request.query_params, UserSerializer.Meta.fields)
+        if fields is None:
+            serializer = UserSerializer(users, many=True)
+        else:
+            serializer = UserSerializer(users.only(*fields), many=True, fields=fields)
         return Response(serializer.data, status=status.HTTP_200_OK)
+    except ValidationError as e:
+        return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             { "message": e },
@@ -81,6 +100,7 @@ def create_user(request):
         serializer = UserInputSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save()
+            invalidate_recipients()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
@@ -159,6 +179,7 @@ def update_user(request, id):
         serializer = UserInputSerializer(user, data=request.data)
         if serializer.is_valid():
             serializer.save()
+            invalidate_recipients()
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     except User.DoesNotExist:
@@ -201,6 +222,7 @@ def delete_user(request, id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         user.delete()
+        invalidate_recipients()
         return Response(status=status.HTTP_204_NO_CONTENT)
     except User.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,125 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework import status
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
+from api.models import WebhookSubscription
+from api.serializers import WebhookSubscriptionCreatedSerializer, WebhookSubscriptionInputSerializer, WebhookSubscriptionSerializer
+from api.utils import create_webhook_subscription
+
+ERROR_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "error": {"type": "string", "example": "Error Code Message"},
+    }
+}
+
+@extend_schema(
+    tags=["Webhooks"],
+    summary="Get all webhook subscriptions",
+    description=(
+        "Gets the webhook subscriptions with their delivery state. "
+        "You need to be authenticated and an Admin to use this endpoint"
+    ),
+    responses={
+        200: WebhookSubscriptionSerializer(many=True),
+        500: OpenApiResponse(response=ERROR_SCHEMA)
+    }
+)
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def get_webhooks(request):
+    """
+    Get all webhook subscriptions from database
+    """
+    try:
+        subscriptions = WebhookSubscription.objects.order_by("id")
+        serializer = WebhookSubscriptionSerializer(subscriptions, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response(
+            { "message": e },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@extend_schema(
+    tags=["Webhooks"],
+    summary="Create a webhook subscription",
+    description=(
+        "Subscribes an endpoint to the product changes made from now on. The webhook worker posts them in batches "
+        "as `{\"events\": [{\"id\", \"action\", \"sku\", \"name\", \"price\", \"brand\", \"created_at\"}]}` "
+        "in the order they were made, retrying with backoff until the endpoint answers with a 2xx. "
+        "Every request has an `X-Catalog-Signature: t=<timestamp>,v1=<signature>` header, where the signature is "
+        "the hex HMAC-SHA256 of `<timestamp>.<body>` with the secret of the subscription. The secret is only "
+        "returned by this endpoint. An event can be delivered more than once, use its id to skip duplicates. "
+        "You need to be authenticated and an Admin to use this endpoint"
+    ),
+    request=WebhookSubscriptionInputSerializer,
+    examples=[
+        OpenApiExample(
+            "Create webhook example",
+            value={ "url": "https://example.com/catalog/webhook" },
+            request_only=True
+        )
+    ],
+    responses={
+        201: WebhookSubscriptionCreatedSerializer,
+        400: OpenApiResponse(response=ERROR_SCHEMA),
+        500: OpenApiResponse(response=ERROR_SCHEMA)
+    }
+)
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def create_webhook(request):
+    """
+    Create a webhook subscription in the database
+    """
+    try:
+        serializer = WebhookSubscriptionInputSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        subscription = create_webhook_subscription(serializer.validated_data["url"])
+        return Response(WebhookSubscriptionCreatedSerializer(subscription).data, status=status.HTTP_201_CREATED)
+    except Exception as e:
+        return Response(
+            { "message": e },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@extend_schema(
+    tags=["Webhooks"],
+    summary="Delete a webhook subscription",
+    description=(
+        "Deletes a webhook subscription based on the id, its pending events are not delivered. "
+        "You need to be authenticated and an Admin to use this endpoint"
+    ),
+    responses={
+        204: OpenApiResponse(response={
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "example": "No Content"
+                }
+            }
+        }),
+        404: OpenApiResponse(response=ERROR_SCHEMA),
+        500: OpenApiResponse(response=ERROR_SCHEMA)
+    }
+)
+@api_view(["DELETE"])
+@permission_classes([IsAdminUser])
+def delete_webhook(request, id):
+    """
+    Delete a webhook subscription based on id in the database
+    """
+    try:
+        deleted, _ = WebhookSubscription.objects.filter(id=id).delete()
+        if not deleted:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    except Exception as e:
+        return Response(
+            { "message": e },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
@@ -0,0 +1,145 @@
+"""
+Benchmark of notification email delivery: send_mail, which opens an SMTP
+connection per email with every recipient in To, against the delivery
+engine, which reuses one connection and sends BCC chunks.
+
+No database is needed. Emails go to an SMTP sink started by the script on a
+free local port, or to the one given with --host and --port (e.g.
+`python -m smtpd -n -c DebuggingServer 127.0.0.1:1025` on Python < 3.12).
+A local connection costs almost nothing, --connect-delay makes the built-in
+sink wait before its greeting to stand in for the TLS handshake and login
+of a remote provider.
+
+Usage (from the catalog-system folder):
+    uv run python benchmarks/bench_email_delivery.py --emails 100 --recipients 200 --connect-delay 100
+"""
+import argparse
+import os
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "main.settings")
+for variable in ["DB_NAME", "DB_USER", "DB_PASSWORD", "DB_HOST", "DB_PORT"]:
+    os.environ.setdefault(variable, "benchmark")
+
+import django
+
+django.setup()
+
+from django.conf import settings
+from django.core.mail import send_mail
+from api.utils.delivery_utils import EmailDelivery
+
+class SinkStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+        self.recipients = 0
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """
+    Accepts every message and drops it, counting connections, messages and
+    recipients
+    """
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        stats = self.server.stats
+        with stats.lock:
+            stats.connections += 1
+        time.sleep(self.server.connect_delay)
+        self.reply("220 sink ready")
+        recipients = 0
+        for raw in self.rfile:
+            command = raw.decode("latin-1").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 sink")
+            elif command.startswith("RCPT"):
+                recipients += 1
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 end with .")
+                for line in self.rfile:
+                    if line in (b".\r\n", b".\n"):
+                        break
+                with stats.lock:
+                    stats.messages += 1
+                    stats.recipients += recipients
+                recipients = 0
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                # MAIL, RSET and NOOP
+                self.reply("250 OK")
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, connect_delay=0.0):
+        super().__init__(("127.0.0.1", 0), SMTPSinkHandler)
+        self.stats = SinkStats()
+        self.connect_delay = connect_delay
+
+def run(label, send, emails, recipients, sink):
+    before = (sink.stats.connections, sink.stats.messages) if sink else (0, 0)
+    start = time.perf_counter()
+    for index in range(emails):
+        send(f"Catalog change {index}", "Summary of the change", "noreply@test.com", recipients)
+    elapsed = time.perf_counter() - start
+    line = f"{label:<17} {elapsed * 1000:9.1f} ms  {emails / elapsed:9.1f} emails/s  {emails * len(recipients) / elapsed:11,.0f} recipients/s"
+    if sink:
+        connections = sink.stats.connections - before[0]
+        messages = sink.stats.messages - before[1]
+        line += f"  {messages} messages over {connections} connections ({messages / connections:.1f} per connection)"
+    print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=100)
+    parser.add_argument("--recipients", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=settings.EMAIL_BCC_CHUNK_SIZE)
+    parser.add_argument("--host", help="SMTP sink to use instead of the built-in one")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--connect-delay", type=float, default=0.0, help="Milliseconds the built-in sink takes to accept a connection")
+    args = parser.parse_args()
+
+    sink = None
+    if args.host is None:
+        sink = SMTPSink(args.connect_delay / 1000)
+        threading.Thread(target=sink.serve_forever, daemon=True).start()
+        args.host, args.port = sink.server_address
+    settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+    settings.EMAIL_HOST, settings.EMAIL_PORT = args.host, args.port
+    settings.EMAIL_USE_TLS = settings.EMAIL_USE_SSL = False
+    settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ""
+    settings.EMAIL_BCC_CHUNK_SIZE = args.chunk_size
+
+    recipients = [f"user{index}@test.com" for index in range(args.recipients)]
+    delivery = EmailDelivery()
+    print(
+        f"emails: {args.emails}, recipients: {args.recipients}, BCC chunk size: {args.chunk_size}, "
+        f"sink: {args.host}:{args.port}, connect delay: {args.connect_delay} ms"
+    )
+    run("send_mail:", send_mail, args.emails, recipients, sink)
+    run("delivery engine:", delivery.send, args.emails, recipients, sink)
+    delivery.close()
+    stats = delivery.stats.snapshot()
+    print(
+        f"engine stats: {stats['messages']} messages, {stats['connections']} connections, "
+        f"{stats['reconnects']} reconnects, {stats['messages_per_connection']:.1f} messages per connection, "
+        f"{stats['messages_per_second']:.1f} messages/s"
+    )
+    if sink:
+        sink.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark of the notification recipients lookup: loading every User and
+filtering the emails in Python, like notifications used to, against the
+indexed values_list query and the in memory recipient registry.
+
+It needs the database of the DB_* environment variables with the migrations
+applied. Missing benchmark users are inserted and deleted at the end unless
+--keep is given.
+
+Usage (from the catalog-system folder):
+    uv run python benchmarks/bench_notification_recipients.py --users 100000
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "main.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from api.utils.recipient_utils import get_recipients_queryset, recipient_registry
+
+User = get_user_model()
+
+USERNAME_PREFIX = "bench_recipient_"
+INSERT_BATCH_SIZE = 5000
+
+def create_users(count):
+    existing = User.objects.filter(username__startswith=USERNAME_PREFIX).count()
+    for start in range(existing, count, INSERT_BATCH_SIZE):
+        User.objects.bulk_create([
+            User(
+                username=f"{USERNAME_PREFIX}{index}",
+                email=f"{USERNAME_PREFIX}{index}@test.com" if index % 10 else "",
+                # Every tenth user is inactive and every tenth has no email
+                is_active=index % 10 != 5,
+                password="!",
+            )
+            for index in range(start, min(start + INSERT_BATCH_SIZE, count))
+        ])
+    with connection.cursor() as cursor:
+        cursor.execute(f'VACUUM ANALYZE "{User._meta.db_table}"')
+
+def load_users():
+    return [user.email for user in User.objects.all() if user.email]
+
+def load_emails():
+    return list(get_recipients_queryset())
+
+def cached_registry():
+    return recipient_registry.get()
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark users in the database")
+    args = parser.parse_args()
+
+    create_users(args.users)
+    try:
+        plan = "\n".join(f"    {line}" for line in get_recipients_queryset().explain().splitlines())
+        recipient_registry.invalidate()
+        cached_registry()
+
+        users_time = best_time(load_users, args.repeat)
+        emails_time = best_time(load_emails, args.repeat)
+        cached_time = best_time(cached_registry, args.repeat * 100)
+        print(f"users: {User.objects.count()}, recipients: {len(load_emails())}, best of {args.repeat}")
+        print(f"recipients query plan:\n{plan}")
+        print(f"User.objects.all():  {users_time * 1000:9.2f} ms")
+        print(f"values_list query:   {emails_time * 1000:9.2f} ms  {users_time / emails_time:8.1f}x")
+        print(f"cached registry:     {cached_time * 1000:9.4f} ms  {users_time / cached_time:8.0f}x")
+    finally:
+        if not args.keep:
+            User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Benchmark of the product event stream: connects thousands of idle clients
+to `/api/products/events` on one uvicorn worker, changes products and
+measures how long every client takes to receive them and the memory each
+open stream costs.
+
+Then only one slow client, which never reads, and one normal client stay
+connected during a burst of changes. The slow client is closed once its
+buffer fills up, and it reconnects with `Last-Event-ID` to get the events
+it missed, checked for gaps and duplicates.
+
+It needs the database of the DB_* environment variables with the migrations
+applied, the benchmark products are deleted at the end. The server runs
+without the changes feed safety lag, so the latency is the one of the poll
+interval and the fan-out.
+
+Usage (from the catalog-system folder):
+    uv run python benchmarks/bench_product_events.py --clients 2000
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "main.settings")
+
+import django
+
+django.setup()
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from api.models import Product
+
+BRAND = "bench-product-events"
+HOST = "127.0.0.1"
+# Connections opened at once
+CONNECT_BATCH_SIZE = 200
+
+def decode_event_id(event_id):
+    padded = event_id + "=" * (-len(event_id) % 4)
+    return tuple(json.loads(base64.urlsafe_b64decode(padded)))
+
+class Client:
+    """
+    Event stream client over a raw socket. HTTP/1.0 keeps the body free of
+    chunked encoding, so the frames are read as they're sent.
+    """
+    def __init__(self, port, last_event_id=None, read=True, receive_buffer=None):
+        self.port = port
+        self.last_event_id = last_event_id
+        self.read = read
+        self.receive_buffer = receive_buffer
+        self.events = 0
+        self.keys = []
+        self.round = 0
+        self.round_times = []
+        self.closed = asyncio.Event()
+
+    async def connect(self, keep_keys=False):
+        self.keep_keys = keep_keys
+        sock = socket.socket()
+        if self.receive_buffer:
+            # Set before connecting so the window the server sees stays small
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer)
+        sock.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(sock, (HOST, self.port))
+        self.reader, self.writer = await asyncio.open_connection(sock=sock)
+        headers = f"GET /api/products/events HTTP/1.0\r\nHost: {HOST}\r\nAccept: text/event-stream\r\n"
+        if self.last_event_id:
+            headers += f"Last-Event-ID: {self.last_event_id}\r\n"
+        self.writer.write((headers + "\r\n").encode())
+        status = await self.reader.readuntil(b"\r\n\r\n")
+        if not status.startswith(b"HTTP/1.1 200"):
+            raise RuntimeError(status.decode())
+        if self.read:
+            self.task = asyncio.create_task(self.consume())
+
+    async def consume(self):
+        buffer = b""
+        while True:
+            chunk = await self.reader.read(65536)
+            if not chunk:
+                break
+            buffer += chunk
+            end = buffer.rfind(b"\n\n")
+            if end < 0:
+                continue
+            frames, buffer = buffer[:end + 2], buffer[end + 2:]
+            self.events += frames.count(b"\nevent: ")
+            last = frames.rfind(b"id: ")
+            if last >= 0:
+                self.last_event_id = frames[last + 4:frames.index(b"\n", last)].decode()
+            if self.keep_keys:
+                self.keys.extend(
+                    decode_event_id(line[4:].decode()) for line in frames.split(b"\n") if line.startswith(b"id: ")
+                )
+            while self.round < len(ROUND_TARGETS) and self.events >= ROUND_TARGETS[self.round]:
+                self.round_times.append(time.perf_counter())
+                self.round += 1
+        self.closed.set()
+
+    def close(self):
+        self.writer.close()
+
+# Events every client has received at the end of each round
+ROUND_TARGETS = []
+
+def server_status(pid, field):
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith(f"{field}:"):
+            return int(line.split()[1])
+    return 0
+
+def start_server(port, args):
+    env = dict(
+        os.environ,
+        PRODUCT_CHANGES_SAFETY_LAG="0",
+        PRODUCT_EVENTS_POLL_INTERVAL=str(args.poll_interval),
+        PRODUCT_EVENTS_CLIENT_BUFFER=str(args.client_buffer),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main.asgi:application", "--host", HOST, "--port", str(port),
+         "--log-level", "warning", "--backlog", str(args.clients * 2)],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("The server didn't start")
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+def touch_products(skus):
+    Product.objects.filter(sku__in=skus).update(updated_at=timezone.now(), price=Decimal("10.50"))
+
+async def connect_all(clients):
+    for start in range(0, len(clients), CONNECT_BATCH_SIZE):
+        await asyncio.gather(*(client.connect() for client in clients[start:start + CONNECT_BATCH_SIZE]))
+
+async def run(args, server, port):
+    skus = await sync_to_async(lambda: list(Product.objects.filter(brand=BRAND).values_list("sku", flat=True)))()
+
+    # Fan-out to idle clients
+    first = Client(port)
+    await first.connect()
+    rss_one = server_status(server.pid, "VmRSS")
+    clients = [first] + [Client(port) for _ in range(args.clients - 1)]
+    start = time.perf_counter()
+    await connect_all(clients[1:])
+    connect_time = time.perf_counter() - start
+    rss_all = server_status(server.pid, "VmRSS")
+    threads = server_status(server.pid, "Threads")
+
+    latencies, round_starts = [], []
+    for round_index in range(args.rounds):
+        round_skus = skus[round_index * args.round_size % len(skus):][:args.round_size]
+        ROUND_TARGETS.append((ROUND_TARGETS[-1] if ROUND_TARGETS else 0) + len(round_skus))
+        round_starts.append(time.perf_counter())
+        await sync_to_async(touch_products)(round_skus)
+        deadline = time.monotonic() + 30
+        while any(client.round <= round_index for client in clients):
+            if time.monotonic() > deadline:
+                raise RuntimeError("Clients didn't receive every event")
+            await asyncio.sleep(0.01)
+        latencies.extend(client.round_times[round_index] - round_starts[-1] for client in clients)
+    fan_out = time.perf_counter() - round_starts[0]
+    delivered = sum(client.events for client in clients)
+    for client in clients[1:]:
+        client.close()
+    await asyncio.sleep(1)
+
+    # Burst with a slow client, the normal client receives every change of the burst
+    first.keys, first.keep_keys = [], True
+    slow = Client(port, last_event_id=first.last_event_id, read=False, receive_buffer=4096)
+    await slow.connect()
+    for _ in range(args.burst_rounds):
+        await sync_to_async(touch_products)(skus)
+        await asyncio.sleep(args.poll_interval)
+    # Changes of a product made before a poll are read as one
+    received = -1
+    while received != first.events:
+        received = first.events
+        await asyncio.sleep(1)
+    burst = first.keys
+    slow.keep_keys = True
+    slow.task = asyncio.create_task(slow.consume())
+    try:
+        await asyncio.wait_for(slow.closed.wait(), 10)
+        dropped = True
+    except asyncio.TimeoutError:
+        dropped = False
+    received = list(slow.keys)
+    slow.close()
+
+    resumed = Client(port, last_event_id=slow.last_event_id)
+    await resumed.connect(keep_keys=True)
+    deadline = time.monotonic() + 10
+    while not resumed.keys or resumed.keys[-1] < burst[-1]:
+        if time.monotonic() > deadline:
+            break
+        await asyncio.sleep(0.05)
+    keys = received + resumed.keys
+    resumed.close()
+    # Catching up from the database only returns the last change of each product, like the changes feed
+    state, expected = dict((sku, changed_at) for changed_at, sku in keys), dict((sku, changed_at) for changed_at, sku in burst)
+    first.close()
+
+    latencies.sort()
+    print(f"clients: {args.clients}, rounds: {args.rounds} of {args.round_size} changes, poll interval: {args.poll_interval} s")
+    print(f"connect:   {connect_time * 1000:9.1f} ms for {args.clients - 1} streams")
+    print(f"memory:    {(rss_all - rss_one) / max(args.clients - 1, 1):9.1f} KB per open stream "
+          f"({rss_one / 1024:.0f} MB -> {rss_all / 1024:.0f} MB), {threads} server threads")
+    print(f"latency:   p50 {statistics.median(latencies) * 1000:.1f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms "
+          f"from the change to each client")
+    print(f"fan-out:   {delivered:,} events delivered, {delivered / fan_out:,.0f} events/s")
+    print(f"slow client: {'closed' if dropped else 'NOT closed'} after {len(received)} of {len(burst)} burst events "
+          f"(buffer {args.client_buffer}), resumed with Last-Event-ID and got {resumed.events} more")
+    gaps = state != expected or len(set(keys)) != len(keys) or keys != sorted(keys)
+    print(f"resume gaps or duplicates: {'yes' if gaps else 'none'}")
+    if gaps or not dropped:
+        sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--round-size", type=int, default=20, help="Products changed per round")
+    parser.add_argument("--products", type=int, default=4000, help="Products changed by every burst round")
+    parser.add_argument("--burst-rounds", type=int, default=5)
+    parser.add_argument("--poll-interval", type=float, default=0.1)
+    parser.add_argument("--client-buffer", type=int, default=200, help="Events buffered per stream")
+    args = parser.parse_args()
+
+    Product.objects.filter(brand=BRAND).delete()
+    Product.objects.bulk_create([
+        Product(name=f"Event product {index}", price=Decimal("10.00"), brand=BRAND) for index in range(args.products)
+    ])
+    port = free_port()
+    server = start_server(port, args)
+    try:
+        asyncio.run(run(args, server, port))
+    finally:
+        server.terminate()
+        server.wait(10)
+        Product.objects.filter(brand=BRAND).delete()
+
+if __name__ == "__main__":
+    main()
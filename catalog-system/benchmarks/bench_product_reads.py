@@ -0,0 +1,193 @@
+"""
+Benchmark of the product reads under WSGI and ASGI: the same mix of
+`/api/products/` pages and `/api/products/<id>` reads is sent by hundreds of
+concurrent keep-alive clients to one process of each server, on the same
+machine and database:
+
+- wsgi: the threaded WSGI server of `manage.py runserver`, the sync views
+- asgi-sync: uvicorn with the sync views, each request runs in a thread
+- asgi-async: uvicorn with PRODUCT_ASYNC_READS, the async views
+
+and reports the throughput of successful responses and the latency
+percentiles of each one. The response caches are disabled unless `--cached`
+is given, so every request reads the database. The async views run at most
+PRODUCT_ASYNC_READS_CONCURRENCY reads at once, set it in the environment to
+compare other limits.
+
+It needs the database of the DB_* environment variables with the migrations
+applied and some products in it.
+
+Usage (from the catalog-system folder):
+    uv run python benchmarks/bench_product_reads.py --concurrency 256 --duration 15
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "main.settings")
+
+import django
+
+django.setup()
+
+from api.models import Product
+
+HOST = "127.0.0.1"
+# Products read by the detail requests
+SAMPLE_SIZE = 2000
+# Seconds before a request without response counts as an error
+REQUEST_TIMEOUT = 60
+
+SERVERS = {
+    "wsgi": (["manage.py", "runserver", "--noreload"], {}),
+    "asgi-sync": (["-m", "uvicorn", "main.asgi:application", "--log-level", "warning"], {"PRODUCT_ASYNC_READS": "false"}),
+    "asgi-async": (["-m", "uvicorn", "main.asgi:application", "--log-level", "warning"], {"PRODUCT_ASYNC_READS": "true"}),
+}
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+def start_server(name, args):
+    command, env = SERVERS[name]
+    port = free_port()
+    if name == "wsgi":
+        command = command + [f"{HOST}:{port}"]
+    else:
+        command = command + ["--host", HOST, "--port", str(port), "--backlog", str(args.concurrency * 2)]
+    env = dict(os.environ, **env)
+    if not args.cached:
+        env["PRODUCT_CACHE_BACKEND"] = "django.core.cache.backends.dummy.DummyCache"
+    server = subprocess.Popen(
+        [sys.executable, *command], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return server, port
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"The {name} server didn't start")
+
+def request_paths(skus, brands, count):
+    """
+    Half product pages filtered by a brand, half single products
+    """
+    paths = []
+    for _ in range(count):
+        if random.random() < 0.5:
+            paths.append(f"/api/products/?page_size=20&brand={random.choice(brands)}")
+        else:
+            paths.append(f"/api/products/{random.choice(skus)}")
+    return paths
+
+class Client:
+    """
+    Keep-alive HTTP/1.1 client over a raw socket, it reconnects when the
+    server closes the connection
+    """
+    def __init__(self, port, paths):
+        self.port = port
+        self.paths = paths
+        self.writer = None
+        self.latencies = []
+        self.errors = 0
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(HOST, self.port)
+
+    async def get(self, path):
+        if self.writer is None:
+            await self.connect()
+        self.writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\nAccept: application/json\r\n\r\n".encode())
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        headers = head.decode("latin-1").lower()
+        length = 0
+        for line in headers.split("\r\n"):
+            if line.startswith("content-length:"):
+                length = int(line.split(":")[1])
+        await self.reader.readexactly(length)
+        if "connection: close" in headers:
+            self.close()
+        return int(head[9:12])
+
+    async def run(self, until, measure_from):
+        index = random.randrange(len(self.paths))
+        while time.perf_counter() < until:
+            path = self.paths[index % len(self.paths)]
+            index += 1
+            start = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(self.get(path), REQUEST_TIMEOUT)
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                self.close()
+                status = 0
+            end = time.perf_counter()
+            # Only the requests sent and answered in the measured window count
+            if start < measure_from or end > until:
+                continue
+            if status != 200:
+                self.errors += 1
+            self.latencies.append(end - start)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+async def load(port, paths, args):
+    clients = [Client(port, paths) for _ in range(args.concurrency)]
+    start = time.perf_counter()
+    measure_from = start + args.warmup
+    until = measure_from + args.duration
+    await asyncio.gather(*(client.run(until, measure_from) for client in clients))
+    for client in clients:
+        client.close()
+    latencies = sorted(latency for client in clients for latency in client.latencies)
+    return latencies, sum(client.errors for client in clients)
+
+def percentile(latencies, fraction):
+    return latencies[max(int(len(latencies) * fraction) - 1, 0)] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=256, help="Clients sending requests at the same time")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds measured per server")
+    parser.add_argument("--warmup", type=float, default=3, help="Seconds sent before measuring")
+    parser.add_argument("--servers", nargs="+", choices=list(SERVERS), default=list(SERVERS))
+    parser.add_argument("--cached", action="store_true", help="Keep the response and product caches")
+    args = parser.parse_args()
+
+    skus = [str(sku) for sku in Product.objects.order_by("?").values_list("sku", flat=True)[:SAMPLE_SIZE]]
+    brands = list(Product.objects.order_by().values_list("brand", flat=True).distinct()[:100])
+    if not skus:
+        sys.exit("The benchmark needs products in the database")
+    paths = request_paths(skus, brands, 10000)
+
+    print(f"concurrency: {args.concurrency}, {args.duration:.0f} s per server, "
+          f"response caches {'on' if args.cached else 'off'}, {os.cpu_count()} CPUs")
+    for name in args.servers:
+        server, port = start_server(name, args)
+        try:
+            latencies, errors = asyncio.run(load(port, paths, args))
+        finally:
+            server.terminate()
+            server.wait(10)
+        # Errors come back faster than reads, only the successful responses count
+        print(f"{name:<11} {(len(latencies) - errors) / args.duration:8.0f} req/s   "
+              f"p50 {statistics.median(latencies) * 1000:7.1f} ms   p99 {percentile(latencies, 0.99):7.1f} ms   "
+              f"max {latencies[-1] * 1000:7.1f} ms   errors {errors}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark of the product list read path: ProductSerializer over model
+instances against the values_list fast path. No database is needed, rows
+are generated in memory and the model instances are built with
+Model.from_db like the ORM does for each fetched row.
+
+Usage (from the catalog-system folder):
+    uv run python benchmarks/bench_product_serialization.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "main.settings")
+for variable in ["DB_NAME", "DB_USER", "DB_PASSWORD", "DB_HOST", "DB_PORT"]:
+    os.environ.setdefault(variable, "benchmark")
+
+import django
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+from api.models import Product
+from api.serializers import PRODUCT_FIELDS, ProductSerializer, product_rows_to_representation
+
+# Rows are updated one second apart from this moment
+UPDATED_FROM = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+def build_rows(count):
+    """
+    Rows in the order of PRODUCT_FIELDS
+    """
+    return [
+        (
+            uuid.uuid4(), f"Product {index}", Decimal(index % 10000) / 100 + Decimal("0.01"),
+            f"brand{index % 200}", index, UPDATED_FROM + timedelta(seconds=index)
+        )
+        for index in range(count)
+    ]
+
+def serializer_path(rows):
+    products = [Product.from_db("default", PRODUCT_FIELDS, row) for row in rows]
+    return JSONRenderer().render(ProductSerializer(products, many=True).data)
+
+def fast_path(rows):
+    return JSONRenderer().render(product_rows_to_representation(rows))
+
+def best_time(function, rows, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    if serializer_path(rows[:1000]) != fast_path(rows[:1000]):
+        sys.exit("Fast path output differs from ProductSerializer")
+
+    serializer_time = best_time(serializer_path, rows, args.repeat)
+    fast_time = best_time(fast_path, rows, args.repeat)
+    print(f"rows: {args.rows}, best of {args.repeat}")
+    print(f"ProductSerializer: {serializer_time * 1000:9.1f} ms  {args.rows / serializer_time:12,.0f} rows/s")
+    print(f"values_list path:  {fast_time * 1000:9.1f} ms  {args.rows / fast_time:12,.0f} rows/s")
+    print(f"speedup: {serializer_time / fast_time:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmark of the webhook fan-out: delivers product change events to local
+HTTP stubs through WebhookDispatcher, like run_webhook_worker does.
+
+One stub answers slowly and one always fails, so the run shows that they
+don't hold back the others: it stops once the other stubs have every event.
+Every stub checks the signature and the order of the events it receives.
+
+It needs the database of the DB_* environment variables with the migrations
+applied. Events are written without changing any product, and the
+benchmark subscriptions and events are deleted at the end. The changes feed
+safety lag is disabled for the run, so events are deliverable right away.
+
+Usage (from the catalog-system folder):
+    uv run python benchmarks/bench_webhook_delivery.py --endpoints 20 --events 20000
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "main.settings")
+
+import django
+
+django.setup()
+
+from django.conf import settings
+from api.models import WebhookEvent, WebhookSubscription
+from api.utils.webhook_utils import (
+    SIGNATURE_HEADER,
+    WebhookDispatcher,
+    create_webhook_subscription,
+    record_webhook_events,
+)
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so the delivery threads can reuse their connections
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        stub = self.server.stub
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(stub.delay)
+        status = 500 if stub.failing else 200
+        if not stub.failing:
+            stub.receive(self.headers[SIGNATURE_HEADER], body)
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+class Stub:
+    def __init__(self, delay=0.0, failing=False):
+        self.delay = delay
+        self.failing = failing
+        self.secret = None
+        self.last_id = 0
+        self.events = 0
+        self.errors = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/webhook"
+
+    def receive(self, signature, body):
+        timestamp, digest = [part.split("=", 1)[1] for part in signature.split(",")]
+        expected = hmac.new(self.secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(digest, expected):
+            self.errors.append("invalid signature")
+        for event in json.loads(body)["events"]:
+            if event["id"] <= self.last_id:
+                self.errors.append(f"event {event['id']} out of order")
+            self.last_id = event["id"]
+            self.events += 1
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", type=int, default=20)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=settings.WEBHOOK_CONCURRENCY)
+    parser.add_argument("--batch-size", type=int, default=settings.WEBHOOK_BATCH_SIZE)
+    parser.add_argument("--slow-delay", type=float, default=2.0, help="Seconds the slow stub takes to answer")
+    args = parser.parse_args()
+
+    settings.PRODUCT_CHANGES_SAFETY_LAG = 0
+    stubs = [Stub(delay=args.slow_delay), Stub(failing=True)] + [Stub() for _ in range(args.endpoints - 2)]
+    subscriptions = []
+    try:
+        for stub in stubs:
+            subscription = create_webhook_subscription(stub.url)
+            stub.secret = subscription.secret
+            subscriptions.append(subscription)
+        first_event = None
+        for start in range(0, args.events, 1000):
+            events = record_webhook_events([
+                ("UPDATE", uuid.uuid4(), f"Product {index}", Decimal("10.50"), "zebrands")
+                for index in range(start, min(start + 1000, args.events))
+            ])
+            first_event = first_event or events[0].id
+
+        dispatcher = WebhookDispatcher(args.concurrency, args.batch_size)
+        working = stubs[2:]
+        start = time.perf_counter()
+        while any(stub.events < args.events for stub in working):
+            dispatcher.dispatch()
+            dispatcher.collect(settings.WEBHOOK_POLL_INTERVAL)
+        elapsed = time.perf_counter() - start
+        # Only the request in flight is waited for, the slow endpoint gets the rest later
+        dispatcher.close()
+
+        stats = dispatcher.stats.snapshot()
+        pool = dispatcher.pool.snapshot()
+        failing = WebhookSubscription.objects.get(id=subscriptions[1].id)
+        delivered = sum(stub.events for stub in working)
+        print(
+            f"endpoints: {args.endpoints} (1 slow, 1 failing), events: {args.events}, "
+            f"concurrency: {args.concurrency}, batch size: {args.batch_size}"
+        )
+        print(f"fast endpoints: {elapsed * 1000:9.1f} ms  {delivered / elapsed:11,.0f} events/s")
+        print(f"slow endpoint:  {stubs[0].events} events received, answering in {args.slow_delay} s per request")
+        print(f"deliveries: {stats['deliveries']}, failed deliveries: {stats['failures']}, "
+              f"requests: {pool['requests']} over {pool['connections']} connections")
+        print(f"failing endpoint: {failing.failures} failures in a row, next attempt at {failing.next_attempt_at:%H:%M:%S}")
+        errors = [error for stub in stubs for error in stub.errors]
+        print(f"signature and order errors: {len(errors)}")
+        if errors:
+            sys.exit(errors[:5])
+    finally:
+        WebhookSubscription.objects.filter(id__in=[subscription.id for subscription in subscriptions]).delete()
+        if first_event:
+            WebhookEvent.objects.filter(id__gte=first_event).delete()
+        for stub in stubs:
+            stub.server.shutdown()
+
+if __name__ == "__main__":
+    main()
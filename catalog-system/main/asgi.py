@@ -9,8 +9,29 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler
+from django.urls import reverse
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'main.settings')
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+class StreamingASGIHandler(ASGIHandler):
+    """
+    Serves the event streams without a thread of their own. Django runs the
+    sync code of each request in a thread that is kept until the response
+    ends, which would be a thread per open stream. Streams only run sync code
+    when they start and end, so they share one thread instead.
+    """
+    def __init__(self):
+        super().__init__()
+        self.stream_paths = {reverse("get_product_events")}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.stream_paths:
+            await self.handle(scope, receive, send)
+        else:
+            await super().__call__(scope, receive, send)
+
+application = StreamingASGIHandler()
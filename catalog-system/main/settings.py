@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_extensions',
     'drf_spectacular',
     'drf_spectacular_sidecar',
@@ -121,6 +122,12 @@ EMAIL_USE_SSL = False
 EMAIL_PORT= 587
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "dummy@gmail.com")
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "dummy_password_123")
+# Seconds an SMTP command waits for the server before the connection is opened again
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 30))
+# Recipients per email message, sent as BCC. Most providers limit recipients per message (50 on Amazon SES, 100 on Gmail)
+EMAIL_BCC_CHUNK_SIZE = int(os.getenv("EMAIL_BCC_CHUNK_SIZE", 50))
+# Times a message is resent over a new SMTP connection after a failure
+EMAIL_SEND_RETRIES = int(os.getenv("EMAIL_SEND_RETRIES", 2))
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -137,6 +144,92 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The products cache stores rendered product list responses. It uses local memory by
+# default, set PRODUCT_CACHE_BACKEND and PRODUCT_CACHE_LOCATION to share it between
+# workers through any Django cache backend (e.g. django.core.cache.backends.redis.RedisCache)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'products': {
+        'BACKEND': os.getenv("PRODUCT_CACHE_BACKEND", 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv("PRODUCT_CACHE_LOCATION", 'products'),
+        'TIMEOUT': int(os.getenv("PRODUCT_CACHE_TIMEOUT", 300)),
+        'OPTIONS': {
+            # Least recently used entries are evicted once the cache holds this many responses
+            'MAX_ENTRIES': int(os.getenv("PRODUCT_CACHE_MAX_ENTRIES", 1000)),
+        },
+    },
+}
+
+# Responses bigger than this are not cached
+PRODUCT_CACHE_MAX_RESPONSE_BYTES = int(os.getenv("PRODUCT_CACHE_MAX_RESPONSE_BYTES", 1024 * 1024))
+# Seconds a single product body is cached. It is keyed by the catalog version, so a write
+# made by any process moves every reader to a new entry
+PRODUCT_DETAIL_CACHE_TIMEOUT = int(os.getenv("PRODUCT_DETAIL_CACHE_TIMEOUT", 3600))
+# Seconds product views are collected in memory before they are added to the database
+PRODUCT_VIEWS_FLUSH_INTERVAL = float(os.getenv("PRODUCT_VIEWS_FLUSH_INTERVAL", 5))
+# Products with pending views that trigger a flush before the interval ends
+PRODUCT_VIEWS_MAX_BUFFER = int(os.getenv("PRODUCT_VIEWS_MAX_BUFFER", 10000))
+# Seconds the ranking of the most viewed products is served before it's refreshed
+PRODUCT_POPULAR_REFRESH_INTERVAL = float(os.getenv("PRODUCT_POPULAR_REFRESH_INTERVAL", 60))
+# Seconds product audit entries are collected in memory before they are written
+PRODUCT_AUDIT_FLUSH_INTERVAL = float(os.getenv("PRODUCT_AUDIT_FLUSH_INTERVAL", 1))
+# Pending audit entries that trigger a write before the interval ends
+PRODUCT_AUDIT_MAX_BUFFER = int(os.getenv("PRODUCT_AUDIT_MAX_BUFFER", 1000))
+# Seconds the notified emails are kept in memory before they are read again, user writes drop them sooner
+NOTIFICATION_RECIPIENTS_CACHE_TIMEOUT = float(os.getenv("NOTIFICATION_RECIPIENTS_CACHE_TIMEOUT", 300))
+# Seconds a product change waits for other changes to be sent with it in one email
+NOTIFICATION_COALESCE_WINDOW = float(os.getenv("NOTIFICATION_COALESCE_WINDOW", 60))
+# Changes listed in a notification email, an import can change far more products than an
+# email should list, the rest are only counted
+NOTIFICATION_DIGEST_MAX_PRODUCTS = int(os.getenv("NOTIFICATION_DIGEST_MAX_PRODUCTS", 1000))
+# Attempts to send a notification before it is marked as failed
+NOTIFICATION_MAX_ATTEMPTS = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", 8))
+# Seconds before the first retry of a notification, doubled after each failed attempt up to the max delay
+NOTIFICATION_RETRY_BASE_DELAY = float(os.getenv("NOTIFICATION_RETRY_BASE_DELAY", 30))
+NOTIFICATION_RETRY_MAX_DELAY = float(os.getenv("NOTIFICATION_RETRY_MAX_DELAY", 3600))
+# Seconds a claimed notification stays hidden from other workers while it is sent
+NOTIFICATION_LEASE_SECONDS = int(os.getenv("NOTIFICATION_LEASE_SECONDS", 300))
+# Seconds the notification worker waits before polling an empty outbox again
+NOTIFICATION_POLL_INTERVAL = float(os.getenv("NOTIFICATION_POLL_INTERVAL", 1))
+# Webhook deliveries in flight at once, each to a different subscription
+WEBHOOK_CONCURRENCY = int(os.getenv("WEBHOOK_CONCURRENCY", 8))
+# Events sent per webhook request at most
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", 100))
+# Seconds a webhook endpoint has to answer before the delivery fails
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", 10))
+# Seconds before the first retry of a failing endpoint, doubled after each failed delivery up to the max delay
+WEBHOOK_RETRY_BASE_DELAY = float(os.getenv("WEBHOOK_RETRY_BASE_DELAY", 10))
+WEBHOOK_RETRY_MAX_DELAY = float(os.getenv("WEBHOOK_RETRY_MAX_DELAY", 3600))
+# Seconds a claimed subscription stays hidden from other workers while it's delivered
+WEBHOOK_LEASE_SECONDS = int(os.getenv("WEBHOOK_LEASE_SECONDS", 60))
+# Seconds the webhook worker waits before polling again when there is nothing to deliver
+WEBHOOK_POLL_INTERVAL = float(os.getenv("WEBHOOK_POLL_INTERVAL", 1))
+# Seconds between two deletes of the events every subscription has received
+WEBHOOK_PRUNE_INTERVAL = float(os.getenv("WEBHOOK_PRUNE_INTERVAL", 60))
+# Seconds the changes feed stays behind the clock so writes in flight are committed before it reads them
+PRODUCT_CHANGES_SAFETY_LAG = float(os.getenv("PRODUCT_CHANGES_SAFETY_LAG", 5))
+# Seconds between two reads of the changes feed pushed to the product event streams
+PRODUCT_EVENTS_POLL_INTERVAL = float(os.getenv("PRODUCT_EVENTS_POLL_INTERVAL", 1))
+# Changes read per query by the event streams, when polling and when a stream catches up
+PRODUCT_EVENTS_BATCH_SIZE = int(os.getenv("PRODUCT_EVENTS_BATCH_SIZE", 500))
+# Latest events kept in memory so reconnecting streams resume without a query
+PRODUCT_EVENTS_HISTORY_SIZE = int(os.getenv("PRODUCT_EVENTS_HISTORY_SIZE", 1000))
+# Events waiting to be sent to one stream before it's closed as too slow
+PRODUCT_EVENTS_CLIENT_BUFFER = int(os.getenv("PRODUCT_EVENTS_CLIENT_BUFFER", 1000))
+# Seconds of silence before a comment is sent to keep idle streams open
+PRODUCT_EVENTS_KEEPALIVE_INTERVAL = float(os.getenv("PRODUCT_EVENTS_KEEPALIVE_INTERVAL", 15))
+# Serve the product list and detail reads with the async views, for ASGI servers. Under WSGI
+# every async view would run in an event loop of its own, so the sync views are the default
+PRODUCT_ASYNC_READS = os.getenv("PRODUCT_ASYNC_READS", "false").lower() in ("1", "true")
+# Async product reads running at once per worker, the others wait in the event loop
+PRODUCT_ASYNC_READS_CONCURRENCY = int(os.getenv("PRODUCT_ASYNC_READS_CONCURRENCY", 16))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 